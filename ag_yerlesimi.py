@@ -0,0 +1,123 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+# Karakter ağı için önbellekli ve sıcak başlatılan (warm start) yerleşimler.
+# Yerleşim, grafın yapısından (düğüm kimlikleri ve kenarlar) türetilen anahtarla
+# saklanır; aynı yapı için hesaplama yapılmaz. Yapı değişmişse son yerleşim başlangıç
+# noktası olur: eski düğümler yerinde kalır, yeni düğümler komşularının ortalamasına
+# yerleştirilir ve kuvvet yönelimli yerleşim az sayıda yinelemeyle sürdürülür. Böylece
+# küçük düzenlemelerden sonra ağ yerinden sıçramaz.
+#
+# Düğümler, varsa "id" özniteliğiyle (karakterin kararlı kimliği) tanınır; karakter
+# yeniden adlandırılsa da konumu korunur. Yerleşimler film dosyasının yanında
+# <film>.layout.json dosyasında tutulur (düzenleme günlüğündeki <film>.journal gibi).
+
+MAX_ENTRIES = 8       # dosyada saklanan en fazla yerleşim sayısı
+WARM_ITERATIONS = 15  # sıcak başlatmada yineleme sayısı (soğuk başlangıç: 50)
+
+
+def layout_path(film_path):
+    """Film dosyasının yanındaki yerleşim dosyasının yolu"""
+    return film_path + ".layout.json"
+
+
+def _node_key(G, node):
+    return str(G.nodes[node].get("id", node))
+
+
+def graph_key(G, seed=42):
+    """Düğüm kimlikleri ve kenarlardan (sıradan bağımsız) yapı anahtarı"""
+    nodes = sorted(_node_key(G, node) for node in G.nodes)
+    edges = sorted(tuple(sorted((_node_key(G, u), _node_key(G, v)))) for u, v in G.edges)
+    payload = json.dumps([seed, nodes, edges], separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LayoutStore:
+    def __init__(self, path=None):
+        """path verilirse yerleşimler o JSON dosyasına yazılır, yoksa yalnızca bellekte tutulur"""
+        self.path = path
+        self.entries = {}  # anahtar -> {düğüm anahtarı: [x, y]}; en son kullanılan sonda
+        if path is not None and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f).get("entries", {})
+            except (OSError, ValueError):
+                self.entries = {}  # bozuk dosya yeniden hesaplanacak yerleşimlerle değiştirilir
+
+    @classmethod
+    def for_film(cls, film):
+        """Filmin yüklendiği dosyanın yanındaki yerleşim deposu; dosyası yoksa bellek içi"""
+        source = getattr(film, "source", None)
+        return cls(layout_path(source) if source else None)
+
+    def get(self, key):
+        positions = self.entries.pop(key, None)
+        if positions is not None:
+            self.entries[key] = positions
+        return positions
+
+    def latest(self):
+        """En son kaydedilen ya da kullanılan yerleşim (yoksa None)"""
+        return self.entries[next(reversed(self.entries))] if self.entries else None
+
+    def put(self, key, positions):
+        self.entries.pop(key, None)
+        self.entries[key] = positions
+        while len(self.entries) > MAX_ENTRIES:
+            del self.entries[next(iter(self.entries))]
+        self.save()
+
+    def save(self):
+        if self.path is None:
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"entries": self.entries}, f)
+        os.replace(tmp_path, self.path)
+
+
+def _initial_positions(G, previous, seed):
+    """Önceki yerleşimden başlangıç konumları; yeni düğümler komşularının ortasına konur"""
+    keys = {node: _node_key(G, node) for node in G.nodes}
+    pos = {node: np.array(previous[key], dtype=np.float64) for node, key in keys.items() if key in previous}
+    rng = np.random.default_rng(seed)
+
+    # Yeni düğümler: bilinen komşuların ortalaması + küçük sapma; komşu bilinmiyorsa rastgele
+    pending = [node for node in G.nodes if node not in pos]
+    while pending:
+        placed = False
+        for node in list(pending):
+            neighbours = [pos[n] for n in G.neighbors(node) if n in pos]
+            if neighbours:
+                pos[node] = np.mean(neighbours, axis=0) + rng.normal(scale=0.05, size=2)
+                pending.remove(node)
+                placed = True
+        if not placed:
+            node = pending.pop(0)
+            pos[node] = rng.uniform(-1, 1, size=2)
+    return pos
+
+
+def spring_layout(G, store=None, seed=42, iterations=50, warm_iterations=WARM_ITERATIONS):
+    """nx.spring_layout'un önbellekli ve sıcak başlatılan karşılığı; {düğüm: np.array([x, y])} döndürür"""
+    import networkx as nx
+
+    store = store if store is not None else LayoutStore()
+    key = graph_key(G, seed)
+    cached = store.get(key)
+    if cached is not None and all(_node_key(G, node) in cached for node in G.nodes):
+        return {node: np.array(cached[_node_key(G, node)]) for node in G.nodes}
+
+    previous = store.latest()
+    if previous and any(_node_key(G, node) in previous for node in G.nodes):
+        pos = nx.spring_layout(G, pos=_initial_positions(G, previous, seed),
+                               iterations=warm_iterations, seed=seed)
+    else:
+        pos = nx.spring_layout(G, iterations=iterations, seed=seed)
+
+    store.put(key, {_node_key(G, node): [float(x), float(y)] for node, (x, y) in pos.items()})
+    return pos
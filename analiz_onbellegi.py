@@ -0,0 +1,234 @@
+import ast
+import functools
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import sys
+
+# İçerik adresli analiz önbelleği.
+# Anahtar; filmin içerik özeti (Film.fingerprint), analiz adı, parametreler,
+# analiz fonksiyonunun bayt kodu ve fonksiyonun modülünden (dolaylı olarak) içe
+# aktarılan proje modüllerinin kaynak özetinden türetilir. Yardımcı modüller
+# (aralik_birlesimi, duygu_yogunlugu, zaman_rasteri...) genellikle fonksiyon içinde
+# içe aktarıldığından modül kaynağındaki tüm import'lar izlenir. Film ya da analiz
+# kodu değişmedikçe aynı anahtar üretilir, böylece sonuçlar ve çizilen dosyalar
+# yeniden kullanılır.
+#
+# Disk düzeni:
+#   <dizin>/<film özeti>/<analiz>-<parametre özeti>/result.pickle
+#   <dizin>/<film özeti>/<analiz>-<parametre özeti>/<çıktı dosyaları>
+#
+# Toplam boyut max_bytes'ı aşınca en uzun süredir kullanılmayan kayıtlar silinir
+# (LRU); kullanım zamanı result.pickle dosyasının mtime değeridir.
+
+DEFAULT_CACHE_DIR = ".filmmapper_cache"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+_RESULT_FILE = "result.pickle"
+
+
+def _digest(*parts):
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part if isinstance(part, bytes) else str(part).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _code_digest(func):
+    """Fonksiyonun bayt kodu, basit sabitleri (dosya adları, eşikler) ve kullandığı proje modüllerinden özet"""
+    code = getattr(func, "__code__", None)
+    if code is None:
+        return ""
+    constants = [c for c in code.co_consts if isinstance(c, (str, bytes, int, float, tuple, type(None)))]
+    return _digest(code.co_code, repr(constants), _source_digest(getattr(func, "__module__", None)))
+
+
+@functools.lru_cache(maxsize=None)
+def _source_digest(module_name):
+    """Modülün ve içe aktardığı (fonksiyon içindekiler dahil) proje modüllerinin kaynak özeti"""
+    module = sys.modules.get(module_name)
+    path = getattr(module, "__file__", None)
+    if not path:
+        return ""
+    root = os.path.dirname(os.path.abspath(path))
+    sources = {}
+    queue = [os.path.splitext(os.path.basename(path))[0]]
+    while queue:
+        name = queue.pop()
+        if name in sources:
+            continue
+        with open(os.path.join(root, name + ".py"), "rb") as f:
+            sources[name] = f.read()
+        for node in ast.walk(ast.parse(sources[name])):
+            if isinstance(node, ast.Import):
+                imported = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                imported = [node.module]
+            else:
+                continue
+            # Yalnızca aynı dizindeki proje modülleri izlenir
+            queue.extend(n.split(".")[0] for n in imported
+                         if os.path.exists(os.path.join(root, n.split(".")[0] + ".py")))
+    return _digest(*(part for name in sorted(sources) for part in (name, sources[name])))
+
+
+class AnalysisCache:
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._entries = None  # kayıt dizini -> [kullanım zamanı, boyut]; ilk yazmada taranır
+
+    # --- Anahtarlar ---
+
+    def entry_path(self, film, name, params=None):
+        """Film, analiz adı ve parametrelerin belirlediği kayıt dizini"""
+        params_json = json.dumps(params or {}, sort_keys=True, ensure_ascii=False, default=repr)
+        return os.path.join(self.directory, film.fingerprint(), f"{name}-{_digest(params_json)[:16]}")
+
+    # --- Okuma / yazma ---
+
+    def load(self, film, name, params=None, artifacts=()):
+        """(bulundu, değer) döndürür; artifacts verilirse hepsi önbellekte olmalıdır"""
+        entry = self.entry_path(film, name, params)
+        result_path = os.path.join(entry, _RESULT_FILE)
+        if not os.path.exists(result_path):
+            return False, None
+        if not all(os.path.exists(os.path.join(entry, os.path.basename(a))) for a in artifacts):
+            return False, None
+        try:
+            with open(result_path, "rb") as f:
+                value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return False, None
+        self._touch(entry)
+        return True, value
+
+    def store(self, film, name, value, params=None, artifacts=()):
+        """Sonucu ve çıktı dosyalarının kopyalarını önbelleğe yazar"""
+        entry = self.entry_path(film, name, params)
+        os.makedirs(entry, exist_ok=True)
+        for artifact in artifacts:
+            shutil.copyfile(artifact, os.path.join(entry, os.path.basename(artifact)))
+
+        # Sonuç en son ve atomik yazılır; varlığı kaydın tamamlandığını gösterir
+        tmp_path = os.path.join(entry, _RESULT_FILE + ".tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, os.path.join(entry, _RESULT_FILE))
+
+        entries = self._scan()
+        entries[entry] = [os.path.getmtime(os.path.join(entry, _RESULT_FILE)), _dir_size(entry)]
+        self._evict()
+
+    def restore_artifacts(self, film, name, artifacts, params=None):
+        """Önbellekteki çıktı dosyalarını istenen yollara kopyalar"""
+        entry = self.entry_path(film, name, params)
+        for artifact in artifacts:
+            directory = os.path.dirname(artifact)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            shutil.copyfile(os.path.join(entry, os.path.basename(artifact)), artifact)
+
+    def lookup(self, film, func, artifacts=(), name=None, **params):
+        """run() ile aynı anahtarla arar; bulunursa çıktı dosyalarını geri kopyalar. (bulundu, değer) döndürür"""
+        name = name or func.__name__
+        key_params = dict(params, __code__=_code_digest(func))
+        hit, value = self.load(film, name, key_params, artifacts)
+        if hit:
+            self.restore_artifacts(film, name, artifacts, key_params)
+        return hit, value
+
+    def save(self, film, func, value, artifacts=(), name=None, **params):
+        """func'ın hesapladığı değeri run() ile aynı anahtarla saklar"""
+        name = name or func.__name__
+        self.store(film, name, value, dict(params, __code__=_code_digest(func)), artifacts)
+
+    def run(self, film, func, artifacts=(), name=None, **params):
+        """func(film, **params) sonucunu önbellekten döndürür ya da hesaplayıp saklar.
+
+        artifacts: fonksiyonun yazdığı dosyalar (örn. PNG); önbellekten dönülürken
+        bu yollara geri kopyalanır. Anahtara fonksiyonun bayt kodu ve kullandığı proje
+        modüllerinin kaynağı da girer, böylece analiz kodu değişince eski sonuçlar kullanılmaz.
+        """
+        hit, value = self.lookup(film, func, artifacts, name, **params)
+        if hit:
+            return value
+        value = func(film, **params)
+        self.save(film, func, value, artifacts, name, **params)
+        return value
+
+    # --- Geçersiz kılma ---
+
+    def invalidate(self, film=None, name=None):
+        """Bir filmin, bir analizin ya da ikisinin kesişimindeki kayıtları siler"""
+        if film is None and name is None:
+            self.clear()
+            return
+        film_dirs = [film.fingerprint()] if film is not None else _listdir(self.directory)
+        for fingerprint in film_dirs:
+            film_dir = os.path.join(self.directory, fingerprint)
+            for entry_name in _listdir(film_dir):
+                if name is None or entry_name.rsplit("-", 1)[0] == name:
+                    self._remove(os.path.join(film_dir, entry_name))
+            if not _listdir(film_dir) and os.path.isdir(film_dir):
+                os.rmdir(film_dir)
+
+    def clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self._entries = {}
+
+    def size(self):
+        """Önbelleğin toplam boyutu (bayt)"""
+        return sum(size for _, size in self._scan().values())
+
+    # --- LRU ---
+
+    def _scan(self):
+        if self._entries is None:
+            self._entries = {}
+            for fingerprint in _listdir(self.directory):
+                film_dir = os.path.join(self.directory, fingerprint)
+                for entry_name in _listdir(film_dir):
+                    entry = os.path.join(film_dir, entry_name)
+                    result_path = os.path.join(entry, _RESULT_FILE)
+                    if os.path.exists(result_path):
+                        self._entries[entry] = [os.path.getmtime(result_path), _dir_size(entry)]
+        return self._entries
+
+    def _touch(self, entry):
+        result_path = os.path.join(entry, _RESULT_FILE)
+        os.utime(result_path)
+        if self._entries is not None and entry in self._entries:
+            self._entries[entry][0] = os.path.getmtime(result_path)
+
+    def _remove(self, entry):
+        shutil.rmtree(entry, ignore_errors=True)
+        if self._entries is not None:
+            self._entries.pop(entry, None)
+
+    def _evict(self):
+        entries = self._scan()
+        total = sum(size for _, size in entries.values())
+        if total <= self.max_bytes:
+            return
+        for entry, (_, size) in sorted(entries.items(), key=lambda item: item[1][0]):
+            if total <= self.max_bytes:
+                break
+            self._remove(entry)
+            total -= size
+            film_dir = os.path.dirname(entry)
+            if not _listdir(film_dir):
+                os.rmdir(film_dir)
+
+
+def _listdir(path):
+    try:
+        return os.listdir(path)
+    except FileNotFoundError:
+        return []
+
+
+def _dir_size(path):
+    return sum(os.path.getsize(os.path.join(path, name)) for name in _listdir(path))
@@ -0,0 +1,166 @@
+import os
+import time
+import traceback
+
+# Bağımlılık bilgili analiz planlayıcı.
+# Her analiz ve ara sonuç (sütunlar, geliş matrisleri, yoğunluk eğrisi...) bir
+# düğüm olarak kaydedilir ve girdi olarak kullandığı düğümleri bildirir. Planlayıcı
+# yalnızca istenen analizleri ve onların ihtiyaç duyduğu ara sonuçları çalıştırır;
+# her ara sonuç bir kez hesaplanıp bağımlı analizlere anahtar kelime argümanı
+# olarak verilir. Bir düğümün hatası yalnızca ona bağlı düğümleri etkiler.
+
+
+class _Node:
+    __slots__ = ("name", "func", "inputs", "artifacts", "label", "is_analysis")
+
+    def __init__(self, name, func, inputs, artifacts, label, is_analysis):
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.artifacts = list(artifacts)
+        self.label = label or name
+        self.is_analysis = is_analysis
+
+
+class AnalysisRegistry:
+    def __init__(self):
+        self.nodes = {}
+
+    def intermediate(self, name, func, inputs=(), label=None):
+        """Ara sonuç kaydeder; func(film, **girdiler) değeri döndürür"""
+        self._add(_Node(name, func, inputs, (), label, False))
+
+    def analysis(self, name, func, inputs=(), artifacts=(), label=None):
+        """Analiz kaydeder; func(film, **girdiler) çağrılır, artifacts yazdığı dosyalardır"""
+        self._add(_Node(name, func, inputs, artifacts, label, True))
+
+    def analyses(self):
+        """Kayıtlı analizlerin adları (kayıt sırasıyla)"""
+        return [name for name, node in self.nodes.items() if node.is_analysis]
+
+    def _add(self, node):
+        if node.name in self.nodes:
+            raise ValueError(f"'{node.name}' düğümü zaten kayıtlı")
+        self.nodes[node.name] = node
+
+    def plan(self, names=None):
+        """İstenen analizleri ve girdilerini bağımlılık sırasıyla döndürür"""
+        names = self.analyses() if names is None else list(names)
+        order = []
+        state = {}  # düğüm -> "visiting" / "done"
+
+        def visit(name, parent):
+            if name not in self.nodes:
+                where = f" ('{parent}' girdisi)" if parent else ""
+                raise KeyError(f"Bilinmeyen analiz veya ara sonuç: '{name}'{where}")
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"Döngüsel bağımlılık: '{name}'")
+            state[name] = "visiting"
+            for dependency in self.nodes[name].inputs:
+                visit(dependency, name)
+            state[name] = "done"
+            order.append(self.nodes[name])
+
+        for name in names:
+            visit(name, None)
+        return order
+
+
+class AnalysisReport:
+    def __init__(self, title):
+        self.title = title
+        self.results = {}
+        self.errors = {}
+        self.status = {}   # düğüm -> "ok" / "cache" / "error" / "skipped"
+        self.timings = {}  # düğüm -> saniye
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def format(self):
+        """Düğüm başına durum ve süre tablosu"""
+        lines = [f"{self.title} - analiz raporu", f"{'Düğüm':<36}{'Durum':<10}{'Süre (sn)':>10}"]
+        for name, status in self.status.items():
+            lines.append(f"{name:<36}{status:<10}{self.timings.get(name, 0.0):>10.3f}")
+        for name, error in self.errors.items():
+            lines.append(f"\n[{name}] {error.strip().splitlines()[-1]}")
+        return "\n".join(lines)
+
+
+def run_analyses(film, registry, names=None, cache=None, progress=None, output_dir=None):
+    """İstenen analizleri (varsayılan: tümü) çalıştırır ve AnalysisReport döndürür.
+
+    cache verilirse (AnalysisCache) önce önbelleğe bakılır; yalnızca önbellekte
+    olmayan analizlerin ara sonuçları hesaplanır. progress(mesaj) ilerlemeyi bildirir.
+    output_dir verilirse analizlere iletilir ve çıktı dosyaları o dizinde aranır.
+    """
+    report = AnalysisReport(film.title)
+    plan = registry.plan(names)
+
+    # Önbellekte bulunan analizlerin ara sonuçlarına gerek kalmaz
+    pending = set()
+    for node in plan:
+        if not node.is_analysis:
+            continue
+        if cache is not None:
+            start = time.perf_counter()
+            hit, value = cache.lookup(film, node.func, _artifact_paths(node, output_dir), node.name)
+            if hit:
+                report.results[node.name] = value
+                report.status[node.name] = "cache"
+                report.timings[node.name] = time.perf_counter() - start
+                continue
+        pending.add(node.name)
+
+    needed = set()
+    for node in reversed(plan):
+        if node.name in pending or node.name in needed:
+            needed.update(node.inputs)
+
+    for node in plan:
+        if node.name not in pending and node.name not in needed:
+            continue
+
+        failed = [name for name in node.inputs if report.status.get(name) in ("error", "skipped")]
+        if failed:
+            report.status[node.name] = "skipped"
+            report.errors[node.name] = f"Girdi hesaplanamadı: {', '.join(failed)}"
+            continue
+
+        if progress is not None and node.is_analysis:
+            progress(f"{node.label}...")
+        start = time.perf_counter()
+        try:
+            kwargs = {name: report.results[name] for name in node.inputs}
+            if output_dir is not None and node.is_analysis:
+                kwargs["output_dir"] = output_dir
+            value = node.func(film, **kwargs)
+        except Exception:
+            report.status[node.name] = "error"
+            report.errors[node.name] = traceback.format_exc()
+        else:
+            report.results[node.name] = value
+            report.status[node.name] = "ok"
+            if cache is not None and node.is_analysis:
+                # Önbelleğe yazılamaması (disk, pickle) yalnızca bu düğüm için kaydedilir;
+                # sonuç geçerlidir ve diğer analizler çalışmaya devam eder
+                try:
+                    cache.save(film, node.func, value, _artifact_paths(node, output_dir), node.name)
+                except Exception:
+                    report.errors[node.name] = "Önbelleğe yazılamadı:\n" + traceback.format_exc()
+        report.timings[node.name] = time.perf_counter() - start
+
+    # Ara sonuçlar yalnızca planlama içindir; raporda analiz sonuçları kalır
+    for node in plan:
+        if not node.is_analysis:
+            report.results.pop(node.name, None)
+    return report
+
+
+def _artifact_paths(node, output_dir):
+    if not output_dir:
+        return node.artifacts
+    return [os.path.join(output_dir, artifact) for artifact in node.artifacts]
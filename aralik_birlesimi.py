@@ -0,0 +1,150 @@
+import numpy as np
+
+# Çakışmaları hesaba katan aralık birleşimi.
+# Kesişen ve iç içe sahneler (ara kesmeler, montajlar) aynı karakteri aynı anda iki
+# kez saydırmasın diye her sahibin (karakter ya da lokasyon) aralıkları birleştirilir.
+# Tüm (sahip, başlangıç, bitiş) üçlüleri tek seferde (sahip, başlangıç) sırasına
+# dizilir; sahip grubunda kayan en büyük bitiş (segmentli kümülatif maksimum) bir
+# önceki bitişten büyük başlangıçlarda yeni bir kesintisiz parça başlatır. Her şey
+# O(n log n) tek bir vektörel geçiştir; birden çok film için sahipler kaydırılarak
+# aynı geçişte işlenir. Birbirine değen aralıklar ([a, b] ve [b, c]) tek parça sayılır.
+
+
+class IntervalUnion:
+    def __init__(self, owners, starts, ends, n_owners):
+        """owners[i] sahibinin [starts[i], ends[i]] aralıklarını birleştirir"""
+        owners = np.asarray(owners, dtype=np.int64)
+        starts = np.asarray(starts, dtype=np.float64)
+        ends = np.asarray(ends, dtype=np.float64)
+        self.n_owners = n_owners
+        self.intervals = np.bincount(owners, minlength=n_owners)
+
+        if len(owners) == 0:
+            self.run_owner = np.empty(0, dtype=np.int64)
+            self.run_start = np.empty(0)
+            self.run_end = np.empty(0)
+            return
+
+        order = np.lexsort((starts, owners))
+        owners, starts, ends = owners[order], starts[order], ends[order]
+
+        # Segmentli kümülatif maksimum: her sahibin bitişleri kendine ait, önceki
+        # sahiplerinkinden büyük bir aralığa kaydırılır
+        low = min(starts.min(), ends.min())
+        span = max(starts.max(), ends.max()) - low + 1
+        running = np.maximum.accumulate((ends - low) + owners * span) - owners * span + low
+
+        new_run = np.ones(len(owners), dtype=bool)
+        new_run[1:] = (owners[1:] != owners[:-1]) | (starts[1:] > running[:-1])
+        first = np.flatnonzero(new_run)
+        self.run_owner = owners[first]
+        self.run_start = starts[first]
+        self.run_end = np.maximum.reduceat(ends, first)
+
+    # --- Sahip başına özetler ---
+
+    def total(self):
+        """Birleşik (çakışmasız) toplam süre"""
+        return np.bincount(self.run_owner, weights=self.run_end - self.run_start, minlength=self.n_owners)
+
+    def appearances(self):
+        """Kesintisiz parça sayısı"""
+        return np.bincount(self.run_owner, minlength=self.n_owners)
+
+    def longest(self):
+        """En uzun kesintisiz parça"""
+        result = np.zeros(self.n_owners)
+        np.maximum.at(result, self.run_owner, self.run_end - self.run_start)
+        return result
+
+    def first(self):
+        """İlk görünme zamanı (aralığı olmayan sahipler için NaN)"""
+        result = np.full(self.n_owners, np.inf)
+        np.minimum.at(result, self.run_owner, self.run_start)
+        result[np.isinf(result)] = np.nan
+        return result
+
+    def last(self):
+        """Son görünmenin bitiş zamanı (aralığı olmayan sahipler için NaN)"""
+        result = np.full(self.n_owners, -np.inf)
+        np.maximum.at(result, self.run_owner, self.run_end)
+        result[np.isinf(result)] = np.nan
+        return result
+
+    def runs(self, owner):
+        """Bir sahibin birleşik parçaları: (başlangıçlar, bitişler)"""
+        mask = self.run_owner == owner
+        return self.run_start[mask], self.run_end[mask]
+
+    def frame(self, names, label="Screen Time (seconds)"):
+        """Sahip başına özet tablo (DataFrame)"""
+        import pandas as pd
+
+        return pd.DataFrame({
+            "Name": list(names),
+            label: self.total(),
+            "Scenes": self.intervals,
+            "Appearances": self.appearances(),
+            "Longest Stretch (seconds)": self.longest(),
+            "First Appearance": self.first(),
+            "Last Appearance": self.last(),
+        })
+
+
+def character_intervals(columns):
+    """Sahne kadrolarından (karakter, başlangıç, bitiş) dizileri"""
+    counts = np.diff(columns.scene_cast_indptr)
+    return (columns.scene_cast_indices,
+            np.repeat(columns.scene_start, counts),
+            np.repeat(columns.scene_end, counts))
+
+
+def character_union(columns):
+    """Karakter başına birleşik ekran süresi"""
+    owners, starts, ends = character_intervals(columns)
+    return IntervalUnion(owners, starts, ends, columns.n_characters)
+
+
+def location_union(columns):
+    """Lokasyon başına birleşik kullanım süresi"""
+    return IntervalUnion(columns.scene_location, columns.scene_start, columns.scene_end, columns.n_locations)
+
+
+def corpus_union(films, kind="character"):
+    """Birden çok filmin karakter (ya da lokasyon) birleşimleri tek vektörel geçişte.
+
+    Döndürür: (IntervalUnion, film başlıkları listesi, sahip adları listesi); sahipler
+    filmler sırasıyla art arda numaralanır.
+    """
+    owners, starts, ends, film_titles, names = [], [], [], [], []
+    offset = 0
+    for film in films:
+        columns = film.columns()
+        if kind == "character":
+            film_owners, film_starts, film_ends = character_intervals(columns)
+            film_names = columns.character_names
+        elif kind == "location":
+            film_owners, film_starts, film_ends = columns.scene_location, columns.scene_start, columns.scene_end
+            film_names = columns.location_names
+        else:
+            raise ValueError(f"Bilinmeyen tür: {kind}")
+        owners.append(np.asarray(film_owners, dtype=np.int64) + offset)
+        starts.append(film_starts)
+        ends.append(film_ends)
+        film_titles.extend([film.title] * len(film_names))
+        names.extend(film_names)
+        offset += len(film_names)
+
+    if not owners:
+        return IntervalUnion([], [], [], 0), [], []
+    union = IntervalUnion(np.concatenate(owners), np.concatenate(starts), np.concatenate(ends), offset)
+    return union, film_titles, names
+
+
+def corpus_screen_time(films, kind="character"):
+    """Tüm filmler için birleşik süre tablosu (Film sütunlu DataFrame)"""
+    union, film_titles, names = corpus_union(films, kind)
+    label = "Screen Time (seconds)" if kind == "character" else "Usage Time (seconds)"
+    frame = union.frame(names, label)
+    frame.insert(0, "Film", film_titles)
+    return frame
@@ -0,0 +1,233 @@
+import numpy as np
+
+# Zamana bağlı ilişki ağı.
+# Her ilişki [başlangıç, bitiş) aralığında etkindir (bitişi olmayan ilişki film
+# sonuna kadar sürer). t anındaki ağ, etkin ilişkilerin karakter çiftlerine göre
+# toplanmış güçleridir; [t, t + pencere] penceresindeki ağda pencereyle kesişen
+# ilişkiler bulunur.
+#
+# Ağ yalnızca ilişki uç noktalarında değişir. Uç noktalar bir kez sıralanır ve bir
+# tarama çizgisi (sweep line) bu noktalar boyunca ilerler: her adımda yalnızca
+# eklenen ve çıkan ilişkiler uygulanır; çift sayaçları, karakter dereceleri ve
+# güçleri artımlı güncellenir. Ölçüler (yoğunluk, en büyük bileşen, ana karakter
+# merkezilikleri) yalnızca değişim noktalarında hesaplanır; herhangi bir zaman
+# ızgarasındaki değerler searchsorted ile bu parçalı sabit tablodan okunur. Böylece
+# 3 saatlik bir filmin saniye çözünürlüklü eğrisi O(R log R + T) sürede çıkar.
+
+
+class DynamicNetwork:
+    def __init__(self, columns, duration):
+        """FilmColumns'taki ilişkilerden zamana bağlı ağ kurar; duration: film süresi (saniye)"""
+        self.character_names = columns.character_names
+        self.character_importance = columns.character_importance
+        self.n_characters = columns.n_characters
+        self.duration = float(duration)
+
+        self.start = columns.relationship_start
+        self.end = np.where(np.isnan(columns.relationship_end), np.inf, columns.relationship_end)
+        self.strength = columns.relationship_strength
+
+        # Aynı karakter çiftine ait ilişkiler tek kenarda toplanır
+        first = np.minimum(columns.relationship_char1, columns.relationship_char2).astype(np.int64)
+        second = np.maximum(columns.relationship_char1, columns.relationship_char2).astype(np.int64)
+        pair_codes, self.pair = np.unique(first * max(self.n_characters, 1) + second, return_inverse=True)
+        self.pair_first = pair_codes // max(self.n_characters, 1)
+        self.pair_second = pair_codes % max(self.n_characters, 1)
+
+    @classmethod
+    def from_film(cls, film):
+        return cls(film.columns(), film.duration)
+
+    @property
+    def n_relationships(self):
+        return len(self.start)
+
+    # --- Anlık durum ---
+
+    def active(self, t, window=0.0):
+        """t anında (ya da [t, t + window] penceresinde) etkin ilişkilerin indeksleri"""
+        return np.flatnonzero((self.start <= t + window) & (self.end > t))
+
+    def graph_at(self, t, window=0.0):
+        """t anındaki ağın seyrek komşuluk matrisi (etkin ilişki güçlerinin çift başına toplamı)"""
+        return self._adjacency(self.active(t, window))
+
+    def _adjacency(self, relationships):
+        from scipy import sparse
+
+        n = self.n_characters
+        pairs = self.pair[relationships]
+        rows = np.concatenate([self.pair_first[pairs], self.pair_second[pairs]])
+        cols = np.concatenate([self.pair_second[pairs], self.pair_first[pairs]])
+        weights = np.tile(self.strength[relationships], 2)
+        return sparse.csr_matrix((weights, (rows, cols)), shape=(n, n))
+
+    # --- Tarama ---
+
+    def changes(self, window=0.0):
+        """Değişim noktaları: (zamanlar, [eklenen ilişkiler], [çıkan ilişkiler]) zaman sırasıyla.
+
+        [t, t + window] penceresine ilişki t = başlangıç - window anında girer, t = bitiş anında çıkar.
+        """
+        enter = self.start - window
+        leave = self.end
+        finite = np.isfinite(leave)
+        times = np.concatenate([enter, leave[finite]])
+        indices = np.concatenate([np.arange(self.n_relationships), np.flatnonzero(finite)])
+        is_enter = np.concatenate([np.ones(len(enter), dtype=bool), np.zeros(finite.sum(), dtype=bool)])
+
+        order = np.argsort(times, kind="stable")
+        times, indices, is_enter = times[order], indices[order], is_enter[order]
+        change_times, first = np.unique(times, return_index=True)
+        bounds = np.append(first, len(times))
+        added = [indices[a:b][is_enter[a:b]] for a, b in zip(bounds[:-1], bounds[1:])]
+        removed = [indices[a:b][~is_enter[a:b]] for a, b in zip(bounds[:-1], bounds[1:])]
+        return change_times, added, removed
+
+    def sweep(self, window=0.0):
+        """Değişim noktaları boyunca ilerler; her noktada (t, eklenenler, çıkanlar, durum) üretir.
+
+        durum: artımlı güncellenen _SweepState (çift sayaçları, dereceler, güçler); üretilen
+        nesne her adımda aynıdır, saklanacaksa kopyalanmalıdır.
+        """
+        state = _SweepState(self)
+        for t, added, removed in zip(*self.changes(window)):
+            state.apply(added, removed)
+            yield t, added, removed, state
+
+    def snapshots(self, times, window=0.0):
+        """Artan zaman noktalarındaki ağları (t, seyrek komşuluk matrisi) olarak üretir"""
+        times = np.asarray(times, dtype=np.float64)
+        change_times, added, removed = self.changes(window)
+        state = _SweepState(self)
+        position = 0
+        for t in times:
+            # t'ye kadar olan değişimler uygulanır (yalnızca eklenen/çıkan ilişkiler)
+            while position < len(change_times) and change_times[position] <= t:
+                state.apply(added[position], removed[position])
+                position += 1
+            yield t, state.adjacency()
+
+    # --- Ölçüler ---
+
+    def key_characters(self, min_importance=8):
+        """Önem derecesi min_importance ve üzerindeki karakterlerin indeksleri"""
+        return np.flatnonzero(self.character_importance >= min_importance)
+
+    def change_metrics(self, window=0.0, key_characters=None):
+        """Her değişim noktasından sonraki ağ ölçüleri; ilk satır hiçbir ilişki başlamadan önceki durumdur.
+
+        Döndürür: (zamanlar, {ölçü adı: dizi}); zamanlar[0] = -inf.
+        """
+        from scipy.sparse import csgraph
+
+        key = self.key_characters() if key_characters is None else np.asarray(key_characters, dtype=np.int64)
+        n = self.n_characters
+        possible = n * (n - 1) / 2 if n > 1 else 1.0
+
+        change_times, added, removed = self.changes(window)
+        rows = len(change_times) + 1
+        metrics = {
+            "Active Relationships": np.zeros(rows, dtype=np.int64),
+            "Edges": np.zeros(rows, dtype=np.int64),
+            "Density": np.zeros(rows),
+            "Largest Component": np.zeros(rows, dtype=np.int64),
+        }
+        key_degree = np.zeros((rows, len(key)))
+        key_strength = np.zeros((rows, len(key)))
+        metrics["Largest Component"][0] = 1 if n else 0
+
+        state = _SweepState(self)
+        largest = metrics["Largest Component"][0]
+        for row, (plus, minus) in enumerate(zip(added, removed), 1):
+            edges_changed = state.apply(plus, minus)
+            if edges_changed:
+                # Bileşenler yalnızca kenar kümesi değiştiğinde yeniden hesaplanır
+                adjacency = state.adjacency()
+                if adjacency.nnz:
+                    _, labels = csgraph.connected_components(adjacency, directed=False)
+                    largest = int(np.bincount(labels).max())
+                else:
+                    largest = 1 if n else 0
+            metrics["Active Relationships"][row] = state.n_active
+            metrics["Edges"][row] = state.n_edges
+            metrics["Density"][row] = state.n_edges / possible
+            metrics["Largest Component"][row] = largest
+            key_degree[row] = state.degree[key] / max(n - 1, 1)
+            key_strength[row] = state.strength[key]
+
+        for column, index in enumerate(key):
+            name = self.character_names[index]
+            metrics[f"Degree Centrality: {name}"] = key_degree[:, column]
+            metrics[f"Strength: {name}"] = key_strength[:, column]
+        return np.concatenate([[-np.inf], change_times]), metrics
+
+    def metrics(self, times=None, step=1.0, window=0.0, key_characters=None):
+        """Zaman ızgarasında ağ ölçüleri (DataFrame); varsayılan ızgara 0'dan film süresine step aralıklı"""
+        import pandas as pd
+
+        if times is None:
+            times = np.arange(0.0, self.duration + step / 2, step)
+        times = np.asarray(times, dtype=np.float64)
+        change_times, metrics = self.change_metrics(window, key_characters)
+        row = np.searchsorted(change_times, times, side="right") - 1
+        frame = pd.DataFrame({name: values[row] for name, values in metrics.items()})
+        frame.insert(0, "Time", times)
+        return frame
+
+
+class _SweepState:
+    """Tarama sırasında etkin ağın artımlı durumu"""
+
+    def __init__(self, network):
+        self.network = network
+        n_pairs = len(network.pair_first)
+        self.pair_count = np.zeros(n_pairs, dtype=np.int64)
+        self.pair_weight = np.zeros(n_pairs)
+        self.degree = np.zeros(network.n_characters)
+        self.strength = np.zeros(network.n_characters)
+        self.n_active = 0
+        self.n_edges = 0
+
+    def apply(self, added, removed):
+        """Eklenen ve çıkan ilişkileri uygular; kenar kümesi değiştiyse True döndürür"""
+        network = self.network
+        changed = False
+        for relationships, sign in ((added, 1), (removed, -1)):
+            if len(relationships) == 0:
+                continue
+            pairs = network.pair[relationships]
+            # Yalnızca eklenen/çıkan ilişkilerin çiftlerine bakılır (adım başına O(değişim))
+            touched = np.unique(pairs)
+            before = self.pair_count[touched] > 0
+            np.add.at(self.pair_count, pairs, sign)
+            np.add.at(self.pair_weight, pairs, sign * network.strength[relationships])
+            after = self.pair_count[touched] > 0
+
+            # Çift etkinliği değişen kenarlar dereceleri günceller
+            changed_pairs = before != after
+            flipped = touched[changed_pairs]
+            if len(flipped):
+                delta = np.where(after[changed_pairs], 1.0, -1.0)
+                np.add.at(self.degree, network.pair_first[flipped], delta)
+                np.add.at(self.degree, network.pair_second[flipped], delta)
+                self.n_edges += int(delta.sum())
+                changed = True
+
+            weights = sign * network.strength[relationships]
+            np.add.at(self.strength, network.pair_first[pairs], weights)
+            np.add.at(self.strength, network.pair_second[pairs], weights)
+            self.n_active += sign * len(relationships)
+        return changed
+
+    def adjacency(self):
+        """Etkin ağın seyrek komşuluk matrisi"""
+        from scipy import sparse
+
+        network = self.network
+        n = network.n_characters
+        active = np.flatnonzero(self.pair_count > 0)
+        rows = np.concatenate([network.pair_first[active], network.pair_second[active]])
+        cols = np.concatenate([network.pair_second[active], network.pair_first[active]])
+        weights = np.tile(self.pair_weight[active], 2)
+        return sparse.csr_matrix((weights, (rows, cols)), shape=(n, n))
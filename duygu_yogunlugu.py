@@ -0,0 +1,118 @@
+import numpy as np
+
+# Duygusal yoğunluk eğrisi.
+# Önem derecesi i olan ve t_e anında gerçekleşen olay, t anındaki yoğunluğa
+#   1.5·i · exp(-(t - t_e)² / (2σ²)),   |t - t_e| < R,   R = süre·(0.05 + i/20),   σ = R/3
+# kadar katkı yapar; eğri tüm olayların katkılarının toplamıdır.
+#
+# Az sayıda olay ve nokta için katkılar NumPy yayınlama (broadcasting) ile parça
+# parça doğrudan hesaplanır. Büyük problemlerde olaylar önem derecesine göre
+# gruplanır: aynı dereceli olayların çekirdeği aynı olduğundan, olaylar ızgaraya
+# doğrusal olarak dağıtılıp grubun çekirdeğiyle FFT üzerinden konvolüsyon alınır.
+#
+# FFT yolu yaklaşıktır: ızgara noktalarına denk gelmeyen olaylar iki komşu noktaya
+# dağıtılır ve çekirdeğin R'deki kesilme sınırı ızgaraya yuvarlanır. Olaylar ızgara
+# noktalarındaysa (örn. tam saniyeler ve step=1) sonuç doğrudan toplamla aynıdır;
+# saniyelik ızgarada rastgele zamanlı olaylarda en büyük hata tepe değerin ~1e-5'i,
+# kaba ızgaralarda (örn. points=100-5000) ~1e-3'üdür. "auto" yöntemi küçük
+# problemlerde her zaman doğrudan toplamı kullanır.
+
+_DIRECT_LIMIT = 20_000_000  # olay × nokta; bunun üstünde FFT kullanılır
+_CHUNK_SIZE = 2_000_000     # doğrudan hesapta bir seferde oluşturulan hücre sayısı
+
+
+def intensity_grid(duration, step=None, points=None):
+    """[0, duration] aralığında düzgün zaman ızgarası; step (saniye) ya da nokta sayısı verilir"""
+    if points is not None:
+        return np.linspace(0, duration, points)
+    if step is None:
+        step = 1.0
+    return np.arange(int(np.floor(duration / step)) + 1) * float(step)
+
+
+def _kernel_params(importance, duration):
+    impact = importance * 1.5
+    radius = duration * (0.05 + importance / 20)
+    return impact, radius, radius / 3
+
+
+def intensity_direct(times, event_times, importance, duration):
+    """Tüm olayların etkisini ızgara üzerinde doğrudan (yayınlama ile) toplar"""
+    times = np.asarray(times, dtype=np.float64)
+    event_times = np.asarray(event_times, dtype=np.float64)
+    impact, radius, sigma = _kernel_params(np.asarray(importance, dtype=np.float64), duration)
+
+    intensity = np.zeros(len(times))
+    chunk = max(1, _CHUNK_SIZE // max(len(times), 1))
+    for start in range(0, len(event_times), chunk):
+        part = slice(start, start + chunk)
+        distance = times[None, :] - event_times[part, None]
+        effect = impact[part, None] * np.exp(-distance ** 2 / (2 * sigma[part, None] ** 2))
+        effect[np.abs(distance) >= radius[part, None]] = 0
+        intensity += effect.sum(axis=0)
+    return intensity
+
+
+def intensity_fft(times, event_times, importance, duration):
+    """Aynı önem derecesindeki olayları gruplayıp FFT konvolüsyonuyla toplar (düzgün ızgara gerekir).
+
+    Sonuç yaklaşıktır; hata payı için modül açıklamasına bakın.
+    """
+    times = np.asarray(times, dtype=np.float64)
+    event_times = np.asarray(event_times, dtype=np.float64)
+    importance = np.asarray(importance, dtype=np.float64)
+    n = len(times)
+    if n < 2:
+        return intensity_direct(times, event_times, importance, duration)
+    step = times[1] - times[0]
+
+    intensity = np.zeros(n)
+    for level in np.unique(importance):
+        impact, radius, sigma = _kernel_params(level, duration)
+        half = int(np.ceil(radius / step))
+        if half == 0 or impact == 0:
+            continue
+
+        # Olayları iki komşu ızgara noktasına ağırlıklı dağıt; ızgaranın iki yanında
+        # çekirdek yarıçapı kadar dolgu bırakılır, böylece dışarıdaki olaylar da etki eder
+        position = (event_times[importance == level] - times[0]) / step + half
+        inside = (position >= 0) & (position <= n + 2 * half - 2)
+        position = position[inside]
+        lower = np.floor(position).astype(np.int64)
+        frac = position - lower
+        impulses = np.bincount(lower, weights=1 - frac, minlength=n + 2 * half)
+        impulses += np.bincount(lower + 1, weights=frac, minlength=n + 2 * half)
+
+        offsets = np.arange(-half, half + 1) * step
+        kernel = impact * np.exp(-offsets ** 2 / (2 * sigma ** 2))
+        kernel[np.abs(offsets) >= radius] = 0
+
+        size = len(impulses) + len(kernel) - 1
+        nfft = 1 << (size - 1).bit_length()
+        full = np.fft.irfft(np.fft.rfft(impulses, nfft) * np.fft.rfft(kernel, nfft), nfft)
+        intensity += full[2 * half:2 * half + n]
+    return intensity
+
+
+def emotional_intensity(film, step=None, points=None, method="auto"):
+    """Filmin duygusal yoğunluk eğrisini (zaman noktaları, yoğunluk) olarak döndürür.
+
+    step: ızgara aralığı (saniye, varsayılan 1), points: sabit nokta sayısı.
+    method: "direct", "fft" ya da "auto" (problem büyüklüğüne göre seçilir).
+    """
+    columns = film.columns()
+    times = intensity_grid(film.duration, step, points)
+    if method == "auto":
+        method = "fft" if columns.n_events * len(times) > _DIRECT_LIMIT else "direct"
+    if method == "fft":
+        values = intensity_fft(times, columns.event_time, columns.event_importance, film.duration)
+    elif method == "direct":
+        values = intensity_direct(times, columns.event_time, columns.event_importance, film.duration)
+    else:
+        raise ValueError(f"Bilinmeyen yöntem: {method}")
+    return times, values
+
+
+def intensity_matrix(films, points=500, method="auto"):
+    """Filmlerin eğrilerini göreli zamanda (0-1) aynı sayıda noktada satır satır döndürür"""
+    return np.vstack([emotional_intensity(film, points=points, method=method)[1] for film in films])
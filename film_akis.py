@@ -0,0 +1,248 @@
+import json
+from film_veri_yapisi import Character, Location, Scene, Relationship, Event, FilmDataChecker
+
+# Film JSON dosyalarını tamamını belleğe almadan, parça parça okuyan yükleyici.
+# Üst düzey nesnenin her alanı sırayla işlenir; diziler eleman eleman çözülür
+# ve her eleman mevcut character_map / location_map üzerinden nesneye dönüştürülür.
+# Kayıtlar nesneye dönüştürülmeden önce Film.from_dict ile aynı denetimlerden geçer
+# (FilmDataChecker); sorunlu kayıtlar atlanır ve dosya sonunda aynı ValueError verilir.
+
+_WHITESPACE = " \t\n\r"
+
+# Dizi bölümleri ve her elemanın üretildiği kayıt türü
+SECTION_KINDS = {
+    "characters": "character",
+    "locations": "location",
+    "scenes": "scene",
+    "relationships": "relationship",
+    "events": "event",
+}
+
+# Bir bölümün nesnelerini çözmek için önceden yüklenmesi gereken bölümler
+SECTION_DEPENDENCIES = {
+    "characters": (),
+    "locations": (),
+    "scenes": ("characters", "locations"),
+    "relationships": ("characters",),
+    "events": ("characters", "locations"),
+}
+
+
+class _JsonStream:
+    def __init__(self, f, chunk_size=1 << 16):
+        self._f = f
+        self._chunk_size = chunk_size
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._closed = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self):
+        """Tamponun tüketilmiş kısmını atar ve dosyadan yeni parça okur"""
+        if self._eof:
+            return False
+        chunk = self._f.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self):
+        """Boşlukları atlayıp sıradaki karakteri döndürür, dosya sonunda '' döner"""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Geçersiz JSON: '{char}' bekleniyordu, '{found}' bulundu")
+        self._pos += 1
+
+    def value(self):
+        """Sıradaki tek bir JSON değerini çözer"""
+        self.peek()
+        while True:
+            try:
+                obj, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # Tamponun sonunda biten bir sayı yarım kalmış olabilir
+            if end == len(self._buf) and self._fill():
+                continue
+            self._pos = end
+            return obj
+
+    def array(self):
+        """Bir JSON dizisinin elemanlarını tek tek üretir"""
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self.value()
+            self._separator("]")
+            if self._closed:
+                return
+
+    def members(self):
+        """Bir JSON nesnesinin anahtarlarını üretir; çağıran her değeri tüketmelidir"""
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            self._separator("}")
+            if self._closed:
+                return
+
+    def _separator(self, closing):
+        found = self.peek()
+        if found not in (",", closing):
+            raise ValueError(f"Geçersiz JSON: ',' veya '{closing}' bekleniyordu, '{found}' bulundu")
+        self._pos += 1
+        self._closed = found == closing
+
+
+def iter_film_json(filename, kinds=None, character_map=None, location_map=None):
+    """Film JSON dosyasını akış halinde okuyup (tür, değer) çiftleri üretir.
+
+    Türler: "title", "duration", "character", "location", "scene", "relationship", "event"
+    (ve yalnızca kinds ile istenirse "journal_seq").
+    kinds verilirse yalnızca bu türler üretilir; karakter ve lokasyonlar isim
+    çözümlemesi için yine de okunur. Sahne, ilişki ve olaylar dosyada karakter
+    ve lokasyonlardan sonra gelmelidir (save_to_json bu sırayla yazar).
+    character_map / location_map verilirse isimler bunlardan çözülür ve istenmeyen
+    karakter/lokasyon kayıtları nesneye dönüştürülmez.
+    Tutarsız veride (yinelenen isim/kimlik, tanımsız başvuru) okuma bitince
+    Film.from_dict'inkiyle aynı ValueError verilir.
+    """
+    known = character_map is not None
+    if known:
+        checker = FilmDataChecker(character_map, location_map)
+    else:
+        checker = FilmDataChecker()
+        character_map = {}
+        location_map = {}
+
+    with open(filename, "r", encoding="utf-8") as f:
+        stream = _JsonStream(f)
+        for key in stream.members():
+            kind = SECTION_KINDS.get(key)
+            if kind is None:
+                value = stream.value()
+                if key in ("title", "duration") and (kinds is None or key in kinds):
+                    yield key, value
+                elif key == "journal_seq" and kinds is not None and key in kinds:
+                    # Günlük kayıt numarası yalnızca açıkça istendiğinde üretilir
+                    yield key, value
+                continue
+
+            wanted = kinds is None or kind in kinds
+            for data in stream.array():
+                if not wanted and (known or kind not in ("character", "location")):
+                    continue
+                if kind in ("character", "location") and not known and not checker.add_name(kind, data["name"]):
+                    continue
+                if not checker.check(kind, data):
+                    continue
+                if kind == "character":
+                    item = Character.from_dict(data)
+                    if not known:
+                        character_map[item.name] = item
+                elif kind == "location":
+                    item = Location.from_dict(data)
+                    if not known:
+                        location_map[item.name] = item
+                elif kind == "scene":
+                    item = Scene.from_dict(data, character_map, location_map)
+                elif kind == "relationship":
+                    item = Relationship.from_dict(data, character_map)
+                else:
+                    item = Event.from_dict(data, character_map, location_map)
+                if wanted:
+                    yield kind, item
+    checker.raise_problems()
+
+
+def iter_scenes(filename):
+    """Dosyadaki sahneleri filmi oluşturmadan tek tek üretir"""
+    for _, scene in iter_film_json(filename, kinds=("scene",)):
+        yield scene
+
+
+def iter_events(filename):
+    """Dosyadaki olayları filmi oluşturmadan tek tek üretir"""
+    for _, event in iter_film_json(filename, kinds=("event",)):
+        yield event
+
+
+def load_film_stream(filename, film_class):
+    """Film nesnesini ham sözlük ağacını bellekte tutmadan oluşturur"""
+    film = film_class(None, None)
+    for kind, value in iter_film_json(filename):
+        if kind == "title":
+            film.title = value
+        elif kind == "duration":
+            film.duration = value
+        else:
+            film.add_entity(value)
+    return film
+
+
+def _with_dependencies(sections):
+    result = []
+    for section in sections:
+        if section not in SECTION_DEPENDENCIES:
+            raise ValueError(f"Bilinmeyen bölüm: {section}")
+        for name in SECTION_DEPENDENCIES[section] + (section,):
+            if name not in result:
+                result.append(name)
+    return result
+
+
+def load_film_sections(filename, film_class, sections):
+    """Yalnızca istenen bölümleri (ve bağımlılıklarını) yükler; diğer bölümler
+    film üzerinde ertelenir ve ilk erişildiklerinde dosyadan okunur"""
+    wanted = _with_dependencies(sections)
+    film = film_class(None, None)
+    kinds = ("title", "duration") + tuple(SECTION_KINDS[section] for section in wanted)
+    for kind, value in iter_film_json(filename, kinds=kinds):
+        if kind == "title":
+            film.title = value
+        elif kind == "duration":
+            film.duration = value
+        else:
+            film.add_entity(value)
+
+    for section in SECTION_KINDS:
+        if section not in wanted:
+            film.defer_section(section, lambda section=section: read_section(filename, film, section))
+    return film
+
+
+def read_section(filename, film, section):
+    """Bir bölümün nesnelerini, isimleri filmin mevcut karakter/lokasyonlarıyla çözerek okur"""
+    dependencies = SECTION_DEPENDENCIES[section]
+    if not dependencies:
+        kinds = (SECTION_KINDS[section],)
+        return [item for _, item in iter_film_json(filename, kinds=kinds)]
+
+    # Bağımlı bölümlere erişmek, ertelenmişlerse onları da yükler
+    character_map = film.character_map
+    location_map = film.location_map if "locations" in dependencies else {}
+    return [item for _, item in iter_film_json(filename, kinds=(SECTION_KINDS[section],),
+                                               character_map=character_map,
+                                               location_map=location_map)]
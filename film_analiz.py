@@ -1,32 +1,35 @@
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-import networkx as nx
-from matplotlib.colors import LinearSegmentedColormap
-import matplotlib.patches as mpatches
-from matplotlib.lines import Line2D
-import json
-from datetime import timedelta
+import os
+import sys
 from film_veri_yapisi import Film, format_time
+from film_akis import iter_film_json
+from analiz_onbellegi import DEFAULT_CACHE_DIR
+from analiz_planlayici import AnalysisRegistry
+from paralel_cizim import render_film
 
-# JSON dosyasından film verilerini yükle
-film = Film.load_from_json("C:\\Users\\pc\Desktop\\film\\interstaller_data.json")
+# Ağır kütüphaneler (pandas, numpy, matplotlib, seaborn, networkx) yalnızca onları
+# kullanan grafik fonksiyonunun içinde içe aktarılır; modülü içe aktarmak hiçbir
+# analiz çalıştırmaz ve bu kütüphaneleri yüklemez.
 
-def analyze_character_screen_time(film):
-    """Her karakterin ekranda göründüğü toplam süreyi hesaplar"""
-    character_screen_time = {char.name: 0 for char in film.characters}
+def _output_path(filename, output_dir=None):
+    """Çıktı dosyasının yolu; output_dir verilirse dizin yoksa oluşturulur"""
+    if not output_dir:
+        return filename
+    os.makedirs(output_dir, exist_ok=True)
+    return os.path.join(output_dir, filename)
+
+def analyze_character_screen_time(film, columns=None, output_dir=None):
+    """Her karakterin ekranda göründüğü toplam süreyi hesaplar (çakışan sahneler bir kez sayılır)"""
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    from aralik_birlesimi import character_union
     
-    for scene in film.scenes:
-        scene_duration = scene.end_time - scene.start_time
-        for character in scene.characters:
-            character_screen_time[character.name] += scene_duration
+    if columns is None:
+        columns = film.columns()
     
-    # Sonuçları DataFrame'e dönüştür
-    df = pd.DataFrame({
-        'Character': list(character_screen_time.keys()),
-        'Screen Time (seconds)': list(character_screen_time.values())
-    })
+    # Karakterin sahne aralıkları birleştirilir; iç içe ya da kesişen sahneler
+    # ekran süresini iki kez saydırmaz (bkz. aralik_birlesimi)
+    df = character_union(columns).frame(columns.character_names, 'Screen Time (seconds)')
+    df = df.rename(columns={'Name': 'Character'})
     
     # Ekran süresine göre sırala
     df = df.sort_values('Screen Time (seconds)', ascending=False)
@@ -36,25 +39,51 @@ def analyze_character_screen_time(film):
     sns.barplot(x='Screen Time (seconds)', y='Character', data=df)
     plt.title(f'Character Screen Time in {film.title}')
     plt.tight_layout()
-    plt.savefig('character_screen_time.png')
+    plt.savefig(_output_path('character_screen_time.png', output_dir))
     plt.close()
     
     return df
 
-def analyze_location_usage(film):
-    """Her lokasyonun kullanıldığı toplam süreyi hesaplar"""
-    location_usage = {loc.name: 0 for loc in film.locations}
-    
-    for scene in film.scenes:
-        scene_duration = scene.end_time - scene.start_time
-        location_usage[scene.location.name] += scene_duration
+def analyze_character_screen_time_stream(filename):
+    """Karakter ekran sürelerini JSON dosyasını akış halinde, tek geçişte okuyarak hesaplar"""
+    import numpy as np
+    import pandas as pd
+    from aralik_birlesimi import IntervalUnion
+    
+    character_codes = {}
+    owners, starts, ends = [], [], []
+    
+    # Sahneler tek tek okunur; bellekte yalnızca karakterler ve (karakter, başlangıç, bitiş) üçlüleri tutulur
+    for kind, item in iter_film_json(filename, kinds=("character", "scene")):
+        if kind == "character":
+            character_codes[item.name] = len(character_codes)
+            continue
+        for character in item.characters:
+            owners.append(character_codes[character.name])
+            starts.append(item.start_time)
+            ends.append(item.end_time)
     
-    # Sonuçları DataFrame'e dönüştür
+    union = IntervalUnion(np.array(owners, dtype=np.int64), starts, ends, len(character_codes))
     df = pd.DataFrame({
-        'Location': list(location_usage.keys()),
-        'Usage Time (seconds)': list(location_usage.values())
+        'Character': list(character_codes.keys()),
+        'Screen Time (seconds)': union.total()
     })
     
+    return df.sort_values('Screen Time (seconds)', ascending=False)
+
+def analyze_location_usage(film, columns=None, output_dir=None):
+    """Her lokasyonun kullanıldığı toplam süreyi hesaplar (çakışan sahneler bir kez sayılır)"""
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    from aralik_birlesimi import location_union
+    
+    if columns is None:
+        columns = film.columns()
+    
+    # Lokasyondaki sahne aralıkları birleştirilir
+    df = location_union(columns).frame(columns.location_names, 'Usage Time (seconds)')
+    df = df.rename(columns={'Name': 'Location'})
+    
     # Kullanım süresine göre sırala
     df = df.sort_values('Usage Time (seconds)', ascending=False)
     
@@ -63,18 +92,24 @@ def analyze_location_usage(film):
     sns.barplot(x='Usage Time (seconds)', y='Location', data=df)
     plt.title(f'Location Usage in {film.title}')
     plt.tight_layout()
-    plt.savefig('location_usage.png')
+    plt.savefig(_output_path('location_usage.png', output_dir))
     plt.close()
     
     return df
 
-def create_character_network(film):
+def create_character_network(film, output_dir=None):
     """Karakterler arasındaki ilişkileri gösteren bir ağ grafiği oluşturur"""
+    import numpy as np
+    import matplotlib.pyplot as plt
+    from matplotlib.lines import Line2D
+    import networkx as nx
+    from ag_yerlesimi import LayoutStore, spring_layout
+    
     G = nx.Graph()
     
-    # Düğümleri ekle (karakterler)
+    # Düğümleri ekle (karakterler); kararlı kimlik, yeniden adlandırmada yerleşimi korur
     for character in film.characters:
-        G.add_node(character.name, importance=character.importance)
+        G.add_node(character.name, importance=character.importance, id=character.id)
     
     # Kenarları ekle (ilişkiler)
     for relationship in film.relationships:
@@ -101,8 +136,9 @@ def create_character_network(film):
     
     edge_colors = [color_map[G[u][v]['type']] for u, v in G.edges]
     
-    # Ağı çiz
-    pos = nx.spring_layout(G, seed=42)
+    # Ağı çiz; yerleşim film dosyasının yanında saklanır, küçük düzenlemelerde
+    # önceki yerleşimden devam edilir (bkz. ag_yerlesimi)
+    pos = spring_layout(G, store=LayoutStore.for_film(film), seed=42)
     nx.draw_networkx_nodes(G, pos, node_size=node_sizes, alpha=0.8)
     nx.draw_networkx_edges(G, pos, width=edge_widths, alpha=0.5, edge_color=edge_colors)
     nx.draw_networkx_labels(G, pos, font_size=10)
@@ -115,15 +151,111 @@ def create_character_network(film):
     plt.title(f'Character Relationships in {film.title}')
     plt.axis('off')
     plt.tight_layout()
-    plt.savefig('character_network.png')
+    plt.savefig(_output_path('character_network.png', output_dir))
     plt.close()
     
     return G
 
-def create_timeline(film):
+def analyze_character_network(film, network=None, output_dir=None):
+    """Karakter ağının merkezilik, kümelenme ve topluluk ölçülerini hesaplar (bkz. karakter_agi)"""
+    if network is None:
+        from karakter_agi import CharacterNetwork
+        network = CharacterNetwork.from_film(film)
+    
+    df = network.metrics().sort_values('PageRank', ascending=False)
+    df.to_csv(_output_path('character_network_metrics.csv', output_dir))
+    
+    return df
+
+def create_network_evolution_chart(film, step=1.0, window=0.0, output_dir=None):
+    """İlişki ağının film boyunca değişimini (yoğunluk, en büyük bileşen, ana karakter merkeziliği) gösterir"""
+    import matplotlib.pyplot as plt
+    from dinamik_ag import DynamicNetwork
+    
+    # Ağ yalnızca ilişki uç noktalarında değişir; saniyelik ızgara tarama çizgisiyle tek geçişte çıkar
+    network = DynamicNetwork.from_film(film)
+    df = network.metrics(step=step, window=window)
+    
+    fig, (ax_top, ax_bottom) = plt.subplots(2, 1, figsize=(15, 9), sharex=True)
+    
+    ax_top.plot(df['Time'], df['Density'], color='tab:blue', label='Density')
+    ax_top.set_ylabel('Density')
+    ax_component = ax_top.twinx()
+    ax_component.step(df['Time'], df['Largest Component'], where='post', color='tab:orange', label='Largest Component')
+    ax_component.set_ylabel('Largest Component (characters)')
+    ax_top.legend(handles=ax_top.get_lines() + ax_component.get_lines(), loc='upper left')
+    ax_top.set_title(f'Relationship Network Evolution in {film.title}')
+    
+    # Ana karakterlerin derece merkeziliği
+    for column in df.columns:
+        if column.startswith('Degree Centrality: '):
+            ax_bottom.step(df['Time'], df[column], where='post', label=column[len('Degree Centrality: '):])
+    ax_bottom.set_ylabel('Degree Centrality')
+    ax_bottom.legend(loc='upper left')
+    
+    plt.xticks([0, film.duration/4, film.duration/2, 3*film.duration/4, film.duration],
+              [format_time(0), format_time(film.duration/4), 
+               format_time(film.duration/2), format_time(3*film.duration/4), 
+               format_time(film.duration)])
+    ax_bottom.set_xlabel('Time')
+    plt.tight_layout()
+    plt.savefig(_output_path('network_evolution.png', output_dir))
+    plt.close()
+    
+    return df
+
+def create_activity_chart(film, raster=None, output_dir=None):
+    """Saniyelik kadro, lokasyon, ilişki ve olay yoğunluğu dizilerini alt alta gösterir"""
+    import numpy as np
+    import matplotlib.pyplot as plt
+    
+    if raster is None:
+        raster = film.raster()
+    times = raster.times
+    
+    fig, axes = plt.subplots(4, 1, figsize=(15, 10), sharex=True,
+                             gridspec_kw={'height_ratios': [3, 1, 3, 3]})
+    
+    axes[0].fill_between(times, raster.active_cast, step='post', alpha=0.6)
+    axes[0].set_ylabel('Active Cast')
+    axes[0].set_title(f'Activity Timeline of {film.title}')
+    
+    # Lokasyon şeridi: her kutunun lokasyon kodu bir renk (lokasyonsuz kutular boş)
+    codes = np.ma.masked_less(raster.active_location, 0)
+    axes[1].imshow(codes[np.newaxis, :], aspect='auto', cmap='tab20', interpolation='nearest',
+                   extent=(0, raster.n_bins * raster.step, 0, 1))
+    axes[1].set_yticks([])
+    axes[1].set_ylabel('Location')
+    
+    axes[2].step(times, raster.active_relationships, where='post', color='tab:green')
+    axes[2].set_ylabel('Active Relationships')
+    
+    # Yalnızca olay bulunan kutular çizilir (kutu ortasında dikey çizgi)
+    nonzero = np.flatnonzero(raster.event_importance)
+    axes[3].vlines(times[nonzero] + raster.step / 2, 0, raster.event_importance[nonzero],
+                   color='tab:red', linewidth=2)
+    axes[3].set_ylim(bottom=0)
+    axes[3].set_ylabel('Event Importance')
+    
+    plt.xticks([0, film.duration/4, film.duration/2, 3*film.duration/4, film.duration],
+              [format_time(0), format_time(film.duration/4), 
+               format_time(film.duration/2), format_time(3*film.duration/4), 
+               format_time(film.duration)])
+    axes[3].set_xlabel('Time')
+    plt.tight_layout()
+    plt.savefig(_output_path('activity_timeline.png', output_dir))
+    plt.close()
+    
+    return raster.frame()
+
+def create_timeline(film, output_dir=None):
     """Film zaman çizelgesi oluşturur"""
-    # Olayları zaman sırasına göre sırala
-    events = sorted(film.events, key=lambda x: x.time)
+    import numpy as np
+    import matplotlib.pyplot as plt
+    from matplotlib.lines import Line2D
+    
+    # Film olayları zaman sırasına göre tutar
+    events = film.events
     
     # Zaman çizelgesi oluştur
     plt.figure(figsize=(15, 8))
@@ -166,44 +298,41 @@ def create_timeline(film):
     plt.grid(axis='x', linestyle='--', alpha=0.7)
     
     plt.tight_layout()
-    plt.savefig('event_timeline.png')
+    plt.savefig(_output_path('event_timeline.png', output_dir))
     plt.close()
 
-def create_character_location_heatmap(film):
+def create_character_location_heatmap(film, incidence=None, output_dir=None):
     """Karakterlerin hangi lokasyonlarda ne kadar zaman geçirdiğini gösteren ısı haritası"""
-    # Karakter-lokasyon matrisini oluştur
-    character_names = [char.name for char in film.characters]
-    location_names = [loc.name for loc in film.locations]
+    import pandas as pd
+    import matplotlib.pyplot as plt
+    import seaborn as sns
     
-    # Matris oluştur ve sıfırla doldur
-    matrix = np.zeros((len(character_names), len(location_names)))
-    
-    # Sahneleri dolaşarak matrisi doldur
-    for scene in film.scenes:
-        scene_duration = scene.end_time - scene.start_time
-        location_idx = location_names.index(scene.location.name)
-        
-        for character in scene.characters:
-            character_idx = character_names.index(character.name)
-            matrix[character_idx, location_idx] += scene_duration
+    # Karakter-lokasyon süre matrisi: Aᵀ·D·L
+    if incidence is None:
+        incidence = film.incidence()
+    matrix = incidence.character_location().toarray()
     
     # DataFrame'e dönüştür
-    df = pd.DataFrame(matrix, index=character_names, columns=location_names)
+    df = pd.DataFrame(matrix, index=incidence.character_names, columns=incidence.location_names)
     
     # Isı haritası oluştur
     plt.figure(figsize=(14, 10))
     sns.heatmap(df, annot=True, fmt='.0f', cmap='YlGnBu', linewidths=.5)
     plt.title(f'Character-Location Time Distribution in {film.title} (seconds)')
     plt.tight_layout()
-    plt.savefig('character_location_heatmap.png')
+    plt.savefig(_output_path('character_location_heatmap.png', output_dir))
     plt.close()
     
     return df
 
-def create_scene_flow(film):
+def create_scene_flow(film, output_dir=None):
     """Sahnelerin akışını ve geçişlerini gösteren bir diyagram"""
-    # Sahneleri zaman sırasına göre sırala
-    scenes = sorted(film.scenes, key=lambda x: x.start_time)
+    import numpy as np
+    import matplotlib.pyplot as plt
+    import matplotlib.patches as mpatches
+    
+    # Film sahneleri zaman sırasına göre tutar
+    scenes = film.scenes
     
     # Lokasyon renklerini belirle
     location_names = list(set([scene.location.name for scene in scenes]))
@@ -253,49 +382,41 @@ def create_scene_flow(film):
     plt.yticks([])  # Y eksenindeki sayıları gizle
     
     plt.tight_layout()
-    plt.savefig('scene_flow.png')
+    plt.savefig(_output_path('scene_flow.png', output_dir))
     plt.close()
 
-def create_emotional_intensity_chart(film):
-    """Film boyunca duygusal yoğunluğu gösteren bir grafik oluşturur"""
-    # Olayları zaman sırasına göre sırala
-    events = sorted(film.events, key=lambda x: x.time)
+def create_emotional_intensity_chart(film, step=1.0, intensity=None, event_index=None, max_labels=None,
+                                     output_dir=None):
+    """Film boyunca duygusal yoğunluğu gösteren bir grafik oluşturur.
+    
+    step: ızgara aralığı (saniye); intensity: önceden hesaplanmış (zaman, yoğunluk) eğrisi;
+    max_labels: en fazla kaç önemli olayın işaretleneceği (None ise önemi 7 ve üzeri olanların hepsi)
+    """
+    import matplotlib.pyplot as plt
+    from duygu_yogunlugu import emotional_intensity as compute_emotional_intensity
+    
+    if event_index is None:
+        event_index = film.event_index()
     
     # Zaman çizelgesi oluştur
     plt.figure(figsize=(15, 6))
     
-    # X ekseni için zaman noktaları (film süresinin %1'i aralıklarla)
-    time_points = np.linspace(0, film.duration, 100)
-    emotional_intensity = np.zeros(len(time_points))
-    
-    # Her olay için duygusal etki hesapla (önem derecesi ve mesafesine göre)
-    for event in events:
-        # Olayın duygusal etkisi (önem derecesine bağlı)
-        impact = event.importance * 1.5
-        
-        # Etki mesafesi (önem derecesine bağlı)
-        impact_distance = film.duration * (0.05 + (event.importance / 20))
-        
-        # Her zaman noktası için etki hesapla
-        for i, t in enumerate(time_points):
-            # Olaya olan mesafe
-            distance = abs(t - event.time)
-            
-            # Mesafeye bağlı olarak azalan etki
-            if distance < impact_distance:
-                # Gaussian etki fonksiyonu
-                effect = impact * np.exp(-(distance**2) / (2 * (impact_distance/3)**2))
-                emotional_intensity[i] += effect
+    # Tüm olayların Gaussian etkisi tek seferde hesaplanır (bkz. duygu_yogunlugu)
+    if intensity is None:
+        intensity = compute_emotional_intensity(film, step=step)
+    time_points, emotional_intensity = intensity
     
     # Grafiği çiz
     plt.plot(time_points, emotional_intensity, 'r-', linewidth=2)
     
     # Önemli olayları işaretle
-    for event in events:
-        if event.importance >= 7:  # Sadece önemli olayları göster
-            plt.axvline(x=event.time, color='gray', linestyle='--', alpha=0.5)
-            plt.text(event.time, max(emotional_intensity)*0.9, event.name, 
-                    rotation=90, verticalalignment='top', fontsize=8)
+    label_y = emotional_intensity.max() * 0.9 if len(emotional_intensity) else 0
+    # Sadece önemli olayları göster: olay listesi taranmaz, indeks en önemlilerden başlayarak iner
+    for i in sorted(event_index.top_k(k=max_labels, min_importance=7)):
+        event = film.events[i]
+        plt.axvline(x=event.time, color='gray', linestyle='--', alpha=0.5)
+        plt.text(event.time, label_y, event.name, 
+                rotation=90, verticalalignment='top', fontsize=8)
     
     # Eksen etiketleri
     plt.xlabel('Zaman')
@@ -310,31 +431,27 @@ def create_emotional_intensity_chart(film):
     
     plt.grid(True, alpha=0.3)
     plt.tight_layout()
-    plt.savefig('emotional_intensity.png')
+    plt.savefig(_output_path('emotional_intensity.png', output_dir))
     plt.close()
 
-def create_character_interaction_heatmap(film):
+def create_character_interaction_heatmap(film, columns=None, incidence=None, output_dir=None):
     """Karakterlerin birbirleriyle etkileşimlerini gösteren ısı haritası"""
-    # Sadece önemli karakterleri al (önem derecesi 5 ve üzeri)
-    main_characters = [char for char in film.characters if char.importance >= 5]
-    char_names = [char.name for char in main_characters]
+    import numpy as np
+    import matplotlib.pyplot as plt
+    import seaborn as sns
     
-    # Etkileşim matrisini oluştur
-    n_chars = len(main_characters)
-    interaction_matrix = np.zeros((n_chars, n_chars))
+    if columns is None:
+        columns = film.columns()
+    if incidence is None:
+        incidence = film.incidence()
     
-    # Sahneleri dolaşarak etkileşimleri hesapla
-    for scene in film.scenes:
-        scene_chars = [char for char in scene.characters if char in main_characters]
-        scene_duration = scene.end_time - scene.start_time
-        
-        # Sahnedeki her karakter çifti için etkileşim puanı ekle
-        for i, char1 in enumerate(scene_chars):
-            for j, char2 in enumerate(scene_chars):
-                if i != j:  # Kendisiyle etkileşim yok
-                    idx1 = main_characters.index(char1)
-                    idx2 = main_characters.index(char2)
-                    interaction_matrix[idx1, idx2] += scene_duration
+    # Sadece önemli karakterleri al (önem derecesi 5 ve üzeri)
+    main_characters = np.flatnonzero(columns.character_importance >= 5)
+    char_names = [columns.character_names[i] for i in main_characters]
+    
+    # Etkileşim matrisi: iki karakterin birlikte bulunduğu sahnelerin toplam süresi (Aᵀ·D·A)
+    interaction = incidence.interaction()
+    interaction_matrix = interaction[main_characters][:, main_characters].toarray()
     
     # Isı haritası oluştur
     plt.figure(figsize=(12, 10))
@@ -346,17 +463,26 @@ def create_character_interaction_heatmap(film):
     
     plt.title(f'{film.title} - Karakter Etkileşim Isı Haritası (saniye)')
     plt.tight_layout()
-    plt.savefig('character_interaction_heatmap.png')
+    plt.savefig(_output_path('character_interaction_heatmap.png', output_dir))
     plt.close()
 
-def create_character_trajectories(film):
+def create_character_trajectories(film, columns=None, incidence=None, output_dir=None):
     """Karakterlerin film boyunca lokasyonlar arasındaki hareketini gösteren grafik"""
+    import numpy as np
+    import matplotlib.pyplot as plt
+    
+    if columns is None:
+        columns = film.columns()
+    if incidence is None:
+        incidence = film.incidence()
+    
     # Önemli karakterleri seç
-    main_characters = [char for char in film.characters if char.importance >= 6]
+    main_characters = np.flatnonzero(columns.character_importance >= 6)
+    loc_names = columns.location_names
     
-    # Lokasyonları listele
-    locations = film.locations
-    loc_names = [loc.name for loc in locations]
+    # Karakter sütunlarına göre sıkıştırılmış matris: her sütun karakterin sahneleri
+    # (sahneler zamana göre sıralı olduğundan sahne indeksleri de kronolojiktir)
+    scenes_by_character = incidence.scene_character.tocsc()
     
     # Her karakter için yörünge oluştur
     plt.figure(figsize=(15, 8))
@@ -365,27 +491,20 @@ def create_character_trajectories(film):
     colors = plt.cm.tab10(np.linspace(0, 1, len(main_characters)))
     
     for char_idx, character in enumerate(main_characters):
-        # Karakterin bulunduğu sahneleri bul ve zamanla sırala
-        char_scenes = [s for s in film.scenes if character in s.characters]
-        char_scenes = sorted(char_scenes, key=lambda x: x.start_time)
+        # Karakterin bulunduğu sahneler
+        char_scenes = scenes_by_character.indices[
+            scenes_by_character.indptr[character]:scenes_by_character.indptr[character + 1]]
         
-        if not char_scenes:
+        if len(char_scenes) == 0:
             continue
             
-        # Zaman ve lokasyon indeksleri
-        times = []
-        loc_indices = []
-        
-        for scene in char_scenes:
-            times.append(scene.start_time)
-            loc_indices.append(loc_names.index(scene.location.name))
-            
-            times.append(scene.end_time)
-            loc_indices.append(loc_names.index(scene.location.name))
+        # Zaman ve lokasyon indeksleri: her sahne için başlangıç ve bitiş noktası
+        times = np.column_stack([columns.scene_start[char_scenes], columns.scene_end[char_scenes]]).ravel()
+        loc_indices = np.repeat(columns.scene_location[char_scenes], 2)
         
         # Yörüngeyi çiz
         plt.plot(times, loc_indices, '-', color=colors[char_idx], 
-                 label=character.name, linewidth=2, alpha=0.7)
+                 label=columns.character_names[character], linewidth=2, alpha=0.7)
         
         # Başlangıç ve bitiş noktalarını işaretle
         plt.scatter([times[0]], [loc_indices[0]], color=colors[char_idx], s=100, zorder=5)
@@ -408,37 +527,68 @@ def create_character_trajectories(film):
     plt.legend(loc='upper center', bbox_to_anchor=(0.5, -0.05), ncol=5)
     
     plt.tight_layout()
-    plt.savefig('character_trajectories.png')
+    plt.savefig(_output_path('character_trajectories.png', output_dir))
     plt.close()
 
-def create_three_act_structure(film):
-    """Filmin üç perde yapısını analiz eden ve gösteren bir grafik"""
-    # Filmi üç perdeye böl
-    act1_end = film.duration * 0.25  # 1. perde sonu (yaklaşık)
-    act2_end = film.duration * 0.75  # 2. perde sonu (yaklaşık)
-    
-    # Olayları zaman sırasına göre sırala
-    events = sorted(film.events, key=lambda x: x.time)
-    
-    # Perdelere göre olayları grupla
-    act1_events = [e for e in events if e.time <= act1_end]
-    act2_events = [e for e in events if act1_end < e.time <= act2_end]
-    act3_events = [e for e in events if e.time > act2_end]
+def create_three_act_structure(film, prefix_sums=None, raster=None, acts=3, boundaries=None, output_dir=None):
+    """Filmin perde yapısını analiz eden ve gösteren bir grafik; perde özet tablosunu döndürür.
+    
+    Perde sınırları raster sinyallerinden değişim noktası tespitiyle bulunur (bkz. perde_bolme);
+    acts: perde sayısı, boundaries: elle verilen sınırlar [0, s1, ..., süre] (saniye)
+    """
+    import numpy as np
+    import pandas as pd
+    import matplotlib.pyplot as plt
+    from perde_bolme import act_boundaries
+    
+    if prefix_sums is None:
+        prefix_sums = film.prefix_sums()
+    
+    # Filmi veriye dayalı sınırlarla perdelere böl
+    if boundaries is None:
+        boundaries = act_boundaries(film, acts, raster=raster)
+    n_acts = len(boundaries) - 1
+    
+    # Üç perdede klasik adlar, diğer sayılarda yalnızca perde numarası kullanılır
+    names = ['Giriş', 'Gelişme', 'Sonuç'] if n_acts == 3 else [''] * n_acts
+    titles = ['GİRİŞ', 'GELİŞME', 'SONUÇ'] if n_acts == 3 else [''] * n_acts
+    colors = ['blue', 'green', 'red', 'purple', 'orange', 'brown', 'olive', 'cyan', 'pink', 'gray']
+    
+    # Film olayları zaman sırasına göre tutar
+    events = film.events
+    
+    # Perde özetleri önek toplamlarından O(1) okunur: olay sayısı, önem toplamı, en çok görünen karakter
+    rows = []
+    for i in range(n_acts):
+        start = boundaries[i]
+        end = boundaries[i + 1] if i < n_acts - 1 else None
+        screen_time = prefix_sums.screen_time(start=start, end=end)
+        top = int(np.argmax(screen_time)) if len(screen_time) else None
+        rows.append({
+            'Act': f"{i + 1}. Perde",
+            'Start': start,
+            'End': film.duration if end is None else end,
+            'Events': int(prefix_sums.event_count(start=start, end=end)),
+            'Event Importance': prefix_sums.event_importance(start=start, end=end),
+            'Top Character': prefix_sums.character_names[top] if top is not None else '',
+            'Top Screen Time (seconds)': float(screen_time[top]) if top is not None else 0.0,
+        })
+    summary = pd.DataFrame(rows)
     
     # Grafik oluştur
     plt.figure(figsize=(15, 10))
     
     # Perde arka planlarını çiz
-    plt.axvspan(0, act1_end, alpha=0.2, color='blue', label='1. Perde: Giriş')
-    plt.axvspan(act1_end, act2_end, alpha=0.2, color='green', label='2. Perde: Gelişme')
-    plt.axvspan(act2_end, film.duration, alpha=0.2, color='red', label='3. Perde: Sonuç')
+    for i in range(n_acts):
+        label = f"{i + 1}. Perde: {names[i]}".rstrip(': ')
+        plt.axvspan(boundaries[i], boundaries[i + 1], alpha=0.2, color=colors[i % len(colors)], label=label)
     
-    # Olayları çiz
-    for i, event in enumerate(events):
+    # Olayları çiz (perdeler yarı açık [başlangıç, bitiş) aralıklarıdır)
+    inner = np.asarray(boundaries[1:-1])
+    for event in events:
+        act = int(np.searchsorted(inner, event.time, side='right'))
         plt.scatter(event.time, event.importance, s=event.importance*20, 
-                   alpha=0.7, zorder=5, 
-                   color='blue' if event.time <= act1_end else 
-                         'green' if event.time <= act2_end else 'red')
+                   alpha=0.7, zorder=5, color=colors[act % len(colors)])
         
         # Önemli olayları etiketle
         if event.importance >= 8:
@@ -449,28 +599,33 @@ def create_three_act_structure(film):
     # Eksen ayarları
     plt.xlabel('Zaman')
     plt.ylabel('Olay Önemi')
-    plt.title(f'{film.title} - Üç Perde Yapısı Analizi')
+    structure = 'Üç' if n_acts == 3 else str(n_acts)
+    plt.title(f'{film.title} - {structure} Perde Yapısı Analizi')
     
     # X eksenini saat:dakika:saniye formatında göster
-    plt.xticks([0, act1_end, act2_end, film.duration],
-              [format_time(0), format_time(act1_end), 
-               format_time(act2_end), format_time(film.duration)])
+    plt.xticks(boundaries, [format_time(t) for t in boundaries])
     
-    # Perde etiketleri
-    plt.text(act1_end/2, 10.5, "1. PERDE\nGİRİŞ", ha='center', fontsize=12, fontweight='bold')
-    plt.text(act1_end + (act2_end-act1_end)/2, 10.5, "2. PERDE\nGELİŞME", ha='center', fontsize=12, fontweight='bold')
-    plt.text(act2_end + (film.duration-act2_end)/2, 10.5, "3. PERDE\nSONUÇ", ha='center', fontsize=12, fontweight='bold')
+    # Perde etiketleri (olay sayılarıyla)
+    for i in range(n_acts):
+        middle = (boundaries[i] + boundaries[i + 1]) / 2
+        detail = f"{titles[i]} ({rows[i]['Events']} olay)".strip()
+        plt.text(middle, 10.5, f"{i + 1}. PERDE\n{detail}", ha='center', fontsize=12, fontweight='bold')
     
     plt.ylim(0, 11)
     plt.grid(True, alpha=0.3)
-    plt.legend(loc='upper center', bbox_to_anchor=(0.5, -0.05), ncol=3)
+    plt.legend(loc='upper center', bbox_to_anchor=(0.5, -0.05), ncol=min(n_acts, 5))
     
     plt.tight_layout()
-    plt.savefig('three_act_structure.png')
+    plt.savefig(_output_path('three_act_structure.png', output_dir))
     plt.close()
+    
+    return summary
 
-def create_character_development_chart(film):
+def create_character_development_chart(film, output_dir=None):
     """Karakterlerin film boyunca gelişimini gösteren grafik"""
+    import numpy as np
+    import matplotlib.pyplot as plt
+    
     # Önemli karakterleri seç
     main_characters = [char for char in film.characters if char.importance >= 7]
     
@@ -520,11 +675,14 @@ def create_character_development_chart(film):
     plt.legend(loc='upper left')
     
     plt.tight_layout()
-    plt.savefig('character_development.png')
+    plt.savefig(_output_path('character_development.png', output_dir))
     plt.close()
 
-def create_theme_analysis(film):
+def create_theme_analysis(film, output_dir=None):
     """Filmdeki temaların zaman içindeki dağılımını gösteren grafik"""
+    import numpy as np
+    import matplotlib.pyplot as plt
+    
     # Örnek temalar (gerçek uygulamada kullanıcıdan alınmalı)
     themes = ["Aile", "Sevgi", "Bilim", "Keşif", "Hayatta Kalma", "Fedakarlık"]
     
@@ -581,11 +739,14 @@ def create_theme_analysis(film):
     plt.legend(loc='upper center', bbox_to_anchor=(0.5, -0.05), ncol=3)
     
     plt.tight_layout()
-    plt.savefig('theme_analysis.png')
+    plt.savefig(_output_path('theme_analysis.png', output_dir))
     plt.close()
 
-def create_parallel_storylines(film):
+def create_parallel_storylines(film, output_dir=None):
     """Filmdeki paralel hikaye çizgilerini gösteren grafik"""
+    import numpy as np
+    import matplotlib.pyplot as plt
+    
     # Hikaye çizgileri (gerçek uygulamada kullanıcıdan alınmalı)
     storylines = ["Cooper'ın Yolculuğu", "Murph'in Dünya'daki Çalışmaları", 
                  "Mann Gezegeni Olayları", "Brand'in Yolculuğu"]
@@ -642,11 +803,15 @@ def create_parallel_storylines(film):
     plt.grid(True, axis='x', linestyle='--', alpha=0.7)
     
     plt.tight_layout()
-    plt.savefig('parallel_storylines.png')
+    plt.savefig(_output_path('parallel_storylines.png', output_dir))
     plt.close()
 
-def create_visual_style_analysis(film):
+def create_visual_style_analysis(film, output_dir=None):
     """Filmin görsel stilini analiz eden grafik"""
+    import numpy as np
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    
     # Görsel stil kategorileri (gerçek uygulamada kullanıcıdan alınmalı)
     style_categories = ["Yakın Çekim", "Orta Çekim", "Geniş Çekim", 
                        "Karanlık Tonlar", "Parlak Tonlar", "Mavi Tonlar", "Sıcak Tonlar"]
@@ -693,16 +858,24 @@ def create_visual_style_analysis(film):
     plt.title(f'{film.title} - Görsel Stil Analizi')
     
     plt.tight_layout()
-    plt.savefig('visual_style_analysis.png')
+    plt.savefig(_output_path('visual_style_analysis.png', output_dir))
     plt.close()
 
-def create_interactive_timeline(film):
-    """Bokeh kullanarak interaktif bir zaman çizelgesi oluşturur"""
+def create_interactive_timeline(film, event_index=None, output_dir=None):
+    """Bokeh kullanarak interaktif bir zaman çizelgesi oluşturur.
+    
+    Olay adları yakınlaştırmaya göre ayrıntı düzeyiyle (bkz. olay_indeksi) etiketlenir:
+    görünen aralık daraldıkça daha az önemli olayların adları da çıkar.
+    """
     from bokeh.plotting import figure, output_file, save
-    from bokeh.models import ColumnDataSource, HoverTool, LabelSet
+    from bokeh.models import ColumnDataSource, CustomJS, HoverTool, LabelSet
+    from olay_indeksi import BASE_LEVEL
     
-    # Olayları zaman sırasına göre sırala
-    events = sorted(film.events, key=lambda x: x.time)
+    # Film olayları zaman sırasına göre tutar
+    events = film.events
+    if event_index is None:
+        event_index = film.event_index()
+    lod = event_index.lod_levels()
     
     # Veri kaynağı oluştur
     source = ColumnDataSource(data=dict(
@@ -712,7 +885,14 @@ def create_interactive_timeline(film):
         type=[e.type for e in events],
         chars=[", ".join([c.name for c in e.characters]) for e in events],
         loc=[e.location.name for e in events],
-        size=[e.importance * 5 for e in events]
+        size=[e.importance * 5 for e in events],
+        lod=lod.tolist()
+    ))
+    initial = sorted(i for i in range(len(events)) if lod[i] <= BASE_LEVEL)
+    labels_source = ColumnDataSource(data=dict(
+        x=[events[i].time for i in initial],
+        y=[events[i].importance for i in initial],
+        desc=[events[i].name for i in initial]
     ))
     
     # Figür oluştur
@@ -735,62 +915,119 @@ def create_interactive_timeline(film):
     
     p.add_tools(hover)
     
+    # Ayrıntı düzeyine göre etiketler: düzey görünen aralığın genişliğinden hesaplanır
+    # (bkz. olay_indeksi.level_for_span)
+    labels = LabelSet(x='x', y='y', text='desc', source=labels_source,
+                      x_offset=5, y_offset=5, text_font_size='8pt')
+    p.add_layout(labels)
+    callback = CustomJS(args=dict(source=source, labels=labels_source, x_range=p.x_range,
+                                  duration=film.duration, base=BASE_LEVEL), code="""
+        const span = x_range.end - x_range.start;
+        const level = base + (span > 0 && duration > span ? Math.ceil(Math.log2(duration / span)) : 0);
+        const data = source.data;
+        const out = {x: [], y: [], desc: []};
+        for (let i = 0; i < data.x.length; i++) {
+            if (data.lod[i] <= level && data.x[i] >= x_range.start && data.x[i] <= x_range.end) {
+                out.x.push(data.x[i]);
+                out.y.push(data.y[i]);
+                out.desc.push(data.desc[i]);
+            }
+        }
+        labels.data = out;
+    """)
+    p.x_range.js_on_change('start', callback)
+    p.x_range.js_on_change('end', callback)
+    
     # HTML dosyası olarak kaydet
-    output_file("interactive_timeline.html")
+    output_file(_output_path("interactive_timeline.html", output_dir))
     save(p)
     
     print("İnteraktif zaman çizelgesi 'interactive_timeline.html' dosyasına kaydedildi.")
 
-# Tüm analizleri çalıştır
-try:
-    print("Karakter ekran süresi analizi yapılıyor...")
-    character_screen_time = analyze_character_screen_time(film)
-    print(character_screen_time)
-    
-    print("\nLokasyon kullanımı analizi yapılıyor...")
-    location_usage = analyze_location_usage(film)
-    print(location_usage)
-    
-    print("\nKarakter ağı oluşturuluyor...")
-    character_network = create_character_network(film)
-    
-    print("\nZaman çizelgesi oluşturuluyor...")
-    create_timeline(film)
-    
-    print("\nKarakter-lokasyon ısı haritası oluşturuluyor...")
-    character_location_df = create_character_location_heatmap(film)
-    print(character_location_df)
-    
-    print("\nSahne akışı diyagramı oluşturuluyor...")
-    create_scene_flow(film)
+def _emotional_intensity(film):
+    """Duygusal yoğunluk eğrisi ara sonucu (1 saniyelik ızgara)"""
+    from duygu_yogunlugu import emotional_intensity as compute_emotional_intensity
+    return compute_emotional_intensity(film, step=1.0)
 
-    print("Duygusal yoğunluk grafiği oluşturuluyor...")
-    create_emotional_intensity_chart(film)
-    
-    print("Karakter etkileşim ısı haritası oluşturuluyor...")
-    create_character_interaction_heatmap(film)
-    
-    print("Karakter yörüngeleri grafiği oluşturuluyor...")
-    create_character_trajectories(film)
-    
-    print("Üç perde yapısı analizi oluşturuluyor...")
-    create_three_act_structure(film)
-    
-    print("Karakter gelişim grafiği oluşturuluyor...")
-    create_character_development_chart(film)
-    
-    print("Tema analizi grafiği oluşturuluyor...")
-    create_theme_analysis(film)
-    
-    print("Paralel hikaye çizgileri grafiği oluşturuluyor...")
-    create_parallel_storylines(film)
-    
-    print("Görsel stil analizi oluşturuluyor...")
-    create_visual_style_analysis(film)
-    
-    print("İnteraktif zaman çizelgesi oluşturuluyor...")
-    create_interactive_timeline(film)
-    
-    print("\nTüm analizler tamamlandı ve görselleştirmeler kaydedildi.")
-except Exception as e:
-    print(f"Hata oluştu: {e}")
\ No newline at end of file
+def _character_network(film, columns, incidence):
+    """İlişkiler ve birlikte görünmeden kurulan seyrek karakter ağı ara sonucu"""
+    from karakter_agi import CharacterNetwork
+    return CharacterNetwork(columns, incidence)
+
+# Analiz kaydı: her analiz kullandığı ara sonuçları girdi olarak bildirir; planlayıcı
+# ara sonuçları bir kez hesaplar ve yalnızca istenen analizleri çalıştırır
+ANALYSES = AnalysisRegistry()
+ANALYSES.intermediate("columns", lambda film: film.columns())
+ANALYSES.intermediate("incidence", lambda film, columns: film.incidence(), inputs=["columns"])
+ANALYSES.intermediate("intensity", _emotional_intensity)
+ANALYSES.intermediate("network", _character_network, inputs=["columns", "incidence"])
+ANALYSES.intermediate("raster", lambda film, columns: film.raster(), inputs=["columns"])
+ANALYSES.intermediate("prefix_sums", lambda film, columns: film.prefix_sums(), inputs=["columns"])
+ANALYSES.intermediate("event_index", lambda film, columns: film.event_index(), inputs=["columns"])
+
+ANALYSES.analysis("character_screen_time", analyze_character_screen_time, inputs=["columns"],
+                  artifacts=["character_screen_time.png"], label="Karakter ekran süresi analizi yapılıyor")
+ANALYSES.analysis("location_usage", analyze_location_usage, inputs=["columns"],
+                  artifacts=["location_usage.png"], label="Lokasyon kullanımı analizi yapılıyor")
+ANALYSES.analysis("character_network", create_character_network,
+                  artifacts=["character_network.png"], label="Karakter ağı oluşturuluyor")
+ANALYSES.analysis("character_network_metrics", analyze_character_network, inputs=["network"],
+                  artifacts=["character_network_metrics.csv"], label="Karakter ağı ölçüleri hesaplanıyor")
+ANALYSES.analysis("network_evolution", create_network_evolution_chart,
+                  artifacts=["network_evolution.png"], label="İlişki ağı değişim grafiği oluşturuluyor")
+ANALYSES.analysis("activity_timeline", create_activity_chart, inputs=["raster"],
+                  artifacts=["activity_timeline.png"], label="Saniyelik etkinlik grafiği oluşturuluyor")
+ANALYSES.analysis("timeline", create_timeline,
+                  artifacts=["event_timeline.png"], label="Zaman çizelgesi oluşturuluyor")
+ANALYSES.analysis("character_location_heatmap", create_character_location_heatmap, inputs=["incidence"],
+                  artifacts=["character_location_heatmap.png"], label="Karakter-lokasyon ısı haritası oluşturuluyor")
+ANALYSES.analysis("scene_flow", create_scene_flow,
+                  artifacts=["scene_flow.png"], label="Sahne akışı diyagramı oluşturuluyor")
+ANALYSES.analysis("emotional_intensity", create_emotional_intensity_chart, inputs=["intensity", "event_index"],
+                  artifacts=["emotional_intensity.png"], label="Duygusal yoğunluk grafiği oluşturuluyor")
+ANALYSES.analysis("character_interaction_heatmap", create_character_interaction_heatmap, inputs=["columns", "incidence"],
+                  artifacts=["character_interaction_heatmap.png"], label="Karakter etkileşim ısı haritası oluşturuluyor")
+ANALYSES.analysis("character_trajectories", create_character_trajectories, inputs=["columns", "incidence"],
+                  artifacts=["character_trajectories.png"], label="Karakter yörüngeleri grafiği oluşturuluyor")
+ANALYSES.analysis("three_act_structure", create_three_act_structure, inputs=["prefix_sums", "raster"],
+                  artifacts=["three_act_structure.png"], label="Üç perde yapısı analizi oluşturuluyor")
+ANALYSES.analysis("character_development", create_character_development_chart,
+                  artifacts=["character_development.png"], label="Karakter gelişim grafiği oluşturuluyor")
+ANALYSES.analysis("theme_analysis", create_theme_analysis,
+                  artifacts=["theme_analysis.png"], label="Tema analizi grafiği oluşturuluyor")
+ANALYSES.analysis("parallel_storylines", create_parallel_storylines,
+                  artifacts=["parallel_storylines.png"], label="Paralel hikaye çizgileri grafiği oluşturuluyor")
+ANALYSES.analysis("visual_style_analysis", create_visual_style_analysis,
+                  artifacts=["visual_style_analysis.png"], label="Görsel stil analizi oluşturuluyor")
+ANALYSES.analysis("interactive_timeline", create_interactive_timeline, inputs=["event_index"],
+                  artifacts=["interactive_timeline.html"], label="İnteraktif zaman çizelgesi oluşturuluyor")
+
+def main(argv=None):
+    """Komut satırı girişi: python film_analiz.py dosya_adi.json [--workers N] [--output-dir DİZİN]"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Film verilerini analiz eder ve görselleştirmeler oluşturur.")
+    parser.add_argument("film", help="Film JSON dosyası")
+    parser.add_argument("--workers", type=int, default=None, help="Paralel çizim süreç sayısı (varsayılan: işlemci sayısı)")
+    parser.add_argument("--output-dir", default=None, help="Grafiklerin yazılacağı dizin (varsayılan: çalışma dizini)")
+    parser.add_argument("--no-cache", action="store_true", help="Analiz önbelleğini kullanma")
+    args = parser.parse_args(argv)
+
+    # JSON dosyasından film verilerini yükle
+    film = Film.load_from_json(args.film)
+
+    # Tüm analizleri çalıştır; grafikler süreç havuzunda paralel çizilir, biri hata verse de
+    # diğerleri devam eder. Film değişmediyse sonuçlar ve dosyalar önbellekten alınır.
+    report = render_film(film, workers=args.workers, output_dir=args.output_dir,
+                         cache_dir=None if args.no_cache else DEFAULT_CACHE_DIR, progress=print)
+    for name in ("character_screen_time", "location_usage", "character_location_heatmap", "character_network_metrics"):
+        if name in report.results:
+            print(report.results[name])
+    print(report.format())
+    if report.ok:
+        print("\nTüm analizler tamamlandı ve görselleştirmeler kaydedildi.")
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
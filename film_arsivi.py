@@ -0,0 +1,431 @@
+import json
+import os
+import sqlite3
+from film_veri_yapisi import Film, Character, Location, Scene, Relationship, Event
+
+# Çok sayıda filmi tek bir SQLite veritabanında tutan arşiv.
+# Her film normalize tablolara yazılır; varlıklar (film_id, id) çiftiyle
+# tanımlanır, sahne/olay kadroları ayrı çoka-çok tablolardadır. Zaman, tür ve
+# önem sütunları indekslidir; böylece "dış mekândaki 5 dakikadan uzun
+# protagonist sahneleri" gibi sorgular dosyaları yüklemeden yanıtlanır.
+# Filmler arşiv kimliğiyle tanımlanır; aynı başlıklı farklı filmler (yeniden çevrimler,
+# farklı kaynak dosyalar) (kaynak dosya, başlık) çiftiyle ayrılır.
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS films (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL DEFAULT '',
+    title TEXT NOT NULL,
+    duration NUMERIC,
+    UNIQUE (source, title)
+);
+CREATE TABLE IF NOT EXISTS characters (
+    film_id INTEGER NOT NULL REFERENCES films(id) ON DELETE CASCADE,
+    id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    type TEXT,
+    importance NUMERIC,
+    traits TEXT,
+    PRIMARY KEY (film_id, id)
+);
+CREATE TABLE IF NOT EXISTS locations (
+    film_id INTEGER NOT NULL REFERENCES films(id) ON DELETE CASCADE,
+    id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    type TEXT,
+    PRIMARY KEY (film_id, id)
+);
+CREATE TABLE IF NOT EXISTS scenes (
+    film_id INTEGER NOT NULL REFERENCES films(id) ON DELETE CASCADE,
+    id INTEGER NOT NULL,
+    start_time NUMERIC,
+    end_time NUMERIC,
+    location_id INTEGER,
+    description TEXT,
+    PRIMARY KEY (film_id, id)
+);
+CREATE TABLE IF NOT EXISTS scene_cast (
+    film_id INTEGER NOT NULL REFERENCES films(id) ON DELETE CASCADE,
+    scene_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    character_id INTEGER NOT NULL,
+    PRIMARY KEY (film_id, scene_id, position)
+);
+CREATE TABLE IF NOT EXISTS relationships (
+    film_id INTEGER NOT NULL REFERENCES films(id) ON DELETE CASCADE,
+    id INTEGER NOT NULL,
+    character1_id INTEGER,
+    character2_id INTEGER,
+    type TEXT,
+    start_time NUMERIC,
+    end_time NUMERIC,
+    strength NUMERIC,
+    PRIMARY KEY (film_id, id)
+);
+CREATE TABLE IF NOT EXISTS events (
+    film_id INTEGER NOT NULL REFERENCES films(id) ON DELETE CASCADE,
+    id INTEGER NOT NULL,
+    name TEXT,
+    time NUMERIC,
+    location_id INTEGER,
+    importance NUMERIC,
+    type TEXT,
+    PRIMARY KEY (film_id, id)
+);
+CREATE TABLE IF NOT EXISTS event_cast (
+    film_id INTEGER NOT NULL REFERENCES films(id) ON DELETE CASCADE,
+    event_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    character_id INTEGER NOT NULL,
+    PRIMARY KEY (film_id, event_id, position)
+);
+
+CREATE INDEX IF NOT EXISTS idx_films_title ON films(title);
+CREATE INDEX IF NOT EXISTS idx_characters_type ON characters(type, importance);
+CREATE INDEX IF NOT EXISTS idx_characters_importance ON characters(importance);
+CREATE INDEX IF NOT EXISTS idx_locations_type ON locations(type);
+CREATE INDEX IF NOT EXISTS idx_scenes_time ON scenes(start_time, end_time);
+CREATE INDEX IF NOT EXISTS idx_scenes_duration ON scenes((end_time - start_time));
+CREATE INDEX IF NOT EXISTS idx_scenes_location ON scenes(film_id, location_id);
+CREATE INDEX IF NOT EXISTS idx_scene_cast_character ON scene_cast(film_id, character_id);
+CREATE INDEX IF NOT EXISTS idx_relationships_type ON relationships(type);
+CREATE INDEX IF NOT EXISTS idx_relationships_time ON relationships(start_time, end_time);
+CREATE INDEX IF NOT EXISTS idx_events_time ON events(time);
+CREATE INDEX IF NOT EXISTS idx_events_type ON events(type, importance);
+CREATE INDEX IF NOT EXISTS idx_events_importance ON events(importance);
+CREATE INDEX IF NOT EXISTS idx_event_cast_character ON event_cast(film_id, character_id);
+"""
+
+
+# Başlığı tekil olan eski films tablosu yeni şemaya taşınır. Tablo yeniden oluşturulurken
+# yabancı anahtarlar kapalıdır; böylece eski tablonun silinmesi film verisini silmez.
+_MIGRATE_FILMS = """
+PRAGMA foreign_keys = OFF;
+BEGIN;
+CREATE TABLE films_new (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL DEFAULT '',
+    title TEXT NOT NULL,
+    duration NUMERIC,
+    UNIQUE (source, title)
+);
+INSERT INTO films_new (id, title, duration) SELECT id, title, duration FROM films;
+DROP TABLE films;
+ALTER TABLE films_new RENAME TO films;
+COMMIT;
+PRAGMA foreign_keys = ON;
+"""
+
+
+def _source_key(film):
+    """Filmin arşivdeki kaynak anahtarı: kaynak dosyanın mutlak yolu (bellekteki filmler için boş)"""
+    return os.path.abspath(film.source) if film.source else ""
+
+
+def _cast_rows(film_id, items):
+    return [(film_id, item.id, position, character.id)
+            for item in items
+            for position, character in enumerate(item.characters)]
+
+
+class FilmCorpus:
+    def __init__(self, path):
+        """path'teki SQLite arşivini açar, yoksa tabloları oluşturur"""
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        columns = [row["name"] for row in self._conn.execute("PRAGMA table_info(films)")]
+        if columns and "source" not in columns:
+            self._conn.executescript(_MIGRATE_FILMS)
+        self._conn.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._conn.close()
+
+    def films(self):
+        """Arşivdeki filmleri (id, başlık, süre, kaynak) listesi olarak döndürür"""
+        return [tuple(row) for row in self._conn.execute("SELECT id, title, duration, source FROM films ORDER BY id")]
+
+    def film_id(self, title, source=None):
+        """Başlığı (ve kaynak dosyası) verilen filmin arşivdeki kimliğini döndürür, yoksa None.
+
+        Kaynak verilmezse ve aynı başlıklı birden çok film varsa ValueError verir.
+        """
+        if source is not None:
+            row = self._conn.execute("SELECT id FROM films WHERE source = ? AND title = ?",
+                                     (os.path.abspath(source) if source else "", title)).fetchone()
+            return None if row is None else row[0]
+        ids = [row[0] for row in self._conn.execute("SELECT id FROM films WHERE title = ? ORDER BY id", (title,))]
+        if len(ids) > 1:
+            raise ValueError(f"Arşivde '{title}' başlıklı birden çok film var (kimlikler: {ids}); "
+                             f"kimlik ya da kaynak dosya belirtin")
+        return ids[0] if ids else None
+
+    def save_film(self, film, replace=False):
+        """Filmi arşive yazar ve film kimliğini döndürür.
+
+        Film (kaynak dosya, başlık) çiftiyle tanımlanır. Aynı çiftle kayıtlı film varsa
+        replace=True ise aynı kimlikle yerine yazılır, değilse ValueError verilir.
+        """
+        source = _source_key(film)
+        with self._conn:
+            row = self._conn.execute("SELECT id FROM films WHERE source = ? AND title = ?",
+                                     (source, film.title)).fetchone()
+            if row is not None and not replace:
+                raise ValueError(f"Arşivde '{film.title}' filmi zaten kayıtlı (kimlik {row[0]}); "
+                                 f"yerine yazmak için replace=True verin")
+            if row is not None:
+                self._conn.execute("DELETE FROM films WHERE id = ?", (row[0],))
+            film_id = self._conn.execute(
+                "INSERT INTO films (id, source, title, duration) VALUES (?, ?, ?, ?)",
+                (None if row is None else row[0], source, film.title, film.duration)).lastrowid
+
+            self._conn.executemany(
+                "INSERT INTO characters VALUES (?, ?, ?, ?, ?, ?)",
+                [(film_id, c.id, c.name, c.type, c.importance, json.dumps(c.traits, ensure_ascii=False))
+                 for c in film.characters])
+            self._conn.executemany(
+                "INSERT INTO locations VALUES (?, ?, ?, ?)",
+                [(film_id, l.id, l.name, l.type) for l in film.locations])
+            self._conn.executemany(
+                "INSERT INTO scenes VALUES (?, ?, ?, ?, ?, ?)",
+                [(film_id, s.id, s.start_time, s.end_time, s.location.id, s.description) for s in film.scenes])
+            self._conn.executemany("INSERT INTO scene_cast VALUES (?, ?, ?, ?)", _cast_rows(film_id, film.scenes))
+            self._conn.executemany(
+                "INSERT INTO relationships VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(film_id, r.id, r.character1.id, r.character2.id, r.type, r.start_time, r.end_time, r.strength)
+                 for r in film.relationships])
+            self._conn.executemany(
+                "INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(film_id, e.id, e.name, e.time, e.location.id, e.importance, e.type) for e in film.events])
+            self._conn.executemany("INSERT INTO event_cast VALUES (?, ?, ?, ?)", _cast_rows(film_id, film.events))
+        return film_id
+
+    def delete_film(self, film_id):
+        with self._conn:
+            self._conn.execute("DELETE FROM films WHERE id = ?", (film_id,))
+
+    def load_film(self, film, film_class=Film):
+        """Başlığı veya kimliği verilen filmi arşivden yükler"""
+        film_id = film if isinstance(film, int) else self.film_id(film)
+        row = self._conn.execute("SELECT title, duration FROM films WHERE id = ?", (film_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"Arşivde film bulunamadı: {film}")
+
+        result = film_class(row["title"], row["duration"])
+        characters, locations = self._entities(film_id)
+        for character in characters.values():
+            result.add_entity(character)
+        for location in locations.values():
+            result.add_entity(location)
+
+        scene_cast = self._cast("scene_cast", "scene_id", film_id, characters)
+        for r in self._conn.execute("SELECT * FROM scenes WHERE film_id = ? ORDER BY id", (film_id,)):
+            result.add_entity(self._scene(r, characters, locations, scene_cast))
+
+        for r in self._conn.execute("SELECT * FROM relationships WHERE film_id = ? ORDER BY id", (film_id,)):
+            result.add_entity(self._relationship(r, characters))
+
+        event_cast = self._cast("event_cast", "event_id", film_id, characters)
+        for r in self._conn.execute("SELECT * FROM events WHERE film_id = ? ORDER BY id", (film_id,)):
+            result.add_entity(self._event(r, characters, locations, event_cast))
+
+        return result
+
+    # --- Sorgular ---
+
+    def query_scenes(self, character_type=None, location_type=None, min_duration=None, max_duration=None,
+                     start=None, end=None, films=None, as_frame=False):
+        """Koşullara uyan sahneleri döndürür.
+
+        Filtreler: sahnede character_type türünde bir karakter bulunması, lokasyon
+        türü, süre aralığı, [start, end) penceresiyle kesişme ve film başlıkları.
+        as_frame=False ise (film başlığı, Scene) çiftleri, True ise DataFrame döner.
+        """
+        where, params = [], []
+        if character_type is not None:
+            where.append("EXISTS (SELECT 1 FROM scene_cast sc JOIN characters c"
+                         " ON c.film_id = sc.film_id AND c.id = sc.character_id"
+                         " WHERE sc.film_id = s.film_id AND sc.scene_id = s.id AND c.type = ?)")
+            params.append(character_type)
+        if location_type is not None:
+            where.append("l.type = ?")
+            params.append(location_type)
+        if min_duration is not None:
+            where.append("(s.end_time - s.start_time) >= ?")
+            params.append(min_duration)
+        if max_duration is not None:
+            where.append("(s.end_time - s.start_time) <= ?")
+            params.append(max_duration)
+        if start is not None:
+            where.append("s.end_time > ?")
+            params.append(start)
+        if end is not None:
+            where.append("s.start_time < ?")
+            params.append(end)
+        self._film_filter(where, params, films)
+
+        sql = ("SELECT f.title AS film, s.*, l.name AS location_name, l.type AS location_type,"
+               " s.end_time - s.start_time AS duration"
+               " FROM scenes s JOIN films f ON f.id = s.film_id"
+               " JOIN locations l ON l.film_id = s.film_id AND l.id = s.location_id")
+        return self._run(sql, where, params, "s.film_id, s.start_time", "scene", as_frame)
+
+    def query_events(self, event_type=None, min_importance=None, character_type=None, location_type=None,
+                     start=None, end=None, films=None, as_frame=False):
+        """Koşullara uyan olayları döndürür; filtreler ve dönüş biçimi query_scenes ile aynıdır"""
+        where, params = [], []
+        if event_type is not None:
+            where.append("e.type = ?")
+            params.append(event_type)
+        if min_importance is not None:
+            where.append("e.importance >= ?")
+            params.append(min_importance)
+        if character_type is not None:
+            where.append("EXISTS (SELECT 1 FROM event_cast ec JOIN characters c"
+                         " ON c.film_id = ec.film_id AND c.id = ec.character_id"
+                         " WHERE ec.film_id = e.film_id AND ec.event_id = e.id AND c.type = ?)")
+            params.append(character_type)
+        if location_type is not None:
+            where.append("l.type = ?")
+            params.append(location_type)
+        if start is not None:
+            where.append("e.time >= ?")
+            params.append(start)
+        if end is not None:
+            where.append("e.time < ?")
+            params.append(end)
+        self._film_filter(where, params, films)
+
+        sql = ("SELECT f.title AS film, e.*, l.name AS location_name, l.type AS location_type"
+               " FROM events e JOIN films f ON f.id = e.film_id"
+               " JOIN locations l ON l.film_id = e.film_id AND l.id = e.location_id")
+        return self._run(sql, where, params, "e.film_id, e.time", "event", as_frame)
+
+    def query_characters(self, character_type=None, min_importance=None, films=None, as_frame=False):
+        """Koşullara uyan karakterleri döndürür"""
+        where, params = [], []
+        if character_type is not None:
+            where.append("c.type = ?")
+            params.append(character_type)
+        if min_importance is not None:
+            where.append("c.importance >= ?")
+            params.append(min_importance)
+        self._film_filter(where, params, films)
+
+        sql = "SELECT f.title AS film, c.* FROM characters c JOIN films f ON f.id = c.film_id"
+        return self._run(sql, where, params, "c.film_id, c.importance DESC", "character", as_frame)
+
+    def sql(self, query, params=()):
+        """Serbest SQL sorgusunu çalıştırıp sonucu DataFrame olarak döndürür"""
+        import pandas as pd
+        return pd.read_sql_query(query, self._conn, params=params)
+
+    # --- Yardımcılar ---
+
+    @staticmethod
+    def _film_filter(where, params, films):
+        if films is not None:
+            titles = [films] if isinstance(films, str) else list(films)
+            where.append(f"f.title IN ({', '.join('?' * len(titles))})")
+            params.extend(titles)
+
+    def _run(self, sql, where, params, order, kind, as_frame):
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY " + order
+
+        if as_frame:
+            import pandas as pd
+            frame = pd.read_sql_query(sql, self._conn, params=params)
+            return frame.drop(columns=["film_id"])
+
+        rows = self._conn.execute(sql, params).fetchall()
+        return self._objects(rows, kind)
+
+    def _objects(self, rows, kind):
+        """Sorgu satırlarını, film başına bir kez okunan karakter/lokasyonlarla nesnelere çevirir"""
+        result = []
+        entities = {}
+        casts = {}
+        for r in rows:
+            film_id = r["film_id"]
+            if film_id not in entities:
+                entities[film_id] = self._entities(film_id)
+            characters, locations = entities[film_id]
+
+            if kind == "character":
+                obj = characters[r["id"]]
+            elif kind == "scene":
+                if ("scene", film_id) not in casts:
+                    casts["scene", film_id] = self._cast("scene_cast", "scene_id", film_id, characters)
+                obj = self._scene(r, characters, locations, casts["scene", film_id])
+            else:
+                if ("event", film_id) not in casts:
+                    casts["event", film_id] = self._cast("event_cast", "event_id", film_id, characters)
+                obj = self._event(r, characters, locations, casts["event", film_id])
+            result.append((r["film"], obj))
+        return result
+
+    def _entities(self, film_id):
+        characters = {}
+        for r in self._conn.execute("SELECT * FROM characters WHERE film_id = ? ORDER BY id", (film_id,)):
+            character = Character(r["name"], r["type"])
+            character.id = r["id"]
+            character.importance = r["importance"]
+            character.traits = json.loads(r["traits"])
+            characters[character.id] = character
+
+        locations = {}
+        for r in self._conn.execute("SELECT * FROM locations WHERE film_id = ? ORDER BY id", (film_id,)):
+            location = Location(r["name"], r["type"])
+            location.id = r["id"]
+            locations[location.id] = location
+        return characters, locations
+
+    def _cast(self, table, key, film_id, characters):
+        cast = {}
+        for owner, character_id in self._conn.execute(
+                f"SELECT {key}, character_id FROM {table} WHERE film_id = ? ORDER BY {key}, position", (film_id,)):
+            cast.setdefault(owner, []).append(characters[character_id])
+        return cast
+
+    @staticmethod
+    def _scene(r, characters, locations, cast):
+        scene = Scene(r["start_time"], r["end_time"], locations[r["location_id"]],
+                      cast.get(r["id"], []), r["description"])
+        scene.id = r["id"]
+        return scene
+
+    @staticmethod
+    def _relationship(r, characters):
+        relationship = Relationship(characters[r["character1_id"]], characters[r["character2_id"]],
+                                    r["type"], r["start_time"], r["end_time"], r["strength"])
+        relationship.id = r["id"]
+        return relationship
+
+    @staticmethod
+    def _event(r, characters, locations, cast):
+        event = Event(r["name"], r["time"], locations[r["location_id"]],
+                      cast.get(r["id"], []), r["importance"], r["type"])
+        event.id = r["id"]
+        return event
+
+
+def save_to_store(film, path, replace=False):
+    """Filmi path'teki arşive yazar ve arşivdeki kimliğini döndürür (bkz. FilmCorpus.save_film)"""
+    with FilmCorpus(path) as corpus:
+        return corpus.save_film(film, replace)
+
+
+def load_from_store(path, film, film_class=Film):
+    """Başlığı veya kimliği verilen filmi path'teki arşivden yükler"""
+    with FilmCorpus(path) as corpus:
+        return corpus.load_film(film, film_class)
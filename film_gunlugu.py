@@ -0,0 +1,207 @@
+import json
+import os
+import threading
+from film_veri_yapisi import Film, Character, Location, Scene, Relationship, Event
+
+# Yalnızca eklenen düzenleme günlüğü (journal).
+#
+# Anlık görüntü (snapshot) normal film JSON dosyasıdır; yanında "<dosya>.journal"
+# adında JSON satırlarından oluşan bir günlük tutulur. Filmdeki her ekleme,
+# güncelleme ve silme günlüğe tek satır olarak eklenir:
+#
+#   {"seq": 12, "op": "update", "kind": "scene", "id": 3, "data": {...}}
+#
+# Yükleme sırasında (FilmJournal.open ve Film.load_from_json) günlük, anlık
+# görüntünün üzerine yeniden oynatılır. Günlük
+# eşik değerini aşınca arka planda yeni bir anlık görüntü yazılır (sıkıştırma).
+# Anlık görüntü "journal_seq" alanında içerdiği son kaydın numarasını saklar;
+# bu numaradan küçük kayıtlar yeniden oynatılmaz, böylece sıkıştırmanın herhangi
+# bir adımında kesilen bir çalışma tutarlı biçimde geri yüklenir.
+
+DEFAULT_COMPACT_THRESHOLD = 500
+
+
+def _journal_path(snapshot_path):
+    return snapshot_path + ".journal"
+
+
+def _compacting_path(snapshot_path):
+    return snapshot_path + ".journal.compacting"
+
+
+def _write_snapshot(data, snapshot_path):
+    """Anlık görüntüyü geçici dosyaya yazıp atomik olarak yerine koyar"""
+    tmp_path = snapshot_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, snapshot_path)
+
+
+def _read_records(path):
+    if not os.path.exists(path):
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                # Yazılırken kesilmiş son satır; sonrasında kayıt olamaz
+                return
+
+
+def has_journal(snapshot_path):
+    """Anlık görüntünün yanında (yarım kalmış sıkıştırma dahil) günlük dosyası var mı"""
+    return any(os.path.exists(path) for path in (_compacting_path(snapshot_path), _journal_path(snapshot_path)))
+
+
+def replay_journal(film, snapshot_path, seq=0):
+    """journal_seq = seq olan anlık görüntüden yüklenmiş filme sonraki günlük kayıtlarını uygular.
+
+    (son kayıt numarası, uygulanan kayıt sayısı) döndürür.
+    """
+    applied = 0
+    for path in (_compacting_path(snapshot_path), _journal_path(snapshot_path)):
+        for record in _read_records(path):
+            if record["seq"] <= seq:
+                continue
+            _apply_record(film, record)
+            seq = record["seq"]
+            applied += 1
+    return seq, applied
+
+
+def _apply_record(film, record):
+    """Tek bir günlük kaydını filme uygular"""
+    op, kind = record["op"], record["kind"]
+    character_map = film.character_map
+    location_map = film.location_map
+
+    if op == "remove":
+        film.remove_entity(film.get_entity(kind, record["id"]))
+        return
+
+    data = record["data"]
+    if kind == "character":
+        new = Character.from_dict(data)
+    elif kind == "location":
+        new = Location.from_dict(data)
+    elif kind == "scene":
+        new = Scene.from_dict(data, character_map, location_map)
+    elif kind == "relationship":
+        new = Relationship.from_dict(data, character_map)
+    else:
+        new = Event.from_dict(data, character_map, location_map)
+
+    if op == "add":
+        film.add_entity(new)
+    else:
+        changes = {field: getattr(new, field) for field in type(new).__slots__ if field != "id"}
+        film.update_entity(film.get_entity(kind, record["id"]), **changes)
+
+
+class FilmJournal:
+    def __init__(self, film, snapshot_path, seq=0, pending=0,
+                 compact_threshold=DEFAULT_COMPACT_THRESHOLD, durable=False):
+        """film'deki değişiklikleri snapshot_path yanındaki günlüğe yazar"""
+        self.film = film
+        self.film.source = snapshot_path
+        self.snapshot_path = snapshot_path
+        self.journal_path = _journal_path(snapshot_path)
+        self.compact_threshold = compact_threshold
+        self.durable = durable
+        self._seq = seq
+        self._pending = pending  # Son anlık görüntüden bu yana yazılan kayıt sayısı
+        self._lock = threading.Lock()
+        self._compaction = None
+        self._file = open(self.journal_path, 'a', encoding='utf-8')
+        film.add_listener(self._on_change)
+
+    @classmethod
+    def create(cls, film, snapshot_path, **kwargs):
+        """Filmin ilk anlık görüntüsünü yazar ve boş bir günlük başlatır"""
+        data = film.to_dict()
+        data["journal_seq"] = 0
+        _write_snapshot(data, snapshot_path)
+        for path in (_journal_path(snapshot_path), _compacting_path(snapshot_path)):
+            if os.path.exists(path):
+                os.remove(path)
+        return cls(film, snapshot_path, **kwargs)
+
+    @classmethod
+    def open(cls, snapshot_path, film_class=Film, **kwargs):
+        """Anlık görüntüyü yükler, günlüğü üzerine oynatır ve günlüğü açık döndürür"""
+        with open(snapshot_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        film = film_class.from_dict(data)
+        seq, pending = replay_journal(film, snapshot_path, data.get("journal_seq", 0))
+        return cls(film, snapshot_path, seq=seq, pending=pending, **kwargs)
+
+    def _on_change(self, op, kind, obj):
+        record = {"seq": self._seq + 1, "op": op, "kind": kind, "id": obj.id}
+        if op != "remove":
+            record["data"] = obj.to_dict()
+
+        with self._lock:
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._file.flush()
+            if self.durable:
+                os.fsync(self._file.fileno())
+            self._seq += 1
+            self._pending += 1
+
+        if self._pending >= self.compact_threshold:
+            self.compact()
+
+    def flush(self):
+        with self._lock:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def compact(self, wait=False):
+        """Günlüğü yeni bir anlık görüntüde birleştirir; varsayılan olarak arka planda çalışır"""
+        if self._compaction is not None and self._compaction.is_alive():
+            if not wait:
+                return
+            # Beklenen sıkıştırma, çalışan sıkıştırmadan sonra yazılan kayıtları da içermeli
+            self._compaction.join()
+
+        # Tutarlı bir kopya almak için sözlük ana iş parçacığında oluşturulur;
+        # yalnızca diske yazma işi arka plana bırakılır
+        data = self.film.to_dict()
+        with self._lock:
+            data["journal_seq"] = self._seq
+            self._file.close()
+            compacting = _compacting_path(self.snapshot_path)
+            if os.path.exists(compacting):
+                # Önceki yarım kalmış sıkıştırmanın kayıtları, yeni görüntü yazılana
+                # kadar silinemez; mevcut günlük onların arkasına eklenir
+                with open(self.journal_path, 'r', encoding='utf-8') as src, \
+                        open(compacting, 'a', encoding='utf-8') as dst:
+                    dst.write(src.read())
+                os.remove(self.journal_path)
+            else:
+                os.replace(self.journal_path, compacting)
+            self._file = open(self.journal_path, 'a', encoding='utf-8')
+            self._pending = 0
+
+        def run():
+            _write_snapshot(data, self.snapshot_path)
+            os.remove(compacting)
+
+        self._compaction = threading.Thread(target=run, name="film-journal-compaction")
+        self._compaction.start()
+        if wait:
+            self._compaction.join()
+
+    def close(self):
+        """Dinlemeyi bırakır, bekleyen sıkıştırmayı bitirir ve günlüğü kapatır"""
+        self.film.remove_listener(self._on_change)
+        if self._compaction is not None:
+            self._compaction.join()
+        with self._lock:
+            self._file.close()
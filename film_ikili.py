@@ -0,0 +1,356 @@
+import json
+import mmap
+import struct
+import numpy as np
+from film_veri_yapisi import Film, Character, Location, Scene, Relationship, Event
+from film_sutunlari import FilmColumns
+
+# Sıkıştırılmış ikili film biçimi.
+#
+# Dosya düzeni:
+#   b"FMAP" | sürüm (uint32) | başlık uzunluğu (uint64) | JSON başlık | 8 bayta hizalı veri
+#
+# Başlık; başlık, süre ve her sütunun veri bölgesine göre ofsetini, dtype'ını ve
+# eleman sayısını içerir. Tüm isim, tür ve açıklamalar tek bir string tablosunda
+# (strings_offsets + strings_data) tutulur; sütunlar bu tabloya uint32 kimlikle
+# başvurur. Oyuncu kadroları ve karakter özellikleri ofset indeksli (CSR) listelerdir.
+# Okuma mmap üzerinden yapılır; sütunlar kopyalanmadan NumPy görünümü olarak döner,
+# böylece yalnızca erişilen sütunların sayfaları belleğe alınır.
+#
+# Sürüm 2, her nesnenin kararlı kimliği için *_id sütunlarını ekler; sürüm 1
+# dosyalarında kimlikler yükleme sırasında yeniden atanır.
+
+MAGIC = b"FMAP"
+FORMAT_VERSION = 2
+_READABLE_VERSIONS = (1, 2)
+_PREAMBLE = struct.Struct("<4sIQ")
+# Sürüm 1 dosyalarında kimlik sütunlarının uzunluğunu veren sütunlar
+_ID_COUNT_COLUMNS = {
+    "character": "character_name",
+    "location": "location_name",
+    "scene": "scene_start",
+    "relationship": "relationship_start",
+    "event": "event_time",
+}
+_ALIGN = 8
+
+
+def _numeric_column(values):
+    """Tüm değerler tamsayıysa int64, değilse float64 sütun oluşturur"""
+    if all(isinstance(v, int) and not isinstance(v, bool) for v in values):
+        return np.array(values, dtype="<i8")
+    return np.array(values, dtype="<f8")
+
+
+def _id_column(items):
+    return np.array([item.id if item.id is not None else -1 for item in items], dtype="<i8")
+
+
+def _python_value(value):
+    """NumPy skalerini JSON'a yazılabilir Python değerine çevirir"""
+    return value.item()
+
+
+class _StringTable:
+    def __init__(self):
+        self._ids = {}
+        self._strings = []
+
+    def id(self, text):
+        string_id = self._ids.get(text)
+        if string_id is None:
+            string_id = self._ids[text] = len(self._strings)
+            self._strings.append(text)
+        return string_id
+
+    def ids(self, texts):
+        return np.array([self.id(t) for t in texts], dtype="<u4")
+
+    def arrays(self):
+        encoded = [s.encode("utf-8") for s in self._strings]
+        offsets = np.zeros(len(encoded) + 1, dtype="<u8")
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        return offsets, np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+
+def _csr(lists):
+    indptr = np.zeros(len(lists) + 1, dtype="<i8")
+    np.cumsum([len(l) for l in lists], out=indptr[1:])
+    flat = [x for l in lists for x in l]
+    return indptr, flat
+
+
+def save_to_binary(film, filename):
+    """Filmi ikili biçimde kaydeder"""
+    strings = _StringTable()
+    character_codes = {id(c): i for i, c in enumerate(film.characters)}
+    location_codes = {id(l): i for i, l in enumerate(film.locations)}
+
+    traits_indptr, traits = _csr([c.traits for c in film.characters])
+    scene_cast_indptr, scene_cast = _csr(
+        [[character_codes[id(c)] for c in s.characters] for s in film.scenes])
+    event_cast_indptr, event_cast = _csr(
+        [[character_codes[id(c)] for c in e.characters] for e in film.events])
+
+    relationships = film.relationships
+    columns = {
+        "character_id": _id_column(film.characters),
+        "location_id": _id_column(film.locations),
+        "scene_id": _id_column(film.scenes),
+        "relationship_id": _id_column(relationships),
+        "event_id": _id_column(film.events),
+
+        "character_name": strings.ids(c.name for c in film.characters),
+        "character_type": strings.ids(c.type for c in film.characters),
+        "character_importance": _numeric_column([c.importance for c in film.characters]),
+        "character_traits_indptr": traits_indptr,
+        "character_traits": strings.ids(traits),
+
+        "location_name": strings.ids(l.name for l in film.locations),
+        "location_type": strings.ids(l.type for l in film.locations),
+
+        "scene_start": _numeric_column([s.start_time for s in film.scenes]),
+        "scene_end": _numeric_column([s.end_time for s in film.scenes]),
+        "scene_location": np.array([location_codes[id(s.location)] for s in film.scenes], dtype="<i4"),
+        "scene_description": strings.ids(s.description for s in film.scenes),
+        "scene_cast_indptr": scene_cast_indptr,
+        "scene_cast": np.array(scene_cast, dtype="<i4"),
+
+        "relationship_char1": np.array([character_codes[id(r.character1)] for r in relationships], dtype="<i4"),
+        "relationship_char2": np.array([character_codes[id(r.character2)] for r in relationships], dtype="<i4"),
+        "relationship_type": strings.ids(r.type for r in relationships),
+        "relationship_start": _numeric_column([r.start_time for r in relationships]),
+        "relationship_has_end": np.array([r.end_time is not None for r in relationships], dtype=np.uint8),
+        "relationship_end": _numeric_column([r.end_time if r.end_time is not None else 0 for r in relationships]),
+        "relationship_strength": _numeric_column([r.strength for r in relationships]),
+
+        "event_name": strings.ids(e.name for e in film.events),
+        "event_time": _numeric_column([e.time for e in film.events]),
+        "event_importance": _numeric_column([e.importance for e in film.events]),
+        "event_location": np.array([location_codes[id(e.location)] for e in film.events], dtype="<i4"),
+        "event_type": strings.ids(e.type for e in film.events),
+        "event_cast_indptr": event_cast_indptr,
+        "event_cast": np.array(event_cast, dtype="<i4"),
+    }
+    columns["strings_offsets"], columns["strings_data"] = strings.arrays()
+
+    # Sütun ofsetlerini hesapla (veri bölgesinin başına göre, 8 bayta hizalı)
+    layout = {}
+    offset = 0
+    for name, array in columns.items():
+        layout[name] = {"dtype": array.dtype.str, "offset": offset, "count": len(array)}
+        offset += -(-array.nbytes // _ALIGN) * _ALIGN
+
+    header = json.dumps({
+        "title": film.title,
+        "duration": film.duration,
+        "columns": layout,
+    }, ensure_ascii=False).encode("utf-8")
+    header += b" " * (-(_PREAMBLE.size + len(header)) % _ALIGN)
+
+    with open(filename, "wb") as f:
+        f.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header)))
+        f.write(header)
+        for name, array in columns.items():
+            f.write(array.tobytes())
+            f.write(b"\0" * (-array.nbytes % _ALIGN))
+
+
+class FilmBinary:
+    def __init__(self, filename):
+        """İkili film dosyasını mmap ile açar; sütunlar ilk erişimde sayfalanır"""
+        self._file = open(filename, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, header_len = _PREAMBLE.unpack_from(self._mmap, 0)
+            if magic != MAGIC:
+                raise ValueError(f"'{filename}' bir FilmMapper ikili dosyası değil")
+            if version not in _READABLE_VERSIONS:
+                raise ValueError(f"Desteklenmeyen ikili biçim sürümü: {version}")
+            header = json.loads(self._mmap[_PREAMBLE.size:_PREAMBLE.size + header_len].decode("utf-8"))
+        except Exception:
+            self.close()
+            raise
+
+        self.version = version
+        self.title = header["title"]
+        self.duration = header["duration"]
+        self._layout = header["columns"]
+        self._data_start = _PREAMBLE.size + header_len
+        self._string_offsets = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        mm = getattr(self, "_mmap", None)
+        if mm is not None:
+            try:
+                mm.close()
+            except BufferError:
+                # Dışarıda hâlâ sütun görünümleri var; eşleme onlarla birlikte serbest kalır
+                pass
+        self._file.close()
+
+    def column(self, name):
+        """Bir sütunu kopyalamadan (mmap görünümü olarak) döndürür"""
+        spec = self._layout[name]
+        return np.frombuffer(self._mmap, dtype=np.dtype(spec["dtype"]), count=spec["count"],
+                             offset=self._data_start + spec["offset"])
+
+    def ids(self, kind):
+        """Bir türün kimlik sütununu döndürür; sürüm 1 dosyalarında None"""
+        name = f"{kind}_id"
+        return self.column(name) if name in self._layout else None
+
+    def string(self, string_id):
+        if self._string_offsets is None:
+            self._string_offsets = self.column("strings_offsets")
+        base = self._data_start + self._layout["strings_data"]["offset"]
+        start = base + int(self._string_offsets[string_id])
+        end = base + int(self._string_offsets[string_id + 1])
+        return self._mmap[start:end].decode("utf-8")
+
+    def strings(self, string_ids):
+        return [self.string(i) for i in string_ids]
+
+    def _string_codes(self, name):
+        """String kimliği sütununu (tablo, kod) çiftine dönüştürür"""
+        unique, codes = np.unique(self.column(name), return_inverse=True)
+        return self.strings(unique), codes.astype(np.int32)
+
+    def columns(self):
+        """Analizlerin doğrudan okuyabileceği FilmColumns nesnesini oluşturur"""
+        columns = FilmColumns()
+        for kind, count_column in _ID_COUNT_COLUMNS.items():
+            ids = self.ids(kind)
+            if ids is None:
+                # Sürüm 1: kimlik yok, FilmColumns kuralı gereği -1
+                ids = np.full(self._layout[count_column]["count"], -1, dtype=np.int64)
+            setattr(columns, f"{kind}_ids", ids)
+
+        columns.character_names = self.strings(self.column("character_name"))
+        columns.character_types, columns.character_type_codes = self._string_codes("character_type")
+        columns.character_importance = self.column("character_importance").astype(np.float64)
+
+        columns.location_names = self.strings(self.column("location_name"))
+        columns.location_types, columns.location_type_codes = self._string_codes("location_type")
+
+        columns.scene_start = self.column("scene_start").astype(np.float64)
+        columns.scene_end = self.column("scene_end").astype(np.float64)
+        columns.scene_location = self.column("scene_location")
+        columns.scene_cast_indptr = self.column("scene_cast_indptr")
+        columns.scene_cast_indices = self.column("scene_cast")
+
+        columns.relationship_char1 = self.column("relationship_char1")
+        columns.relationship_char2 = self.column("relationship_char2")
+        columns.relationship_types, columns.relationship_type_codes = self._string_codes("relationship_type")
+        columns.relationship_start = self.column("relationship_start").astype(np.float64)
+        columns.relationship_end = np.where(self.column("relationship_has_end").astype(bool),
+                                            self.column("relationship_end"), np.nan)
+        columns.relationship_strength = self.column("relationship_strength").astype(np.float64)
+
+        columns.event_time = self.column("event_time").astype(np.float64)
+        columns.event_importance = self.column("event_importance").astype(np.float64)
+        columns.event_location = self.column("event_location")
+        columns.event_types, columns.event_type_codes = self._string_codes("event_type")
+        columns.event_cast_indptr = self.column("event_cast_indptr")
+        columns.event_cast_indices = self.column("event_cast")
+        return columns
+
+    def to_film(self, film_class=Film):
+        """Tüm nesne grafiğini oluşturur"""
+        film = film_class(self.title, self.duration)
+        ids = {kind: self.ids(kind) for kind in _ID_COUNT_COLUMNS}
+
+        def add(kind, obj, i):
+            if ids[kind] is not None:
+                obj.id = _python_value(ids[kind][i])
+            film.add_entity(obj)
+
+        names = self.strings(self.column("character_name"))
+        types = self.strings(self.column("character_type"))
+        importance = self.column("character_importance")
+        traits_indptr = self.column("character_traits_indptr")
+        traits = self.strings(self.column("character_traits"))
+        for i, name in enumerate(names):
+            character = Character(name, types[i])
+            character.importance = _python_value(importance[i])
+            character.traits = traits[traits_indptr[i]:traits_indptr[i + 1]]
+            add("character", character, i)
+
+        for i, (name, location_type) in enumerate(zip(self.strings(self.column("location_name")),
+                                                      self.strings(self.column("location_type")))):
+            add("location", Location(name, location_type), i)
+
+        characters = film.characters
+        locations = film.locations
+
+        cast_indptr = self.column("scene_cast_indptr")
+        cast = self.column("scene_cast")
+        starts = self.column("scene_start")
+        ends = self.column("scene_end")
+        scene_locations = self.column("scene_location")
+        descriptions = self.strings(self.column("scene_description"))
+        for i, description in enumerate(descriptions):
+            add("scene", Scene(
+                _python_value(starts[i]),
+                _python_value(ends[i]),
+                locations[scene_locations[i]],
+                [characters[c] for c in cast[cast_indptr[i]:cast_indptr[i + 1]]],
+                description
+            ), i)
+
+        char1 = self.column("relationship_char1")
+        char2 = self.column("relationship_char2")
+        rel_types = self.strings(self.column("relationship_type"))
+        rel_starts = self.column("relationship_start")
+        has_end = self.column("relationship_has_end")
+        rel_ends = self.column("relationship_end")
+        strengths = self.column("relationship_strength")
+        for i, rel_type in enumerate(rel_types):
+            add("relationship", Relationship(
+                characters[char1[i]],
+                characters[char2[i]],
+                rel_type,
+                _python_value(rel_starts[i]),
+                _python_value(rel_ends[i]) if has_end[i] else None,
+                _python_value(strengths[i])
+            ), i)
+
+        cast_indptr = self.column("event_cast_indptr")
+        cast = self.column("event_cast")
+        times = self.column("event_time")
+        event_importance = self.column("event_importance")
+        event_locations = self.column("event_location")
+        event_types = self.strings(self.column("event_type"))
+        for i, name in enumerate(self.strings(self.column("event_name"))):
+            add("event", Event(
+                name,
+                _python_value(times[i]),
+                locations[event_locations[i]],
+                [characters[c] for c in cast[cast_indptr[i]:cast_indptr[i + 1]]],
+                _python_value(event_importance[i]),
+                event_types[i]
+            ), i)
+
+        return film
+
+
+def load_from_binary(filename, film_class=Film):
+    """İkili dosyadan Film nesnesi yükler"""
+    with FilmBinary(filename) as binary:
+        return binary.to_film(film_class)
+
+
+def json_to_binary(json_filename, binary_filename):
+    """Mevcut *_data.json dosyasını ikili biçime dönüştürür"""
+    save_to_binary(Film.load_from_json(json_filename, stream=True), binary_filename)
+
+
+def binary_to_json(binary_filename, json_filename):
+    """İkili film dosyasını JSON biçimine geri dönüştürür"""
+    load_from_binary(binary_filename).save_to_json(json_filename)
@@ -0,0 +1,68 @@
+import numpy as np
+
+# Sahne × karakter ve sahne × lokasyon seyrek geliş (incidence) matrisleri.
+# A[s, c] = 1 ise c karakteri s sahnesindedir, L[s, l] = 1 ise s sahnesi l
+# lokasyonundadır; D sahne sürelerinin köşegen matrisi, d ise süre vektörüdür.
+# Birliktelik analizleri bu matrislerin çarpımlarıdır:
+#   karakter ekran süresi  = Aᵀ·d
+#   lokasyon kullanımı     = Lᵀ·d
+#   karakter × lokasyon    = Aᵀ·D·L
+#   karakter × karakter    = Aᵀ·D·A  (köşegen = ekran süresi)
+# Satır ve sütun sıraları FilmColumns ile aynıdır (film.characters / film.locations).
+
+
+class FilmIncidence:
+    def __init__(self, columns):
+        """FilmColumns'tan seyrek geliş matrislerini oluşturur"""
+        from scipy import sparse
+
+        n_scenes = columns.n_scenes
+        self.character_names = columns.character_names
+        self.location_names = columns.location_names
+        self.durations = columns.scene_duration
+
+        # Kadrolar zaten CSR biçiminde; aynı karakter bir sahnede iki kez yazılmışsa tek sayılır
+        A = sparse.csr_matrix(
+            (np.ones(len(columns.scene_cast_indices)), columns.scene_cast_indices, columns.scene_cast_indptr),
+            shape=(n_scenes, columns.n_characters))
+        A.sum_duplicates()
+        A.data[:] = 1.0
+        self.scene_character = A
+
+        self.scene_location = sparse.csr_matrix(
+            (np.ones(n_scenes), columns.scene_location, np.arange(n_scenes + 1)),
+            shape=(n_scenes, columns.n_locations))
+
+        # D·A ve D·L: satırları sahne süresiyle ağırlıklandırılmış matrisler
+        D = sparse.diags(self.durations)
+        self._weighted_characters = (D @ A).tocsr()
+        self._weighted_locations = (D @ self.scene_location).tocsr()
+
+    @classmethod
+    def from_film(cls, film):
+        return cls(film.columns())
+
+    def screen_time(self):
+        """Karakter başına toplam ekran süresi (Aᵀ·d)"""
+        return self.scene_character.T @ self.durations
+
+    def location_time(self):
+        """Lokasyon başına toplam kullanım süresi (Lᵀ·d)"""
+        return self.scene_location.T @ self.durations
+
+    def character_location(self):
+        """Karakter × lokasyon süre matrisi (Aᵀ·D·L), seyrek"""
+        return (self.scene_character.T @ self._weighted_locations).tocsr()
+
+    def interaction(self, include_self=False):
+        """Karakter × karakter birlikte geçirilen süre matrisi (Aᵀ·D·A), seyrek.
+
+        include_self=False ise köşegen (karakterin kendi ekran süresi) sıfırlanır.
+        """
+        from scipy import sparse
+
+        matrix = (self.scene_character.T @ self._weighted_characters).tocsr()
+        if not include_self:
+            matrix = (matrix - sparse.diags(matrix.diagonal())).tocsr()
+            matrix.eliminate_zeros()
+        return matrix
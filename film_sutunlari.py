@@ -0,0 +1,177 @@
+import numpy as np
+
+# Filmin sütun tabanlı (columnar) temsili.
+# Sahne, olay ve ilişki alanları nesne başına değil, alan başına tek bir NumPy
+# dizisinde tutulur; oyuncu kadroları CSR (indptr/indices) biçimindedir.
+# Karakter ve lokasyon kodları, film.characters / film.locations listelerindeki
+# sıra numaralarıdır; *_ids dizileri her satırın kararlı kimliğini verir.
+
+
+def _encode(values):
+    """Değerleri ilk görülme sırasıyla tabloya ve tamsayı kodlara dönüştürür"""
+    table = []
+    lookup = {}
+    codes = np.empty(len(values), dtype=np.int32)
+    for i, value in enumerate(values):
+        code = lookup.get(value)
+        if code is None:
+            code = lookup[value] = len(table)
+            table.append(value)
+        codes[i] = code
+    return table, codes
+
+
+def _cast_csr(items, character_codes):
+    """Her öğenin karakter listesini CSR (indptr, indices) dizilerine dönüştürür"""
+    indptr = np.zeros(len(items) + 1, dtype=np.int64)
+    indices = []
+    for i, item in enumerate(items):
+        for character in item.characters:
+            indices.append(_code_of(character_codes, character, "karakter"))
+        indptr[i + 1] = len(indices)
+    return indptr, np.array(indices, dtype=np.int32)
+
+
+def _ids(items):
+    return np.array([item.id if item.id is not None else -1 for item in items], dtype=np.int64)
+
+
+def _code_of(codes, obj, kind):
+    try:
+        return codes[id(obj)]
+    except KeyError:
+        raise ValueError(f"'{obj.name}' {kind} filmde tanımlı değil") from None
+
+
+class FilmColumns:
+    def __init__(self):
+        # Karakterler
+        self.character_ids = np.empty(0, dtype=np.int64)
+        self.character_names = []
+        self.character_types = []
+        self.character_type_codes = np.empty(0, dtype=np.int32)
+        self.character_importance = np.empty(0, dtype=np.float64)
+
+        # Lokasyonlar
+        self.location_ids = np.empty(0, dtype=np.int64)
+        self.location_names = []
+        self.location_types = []
+        self.location_type_codes = np.empty(0, dtype=np.int32)
+
+        # Sahneler
+        self.scene_ids = np.empty(0, dtype=np.int64)
+        self.scene_start = np.empty(0, dtype=np.float64)
+        self.scene_end = np.empty(0, dtype=np.float64)
+        self.scene_location = np.empty(0, dtype=np.int32)
+        self.scene_cast_indptr = np.zeros(1, dtype=np.int64)
+        self.scene_cast_indices = np.empty(0, dtype=np.int32)
+
+        # İlişkiler (bitişi olmayan ilişkilerde end = NaN)
+        self.relationship_ids = np.empty(0, dtype=np.int64)
+        self.relationship_char1 = np.empty(0, dtype=np.int32)
+        self.relationship_char2 = np.empty(0, dtype=np.int32)
+        self.relationship_types = []
+        self.relationship_type_codes = np.empty(0, dtype=np.int32)
+        self.relationship_start = np.empty(0, dtype=np.float64)
+        self.relationship_end = np.empty(0, dtype=np.float64)
+        self.relationship_strength = np.empty(0, dtype=np.float64)
+
+        # Olaylar
+        self.event_ids = np.empty(0, dtype=np.int64)
+        self.event_time = np.empty(0, dtype=np.float64)
+        self.event_importance = np.empty(0, dtype=np.float64)
+        self.event_location = np.empty(0, dtype=np.int32)
+        self.event_types = []
+        self.event_type_codes = np.empty(0, dtype=np.int32)
+        self.event_cast_indptr = np.zeros(1, dtype=np.int64)
+        self.event_cast_indices = np.empty(0, dtype=np.int32)
+
+    @classmethod
+    def from_film(cls, film):
+        """Film nesne grafiğinden sütunları oluşturur"""
+        columns = cls()
+
+        characters = film.characters
+        locations = film.locations
+        character_codes = {id(c): i for i, c in enumerate(characters)}
+        location_codes = {id(l): i for i, l in enumerate(locations)}
+
+        columns.character_ids = _ids(characters)
+        columns.character_names = [c.name for c in characters]
+        columns.character_types, columns.character_type_codes = _encode([c.type for c in characters])
+        columns.character_importance = np.array([c.importance for c in characters], dtype=np.float64)
+
+        columns.location_ids = _ids(locations)
+        columns.location_names = [l.name for l in locations]
+        columns.location_types, columns.location_type_codes = _encode([l.type for l in locations])
+
+        scenes = film.scenes
+        columns.scene_ids = _ids(scenes)
+        columns.scene_start = np.array([s.start_time for s in scenes], dtype=np.float64)
+        columns.scene_end = np.array([s.end_time for s in scenes], dtype=np.float64)
+        columns.scene_location = np.array(
+            [_code_of(location_codes, s.location, "lokasyon") for s in scenes], dtype=np.int32)
+        columns.scene_cast_indptr, columns.scene_cast_indices = _cast_csr(scenes, character_codes)
+
+        relationships = film.relationships
+        columns.relationship_ids = _ids(relationships)
+        columns.relationship_char1 = np.array(
+            [_code_of(character_codes, r.character1, "karakter") for r in relationships], dtype=np.int32)
+        columns.relationship_char2 = np.array(
+            [_code_of(character_codes, r.character2, "karakter") for r in relationships], dtype=np.int32)
+        columns.relationship_types, columns.relationship_type_codes = _encode([r.type for r in relationships])
+        columns.relationship_start = np.array([r.start_time for r in relationships], dtype=np.float64)
+        columns.relationship_end = np.array(
+            [np.nan if r.end_time is None else r.end_time for r in relationships], dtype=np.float64)
+        columns.relationship_strength = np.array([r.strength for r in relationships], dtype=np.float64)
+
+        events = film.events
+        columns.event_ids = _ids(events)
+        columns.event_time = np.array([e.time for e in events], dtype=np.float64)
+        columns.event_importance = np.array([e.importance for e in events], dtype=np.float64)
+        columns.event_location = np.array(
+            [_code_of(location_codes, e.location, "lokasyon") for e in events], dtype=np.int32)
+        columns.event_types, columns.event_type_codes = _encode([e.type for e in events])
+        columns.event_cast_indptr, columns.event_cast_indices = _cast_csr(events, character_codes)
+
+        return columns
+
+    @property
+    def n_characters(self):
+        return len(self.character_names)
+
+    @property
+    def n_locations(self):
+        return len(self.location_names)
+
+    @property
+    def n_scenes(self):
+        return len(self.scene_start)
+
+    @property
+    def n_relationships(self):
+        return len(self.relationship_start)
+
+    @property
+    def n_events(self):
+        return len(self.event_time)
+
+    @property
+    def scene_duration(self):
+        return self.scene_end - self.scene_start
+
+    def scene_cast(self, scene_index):
+        """Bir sahnedeki karakter kodlarını (kopyalamadan) döndürür"""
+        return self.scene_cast_indices[self.scene_cast_indptr[scene_index]:self.scene_cast_indptr[scene_index + 1]]
+
+    def event_cast(self, event_index):
+        """Bir olaydaki karakter kodlarını (kopyalamadan) döndürür"""
+        return self.event_cast_indices[self.event_cast_indptr[event_index]:self.event_cast_indptr[event_index + 1]]
+
+    def scene_cast_rows(self):
+        """Kadro girdilerinin ait olduğu sahne indekslerini döndürür (indices ile aynı uzunlukta)"""
+        return np.repeat(np.arange(self.n_scenes), np.diff(self.scene_cast_indptr))
+
+    def event_cast_rows(self):
+        """Kadro girdilerinin ait olduğu olay indekslerini döndürür (indices ile aynı uzunlukta)"""
+        return np.repeat(np.arange(self.n_events), np.diff(self.event_cast_indptr))
@@ -1,45 +1,446 @@
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-import networkx as nx
-from matplotlib.colors import LinearSegmentedColormap
-import matplotlib.patches as mpatches
-from matplotlib.lines import Line2D
+import hashlib
 import json
+from bisect import bisect_left, insort
+from collections.abc import Mapping
+from operator import attrgetter
 from datetime import timedelta
 
-# Film verilerini depolamak için sınıflar oluşturalım
+def _section(name):
+    """Ertelenmiş (henüz yüklenmemiş) bölümü ilk erişimde yükleyen koleksiyon özelliği"""
+    attr = "_" + name
+    
+    def get(self):
+        if name in self._deferred:
+            self._load_section(name)
+        return getattr(self, attr)
+    
+    return property(get)
+
+# Film verilerini depolamak için sınıflar oluşturalım.
+# Sahneler başlangıç zamanına, olaylar zamana göre her zaman sıralı tutulur;
+# film.scenes ve film.events yeniden sıralanmadan kronolojik olarak kullanılabilir.
 class Film:
+    characters = _section("characters")
+    locations = _section("locations")
+    scenes = _section("scenes")
+    relationships = _section("relationships")
+    events = _section("events")
+    
     def __init__(self, title, duration_minutes):
         self.title = title
         self.duration = duration_minutes
-        self.characters = []
-        self.locations = []
-        self.scenes = []
-        self.relationships = []
-        self.events = []
+        self._characters = []
+        self._locations = []
+        self._scenes = []
+        self._relationships = []
+        self._events = []
+        # Seçerek yüklenen filmlerde henüz okunmamış bölümler: bölüm -> yükleyici
+        self._deferred = {}
+        # Kararlı tamsayı kimlikler: tür -> {id: nesne}, karakter/lokasyon için isim -> id
+        self._by_id = {kind: {} for kind in _COLLECTIONS}
+        self._next_id = {kind: 1 for kind in _COLLECTIONS}
+        self._name_ids = {"character": {}, "location": {}}
+        # Ters başvuru indeksi: karakter/lokasyon id -> ona başvuran kayıtlar (sıralı küme)
+        self._refs = {"character": {}, "location": {}}
+        # Türetilmiş yapılar (sütunlar, indeksler) için önbellek
+        self._version = 0
+        self._cache = {}
+        # Değişiklik dinleyicileri (örn. düzenleme günlüğü)
+        self._listeners = []
+        # Filmin yüklendiği/kaydedildiği dosya; yanındaki yardımcı dosyalar (örn. ağ yerleşimi) için
+        self.source = None
         
     def add_character(self, character):
-        self.characters.append(character)
-        return character
+        return self.add_entity(character)
         
     def add_location(self, location):
-        self.locations.append(location)
-        return location
+        return self.add_entity(location)
         
     def add_scene(self, start_time, end_time, location, characters, description):
-        scene = Scene(start_time, end_time, location, characters, description)
-        self.scenes.append(scene)
-        return scene
+        return self.add_entity(Scene(start_time, end_time, location, characters, description))
     
     def add_relationship(self, relationship):
-        self.relationships.append(relationship)
-        return relationship
+        return self.add_entity(relationship)
     
     def add_event(self, event):
-        self.events.append(event)
-        return event
+        return self.add_entity(event)
+    
+    def update_character(self, character, **changes):
+        return self.update_entity(character, **changes)
+    
+    def update_location(self, location, **changes):
+        return self.update_entity(location, **changes)
+    
+    def update_scene(self, scene, **changes):
+        return self.update_entity(scene, **changes)
+    
+    def update_relationship(self, relationship, **changes):
+        return self.update_entity(relationship, **changes)
+    
+    def update_event(self, event, **changes):
+        return self.update_entity(event, **changes)
+    
+    def remove_character(self, character):
+        self.remove_entity(character)
+    
+    def remove_location(self, location):
+        self.remove_entity(location)
+    
+    def remove_scene(self, scene):
+        self.remove_entity(scene)
+    
+    def remove_relationship(self, relationship):
+        self.remove_entity(relationship)
+    
+    def remove_event(self, event):
+        self.remove_entity(event)
+    
+    def add_entity(self, obj):
+        """Nesneyi türüne göre filme ekler; kimliği yoksa yeni bir kimlik atar"""
+        kind = _KINDS[type(obj)]
+        collection = self._collection(kind)  # Ertelenmiş bölüm önce yüklenir
+        self._register(kind, obj)
+        order_key = _ORDER_KEYS.get(kind)
+        if order_key is None:
+            collection.append(obj)
+        else:
+            insort(collection, obj, key=order_key)
+        self._changed("add", kind, obj)
+        return obj
+    
+    def update_entity(self, obj, **changes):
+        """Nesnenin alanlarını günceller; isim değişirse isim indeksini de günceller"""
+        kind = _KINDS[type(obj)]
+        if "id" in changes:
+            raise AttributeError("Kimlik (id) değiştirilemez")
+        # Tüm denetimler nesneye ve indekslere dokunmadan önce yapılır; hata durumunda film değişmez
+        _check_fields(obj, changes)
+        old_refs = None
+        if any(field in changes for field in _REFERENCE_FIELDS.get(kind, ())):
+            old_refs = _references(kind, lambda field: getattr(obj, field))
+            new_refs = _references(kind, lambda field: changes[field] if field in changes else getattr(obj, field))
+            self._check_references(new_refs)
+        renamed = "name" in changes and kind in self._name_ids and changes["name"] != obj.name
+        if renamed and changes["name"] in self._name_ids[kind]:
+            raise ValueError(f"'{changes['name']}' adında bir {_KIND_LABELS[kind]} zaten var")
+        order_key = _ORDER_KEYS.get(kind)
+        position = None
+        if order_key is not None and order_key.field in changes and changes[order_key.field] != order_key(obj):
+            position = _position(self._collection(kind), obj, order_key)
+        
+        if renamed:
+            names = self._name_ids[kind]
+            del names[obj.name]
+            names[changes["name"]] = obj.id
+        if position is not None:
+            # Zamanı değişen sahne/olay sıralı listede yeni yerine taşınır
+            collection = self._collection(kind)
+            del collection[position]
+            _apply_changes(obj, changes)
+            insort(collection, obj, key=order_key)
+        else:
+            _apply_changes(obj, changes)
+        if old_refs is not None:
+            self._unindex_references(obj, old_refs)
+            self._index_references(obj, new_refs)
+        self._changed("update", kind, obj)
+        return obj
+    
+    def remove_entity(self, obj):
+        """Nesneyi filmden ve kimlik indekslerinden çıkarır; başvurulan karakter/lokasyon silinemez"""
+        kind = _KINDS[type(obj)]
+        if kind in self._refs and self.references(obj):
+            raise ValueError(f"'{obj.name}' {_KIND_LABELS[kind]} sahnelerde, ilişkilerde veya olaylarda kullanılıyor; "
+                             "bağlı kayıtlarla birlikte silmek için remove_cascade kullanın")
+        collection = self._collection(kind)
+        order_key = _ORDER_KEYS.get(kind)
+        if order_key is None:
+            collection.remove(obj)
+        else:
+            del collection[_position(collection, obj, order_key)]
+        del self._by_id[kind][obj.id]
+        if kind in self._name_ids:
+            del self._name_ids[kind][obj.name]
+        self._unindex_references(obj, _references(kind, lambda field: getattr(obj, field)))
+        self._changed("remove", kind, obj)
+    
+    def references(self, obj):
+        """Karakter veya lokasyona başvuran sahne, ilişki ve olayları O(derece) sürede döndürür"""
+        kind = _KINDS[type(obj)]
+        for section in _DEPENDENT_SECTIONS[kind]:
+            if section in self._deferred:
+                self._load_section(section)
+        return list(self._refs[kind].get(obj.id, ()))
+    
+    def is_referenced(self, obj):
+        return bool(self.references(obj))
+    
+    def remove_cascade(self, obj):
+        """Karakter veya lokasyonu bağlı kayıtlarla birlikte siler ve etkilenen kayıtları döndürür.
+        
+        Karakter sahne/olay kadrolarından çıkarılır, ilişkileri silinir. Lokasyon
+        silinirken o lokasyondaki sahne ve olaylar da silinir.
+        """
+        kind = _KINDS[type(obj)]
+        affected = self.references(obj)
+        for dependent in affected:
+            if kind == "location" or isinstance(dependent, Relationship):
+                self.remove_entity(dependent)
+            else:
+                self.update_entity(dependent, characters=[c for c in dependent.characters if c is not obj])
+        self.remove_entity(obj)
+        return affected
+    
+    def rename_entity(self, obj, name):
+        """Karakter veya lokasyonun adını değiştirir ve ona başvuran kayıtları döndürür.
+        
+        Kayıtlar nesneye başvurduğu için yeni ad to_dict çıktılarına kendiliğinden
+        yansır; dönen liste yalnızca görünümleri yenilenecek kayıtları bildirir.
+        """
+        self.update_entity(obj, name=name)
+        return self.references(obj)
+    
+    def validate(self):
+        """Kimlik, isim, sıralama ve başvuru indekslerini doğrusal sürede denetler; sorunları liste olarak döndürür"""
+        problems = []
+        expected_refs = {"character": {}, "location": {}}
+        for kind, section in _COLLECTIONS.items():
+            label = _KIND_LABELS[kind]
+            items = getattr(self, section)
+            by_id = self._by_id[kind]
+            if len(by_id) != len(items):
+                problems.append(f"{label} kimlik indeksinde {len(by_id)} kayıt var, listede {len(items)}")
+            names = self._name_ids.get(kind)
+            if names is not None and len(names) != len(items):
+                problems.append(f"{label} isim indeksinde {len(names)} kayıt var, listede {len(items)}")
+            
+            order_key = _ORDER_KEYS.get(kind)
+            previous = None
+            for obj in items:
+                if by_id.get(obj.id) is not obj:
+                    problems.append(f"{label} {obj.id} kimlik indeksinde yok")
+                if names is not None and names.get(obj.name) != obj.id:
+                    problems.append(f"'{obj.name}' {label} isim indeksinde yok")
+                if order_key is not None:
+                    if previous is not None and order_key(obj) < previous:
+                        problems.append(f"{label} {obj.id} zaman sırasında değil")
+                    previous = order_key(obj)
+                if kind == "scene" and obj.start_time > obj.end_time:
+                    problems.append(f"sahne {obj.id} bitişinden sonra başlıyor")
+                
+                for target_kind, target in _references(kind, lambda field: getattr(obj, field)):
+                    if self._by_id[target_kind].get(target.id) is not target:
+                        problems.append(f"{label} {obj.id}: '{target.name}' {_KIND_LABELS[target_kind]} filmde tanımlı değil")
+                    expected_refs[target_kind].setdefault(target.id, {})[obj] = None
+        
+        for kind, refs in expected_refs.items():
+            if refs != self._refs[kind]:
+                problems.append(f"{_KIND_LABELS[kind]} ters başvuru indeksi güncel değil")
+        return problems
+    
+    def get_entity(self, kind, entity_id):
+        """Kimliği verilen nesneyi O(1) sürede döndürür (bulunamazsa KeyError)"""
+        return self._ids(kind)[entity_id]
+    
+    def get_character(self, character_id):
+        return self.get_entity("character", character_id)
+    
+    def get_location(self, location_id):
+        return self.get_entity("location", location_id)
+    
+    def get_scene(self, scene_id):
+        return self.get_entity("scene", scene_id)
+    
+    def get_relationship(self, relationship_id):
+        return self.get_entity("relationship", relationship_id)
+    
+    def get_event(self, event_id):
+        return self.get_entity("event", event_id)
+    
+    def character_by_name(self, name):
+        """İsmi verilen karakteri döndürür, yoksa None"""
+        by_id = self._ids("character")
+        character_id = self._name_ids["character"].get(name)
+        return None if character_id is None else by_id[character_id]
+    
+    def location_by_name(self, name):
+        """İsmi verilen lokasyonu döndürür, yoksa None"""
+        by_id = self._ids("location")
+        location_id = self._name_ids["location"].get(name)
+        return None if location_id is None else by_id[location_id]
+    
+    @property
+    def character_map(self):
+        """İsimden karaktere salt okunur sözlük görünümü"""
+        return _NameMap(self._name_ids["character"], self._ids("character"))
+    
+    @property
+    def location_map(self):
+        """İsimden lokasyona salt okunur sözlük görünümü"""
+        return _NameMap(self._name_ids["location"], self._ids("location"))
+    
+    @property
+    def loaded_sections(self):
+        """Belleğe alınmış bölümlerin adları"""
+        return [name for name in _COLLECTIONS.values() if name not in self._deferred]
+    
+    def defer_section(self, section, loader):
+        """Bölümü ertelenmiş olarak işaretler; ilk erişimde loader() nesneleri döndürür"""
+        self._deferred[section] = loader
+    
+    def _load_section(self, section):
+        # Yükleyici bağımlı bölümlere (örn. sahneler için karakterler) erişebilir;
+        # önce çıkarıldığı için aynı bölüm yeniden yüklenmeye çalışılmaz
+        loader = self._deferred.pop(section)
+        kind = _SECTION_KINDS[section]
+        collection = getattr(self, "_" + section)
+        for obj in loader():
+            self._register(kind, obj)
+            collection.append(obj)
+        if kind in _ORDER_KEYS:
+            collection.sort(key=_ORDER_KEYS[kind])
+        # Yükleme bir düzenleme değildir; dinleyicilere bildirilmez
+        self._changed()
+    
+    def _ids(self, kind):
+        section = _COLLECTIONS[kind]
+        if section in self._deferred:
+            self._load_section(section)
+        return self._by_id[kind]
+    
+    def _collection(self, kind):
+        return getattr(self, _COLLECTIONS[kind])
+    
+    def _register(self, kind, obj):
+        by_id = self._by_id[kind]
+        if obj.id is not None and obj.id in by_id:
+            raise ValueError(f"{obj.id} kimlikli bir {_KIND_LABELS[kind]} zaten var")
+        names = self._name_ids.get(kind)
+        if names is not None and obj.name in names:
+            raise ValueError(f"'{obj.name}' adında bir {_KIND_LABELS[kind]} zaten var")
+        refs = _references(kind, lambda field: getattr(obj, field))
+        self._check_references(refs)
+        
+        # Kimlik yalnızca tüm denetimler geçtikten sonra atanır
+        if obj.id is None:
+            obj.id = self._next_id[kind]
+        self._next_id[kind] = max(self._next_id[kind], obj.id + 1)
+        by_id[obj.id] = obj
+        if names is not None:
+            names[obj.name] = obj.id
+        self._index_references(obj, refs)
+    
+    def _check_references(self, refs):
+        for target_kind, target in refs:
+            if self._ids(target_kind).get(target.id) is not target:
+                raise ValueError(f"'{target.name}' {_KIND_LABELS[target_kind]} filmde tanımlı değil")
+    
+    def _index_references(self, obj, refs):
+        for target_kind, target in refs:
+            self._refs[target_kind].setdefault(target.id, {})[obj] = None
+    
+    def _unindex_references(self, obj, refs):
+        for target_kind, target in refs:
+            dependents = self._refs[target_kind].get(target.id)
+            if dependents is not None:
+                dependents.pop(obj, None)
+                if not dependents:
+                    del self._refs[target_kind][target.id]
+    
+    def add_listener(self, listener):
+        """Her ekleme/güncelleme/silmede listener(op, kind, obj) çağrılır"""
+        self._listeners.append(listener)
+    
+    def remove_listener(self, listener):
+        self._listeners.remove(listener)
+    
+    def invalidate(self):
+        """Nesneler doğrudan değiştirildiyse türetilmiş yapıları geçersiz kılar ve sıralamayı onarır"""
+        for kind, order_key in _ORDER_KEYS.items():
+            section = _COLLECTIONS[kind]
+            if section not in self._deferred:
+                self._collection(kind).sort(key=order_key)
+        
+        # Kadrolar yerinde değiştirilmiş olabilir; ters başvuru indeksi yeniden kurulur
+        self._refs = {"character": {}, "location": {}}
+        for kind, section in _COLLECTIONS.items():
+            if section not in self._deferred:
+                for obj in getattr(self, section):
+                    self._index_references(obj, _references(kind, lambda field: getattr(obj, field)))
+        self._changed()
+    
+    def _changed(self, op=None, kind=None, obj=None):
+        self._version += 1
+        self._cache.clear()
+        if op is not None:
+            for listener in list(self._listeners):
+                listener(op, kind, obj)
+    
+    def _cached(self, key, builder):
+        if key not in self._cache:
+            self._cache[key] = builder()
+        return self._cache[key]
+    
+    def columns(self):
+        """Filmin sütun tabanlı (NumPy) temsilini döndürür, değişiklik olana kadar önbellekte tutar"""
+        from film_sutunlari import FilmColumns
+        return self._cached("columns", lambda: FilmColumns.from_film(self))
+    
+    def fingerprint(self):
+        """Film içeriğinin kararlı SHA-256 özeti; içerik değişmedikçe aynı kalır"""
+        def build():
+            canonical = json.dumps(self.to_dict(), sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+            return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+        return self._cached("fingerprint", build)
+    
+    def incidence(self):
+        """Sahne × karakter/lokasyon seyrek geliş matrislerini döndürür, değişiklik olana kadar önbellekte tutar"""
+        from film_matrisleri import FilmIncidence
+        return self._cached("incidence", lambda: FilmIncidence(self.columns()))
+    
+    def time_index(self):
+        """Sahne, ilişki ve olaylar için zaman indeksini döndürür, değişiklik olana kadar önbellekte tutar"""
+        from zaman_indeksi import FilmTimeIndex
+        return self._cached("time_index", lambda: FilmTimeIndex(self))
+    
+    def raster(self, step=1.0):
+        """Filmin step saniyelik kutulara dökülmüş yoğun dizilerini döndürür (bkz. zaman_rasteri)"""
+        from zaman_rasteri import FilmRaster
+        return self._cached(("raster", step), lambda: FilmRaster.from_film(self, step))
+    
+    def prefix_sums(self, step=1.0):
+        """Zaman aralığı toplamları için önek toplamı indeksini döndürür (bkz. onek_toplamlari)"""
+        from onek_toplamlari import PrefixSumIndex
+        return self._cached(("prefix_sums", step), lambda: PrefixSumIndex(self, step))
+    
+    def event_index(self):
+        """Aralıkta en önemli k olay sorguları için olay indeksini döndürür (bkz. olay_indeksi)"""
+        from olay_indeksi import EventIndex
+        return self._cached("event_index", lambda: EventIndex.from_film(self))
+    
+    def scenes_at(self, t):
+        """t anında ekranda olan sahneleri döndürür"""
+        return self.time_index().scenes.at(t)
+    
+    def scenes_between(self, t1, t2):
+        """[t1, t2) penceresiyle kesişen sahneleri döndürür"""
+        return self.time_index().scenes.overlapping(t1, t2)
+    
+    def relationships_at(self, t):
+        """t anında süren ilişkileri döndürür"""
+        return self.time_index().relationships.at(t)
+    
+    def relationships_between(self, t1, t2):
+        """[t1, t2) penceresiyle kesişen ilişkileri döndürür"""
+        return self.time_index().relationships.overlapping(t1, t2)
+    
+    def events_at(self, t):
+        """Tam olarak t anındaki olayları döndürür"""
+        return self.time_index().events.at(t)
+    
+    def events_between(self, t1, t2):
+        """[t1, t2) penceresindeki olayları döndürür"""
+        return self.time_index().events.overlapping(t1, t2)
     
     def to_dict(self):
         return {
@@ -56,73 +457,107 @@ class Film:
         with open(filename, 'w', encoding='utf-8') as f:
             json.dump(self.to_dict(), f, ensure_ascii=False, indent=4)
     
+    def save_to_binary(self, filename):
+        """Filmi sıkıştırılmış ikili biçimde kaydeder (bkz. film_ikili)"""
+        from film_ikili import save_to_binary
+        save_to_binary(self, filename)
+    
+    @classmethod
+    def load_from_binary(cls, filename):
+        """İkili biçimde kaydedilmiş filmi yükler"""
+        from film_ikili import load_from_binary
+        film = load_from_binary(filename, cls)
+        film.source = filename
+        return film
+    
+    def save_to_store(self, path, replace=False):
+        """Filmi SQLite film arşivine yazar ve arşivdeki kimliğini döndürür (bkz. film_arsivi).
+        
+        Aynı kaynak dosyalı ve başlıklı film arşivde varsa replace=True ile yerine yazılır.
+        """
+        from film_arsivi import save_to_store
+        return save_to_store(self, path, replace)
+    
+    @classmethod
+    def load_from_store(cls, path, film):
+        """Başlığı veya arşiv kimliği verilen filmi SQLite film arşivinden yükler"""
+        from film_arsivi import load_from_store
+        return load_from_store(path, film, cls)
+    
+    @classmethod
+    def load_from_json(cls, filename, stream=False, sections=None):
+        """JSON dosyasından film yükler; stream=True ise dosyayı parça parça okur.
+        
+        sections verilirse (örn. ("locations", "scenes")) yalnızca bu bölümler ve
+        bağımlılıkları okunur; diğerleri ilk erişildiklerinde dosyadan yüklenir.
+        
+        Dosyanın yanında düzenleme günlüğü (bkz. film_gunlugu) varsa anlık görüntüden
+        sonraki kayıtlar filme uygulanır; bu durumda tüm bölümler yüklenir.
+        """
+        from film_gunlugu import has_journal, replay_journal
+        journaled = has_journal(filename)
+        if journaled:
+            # Ertelenmiş bölümler anlık görüntüden okunacağından günlükle birleştirilemez
+            sections = None
+        
+        seq = 0
+        if sections is not None:
+            from film_akis import load_film_sections
+            film = load_film_sections(filename, cls, sections)
+        elif stream:
+            from film_akis import iter_film_json, load_film_stream
+            film = load_film_stream(filename, cls)
+            if journaled:
+                seq = next((value for _, value in iter_film_json(filename, kinds=("journal_seq",))), 0)
+        else:
+            with open(filename, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            film = cls.from_dict(data)
+            seq = data.get("journal_seq", 0)
+        
+        if journaled:
+            replay_journal(film, filename, seq)
+        film.source = filename
+        return film
+    
     @classmethod
-    def load_from_json(cls, filename):
-        with open(filename, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+    def from_dict(cls, data):
+        """to_dict çıktısından film oluşturur; tutarsız veride tüm sorunları listeleyen ValueError verir"""
+        problems = validate_film_data(data)
+        if problems:
+            raise ValueError("Film verisi tutarsız:\n" + "\n".join(problems))
         
         film = cls(data["title"], data["duration"])
         
         # Önce karakterleri ve lokasyonları yükle
-        character_map = {}
         for char_data in data["characters"]:
-            character = Character(char_data["name"], char_data["type"])
-            character.importance = char_data["importance"]
-            character.traits = char_data["traits"]
-            film.characters.append(character)
-            character_map[char_data["name"]] = character
+            film.add_entity(Character.from_dict(char_data))
             
-        location_map = {}
         for loc_data in data["locations"]:
-            location = Location(loc_data["name"], loc_data["type"])
-            film.locations.append(location)
-            location_map[loc_data["name"]] = location
+            film.add_entity(Location.from_dict(loc_data))
+        
+        character_map = film.character_map
+        location_map = film.location_map
         
         # Sonra sahneleri yükle
         for scene_data in data["scenes"]:
-            characters = [character_map[name] for name in scene_data["character_names"]]
-            location = location_map[scene_data["location_name"]]
-            scene = Scene(
-                scene_data["start_time"], 
-                scene_data["end_time"],
-                location,
-                characters,
-                scene_data["description"]
-            )
-            film.scenes.append(scene)
+            film.add_entity(Scene.from_dict(scene_data, character_map, location_map))
         
         # İlişkileri yükle
         for rel_data in data["relationships"]:
-            char1 = character_map[rel_data["character1_name"]]
-            char2 = character_map[rel_data["character2_name"]]
-            relationship = Relationship(
-                char1,
-                char2,
-                rel_data["type"],
-                rel_data["start_time"],
-                rel_data["end_time"] if "end_time" in rel_data else None,
-                rel_data["strength"]
-            )
-            film.relationships.append(relationship)
+            film.add_entity(Relationship.from_dict(rel_data, character_map))
         
         # Olayları yükle
         for event_data in data["events"]:
-            characters = [character_map[name] for name in event_data["character_names"]]
-            location = location_map[event_data["location_name"]]
-            event = Event(
-                event_data["name"],
-                event_data["time"],
-                location,
-                characters,
-                event_data["importance"],
-                event_data["type"]
-            )
-            film.events.append(event)
+            film.add_entity(Event.from_dict(event_data, character_map, location_map))
             
         return film
 
 class Character:
+    __slots__ = ("id", "name", "type", "importance", "traits")
+
     def __init__(self, name, character_type):
+        self.id = None  # Filme eklenirken atanır
         self.name = name
         self.type = character_type  # protagonist, antagonist, supporting, etc.
         self.importance = 0  # 1-10 scale
@@ -130,25 +565,47 @@ class Character:
         
     def to_dict(self):
         return {
+            "id": self.id,
             "name": self.name,
             "type": self.type,
             "importance": self.importance,
             "traits": self.traits
         }
+    
+    @classmethod
+    def from_dict(cls, data):
+        character = cls(data["name"], data["type"])
+        character.id = data.get("id")
+        character.importance = data["importance"]
+        character.traits = data["traits"]
+        return character
 
 class Location:
+    __slots__ = ("id", "name", "type")
+
     def __init__(self, name, location_type):
+        self.id = None  # Filme eklenirken atanır
         self.name = name
         self.type = location_type  # indoor, outdoor, fictional, real, etc.
         
     def to_dict(self):
         return {
+            "id": self.id,
             "name": self.name,
             "type": self.type
         }
+    
+    @classmethod
+    def from_dict(cls, data):
+        location = cls(data["name"], data["type"])
+        location.id = data.get("id")
+        return location
 
 class Scene:
+    __slots__ = ("id", "start_time", "end_time", "location", "characters", "description")
+
     def __init__(self, start_time, end_time, location, characters, description):
+        self.id = None  # Filme eklenirken atanır
         self.start_time = start_time  # in seconds from the beginning
         self.end_time = end_time  # in seconds from the beginning
         self.location = location
@@ -157,15 +614,31 @@ class Scene:
         
     def to_dict(self):
         return {
+            "id": self.id,
             "start_time": self.start_time,
             "end_time": self.end_time,
             "location_name": self.location.name,
             "character_names": [c.name for c in self.characters],
             "description": self.description
         }
+    
+    @classmethod
+    def from_dict(cls, data, character_map, location_map):
+        scene = cls(
+            data["start_time"],
+            data["end_time"],
+            location_map[data["location_name"]],
+            [character_map[name] for name in data["character_names"]],
+            data["description"]
+        )
+        scene.id = data.get("id")
+        return scene
 
 class Relationship:
+    __slots__ = ("id", "character1", "character2", "type", "start_time", "end_time", "strength")
+
     def __init__(self, character1, character2, relationship_type, start_time, end_time=None, strength=5):
+        self.id = None  # Filme eklenirken atanır
         self.character1 = character1
         self.character2 = character2
         self.type = relationship_type  # friend, enemy, family, etc.
@@ -175,6 +648,7 @@ class Relationship:
         
     def to_dict(self):
         result = {
+            "id": self.id,
             "character1_name": self.character1.name,
             "character2_name": self.character2.name,
             "type": self.type,
@@ -184,9 +658,25 @@ class Relationship:
         if self.end_time is not None:
             result["end_time"] = self.end_time
         return result
+    
+    @classmethod
+    def from_dict(cls, data, character_map):
+        relationship = cls(
+            character_map[data["character1_name"]],
+            character_map[data["character2_name"]],
+            data["type"],
+            data["start_time"],
+            data["end_time"] if "end_time" in data else None,
+            data["strength"]
+        )
+        relationship.id = data.get("id")
+        return relationship
 
 class Event:
+    __slots__ = ("id", "name", "time", "location", "characters", "importance", "type")
+
     def __init__(self, name, time, location, characters, importance, event_type):
+        self.id = None  # Filme eklenirken atanır
         self.name = name
         self.time = time  # in seconds from the beginning
         self.location = location
@@ -196,6 +686,7 @@ class Event:
         
     def to_dict(self):
         return {
+            "id": self.id,
             "name": self.name,
             "time": self.time,
             "location_name": self.location.name,
@@ -203,6 +694,187 @@ class Event:
             "importance": self.importance,
             "type": self.type
         }
+    
+    @classmethod
+    def from_dict(cls, data, character_map, location_map):
+        event = cls(
+            data["name"],
+            data["time"],
+            location_map[data["location_name"]],
+            [character_map[name] for name in data["character_names"]],
+            data["importance"],
+            data["type"]
+        )
+        event.id = data.get("id")
+        return event
+
+# Nesne sınıfı -> tür adı, tür adı -> Film üzerindeki liste
+_KINDS = {
+    Character: "character",
+    Location: "location",
+    Scene: "scene",
+    Relationship: "relationship",
+    Event: "event",
+}
+
+_COLLECTIONS = {
+    "character": "characters",
+    "location": "locations",
+    "scene": "scenes",
+    "relationship": "relationships",
+    "event": "events",
+}
+
+class _OrderKey:
+    """Sıralı koleksiyonların anahtarı; hangi alanın sırayı belirlediğini de bilir"""
+    __slots__ = ("field", "_get")
+
+    def __init__(self, field):
+        self.field = field
+        self._get = attrgetter(field)
+
+    def __call__(self, obj):
+        return self._get(obj)
+
+_ORDER_KEYS = {
+    "scene": _OrderKey("start_time"),
+    "event": _OrderKey("time"),
+}
+
+# Başvuru alanları ve karakter/lokasyona başvurabilen bölümler
+_REFERENCE_FIELDS = {
+    "scene": ("location", "characters"),
+    "relationship": ("character1", "character2"),
+    "event": ("location", "characters"),
+}
+
+_DEPENDENT_SECTIONS = {
+    "character": ("scenes", "relationships", "events"),
+    "location": ("scenes", "events"),
+}
+
+_SECTION_KINDS = {section: kind for kind, section in _COLLECTIONS.items()}
+
+_KIND_LABELS = {
+    "character": "karakter",
+    "location": "lokasyon",
+    "scene": "sahne",
+    "relationship": "ilişki",
+    "event": "olay",
+}
+
+class _NameMap(Mapping):
+    """İsimden nesneye, Film'in isim -> id indeksi üzerinden çalışan görünüm"""
+    __slots__ = ("_names", "_by_id")
+
+    def __init__(self, names, by_id):
+        self._names = names
+        self._by_id = by_id
+
+    def __getitem__(self, name):
+        return self._by_id[self._names[name]]
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __len__(self):
+        return len(self._names)
+
+def _references(kind, get):
+    """Bir kaydın başvurduğu (tür, nesne) çiftleri; get(alan) alan değerini verir"""
+    if kind == "relationship":
+        return [("character", get("character1")), ("character", get("character2"))]
+    if kind in ("scene", "event"):
+        return [("location", get("location"))] + [("character", c) for c in get("characters")]
+    return []
+
+def validate_film_data(data):
+    """to_dict biçimindeki veride yinelenen isim/kimlikleri ve çözülemeyen başvuruları doğrusal sürede bulur"""
+    checker = FilmDataChecker()
+    for section, kind in (("characters", "character"), ("locations", "location")):
+        for item in data.get(section, ()):
+            checker.add_name(kind, item["name"])
+    for section, kind in _SECTION_KINDS.items():
+        for item in data.get(section, ()):
+            checker.check(kind, item)
+    return checker.problems()
+
+class FilmDataChecker:
+    """validate_film_data denetimlerini kayıt kayıt yapar (akış halinde okuma için).
+    
+    Karakter ve lokasyon isimleri add_name ile, tüm kayıtlar check ile sırayla verilir;
+    bir kayıt ancak isimleri kendisinden önce verilmiş varlıklara başvurabilir.
+    """
+    def __init__(self, character_names=(), location_names=()):
+        self._names = {"character": set(character_names), "location": set(location_names)}
+        self._ids = {kind: set() for kind in _KIND_LABELS}
+        self._counts = dict.fromkeys(_KIND_LABELS, 0)
+        self._name_problems = []
+        self._record_problems = []
+    
+    def add_name(self, kind, name):
+        """Karakter/lokasyon ismini kaydeder; isim yineleniyorsa False döndürür"""
+        if name in self._names[kind]:
+            self._name_problems.append(f"'{name}' adında birden fazla {_KIND_LABELS[kind]} var")
+            return False
+        self._names[kind].add(name)
+        return True
+    
+    def check(self, kind, item):
+        """Kaydın kimliğini ve başvurularını denetler; kayıt sorunsuzsa True döndürür"""
+        label = _KIND_LABELS[kind]
+        self._counts[kind] += 1
+        resolved = True
+        item_id = item.get("id")
+        if item_id is not None:
+            if item_id in self._ids[kind]:
+                self._record_problems.append(f"{item_id} kimliği birden fazla {label} kaydında kullanılıyor")
+                resolved = False
+            self._ids[kind].add(item_id)
+        
+        where = f"{self._counts[kind]}. {label}"
+        if "location_name" in item and item["location_name"] not in self._names["location"]:
+            self._record_problems.append(f"{where}: '{item['location_name']}' lokasyonu tanımlı değil")
+            resolved = False
+        referenced = list(item.get("character_names", ()))
+        referenced += [item[key] for key in ("character1_name", "character2_name") if key in item]
+        for name in referenced:
+            if name not in self._names["character"]:
+                self._record_problems.append(f"{where}: '{name}' karakteri tanımlı değil")
+                resolved = False
+        return resolved
+    
+    def problems(self):
+        """Bulunan sorunlar; isim sorunları validate_film_data'daki gibi önce gelir"""
+        return self._name_problems + self._record_problems
+    
+    def raise_problems(self):
+        """Sorun bulunduysa Film.from_dict ile aynı ValueError'ı verir"""
+        problems = self.problems()
+        if problems:
+            raise ValueError("Film verisi tutarsız:\n" + "\n".join(problems))
+
+def _position(collection, obj, order_key):
+    """Sıralı koleksiyonda nesnenin yerini ikili arama ile bulur"""
+    key = order_key(obj)
+    i = bisect_left(collection, key, key=order_key)
+    # Aynı zamanlı kayıtlar arasında nesnenin kendisi aranır
+    while i < len(collection) and order_key(collection[i]) == key:
+        if collection[i] is obj:
+            return i
+        i += 1
+    raise ValueError(f"{type(obj).__name__} nesnesi bu filmde tanımlı değil")
+
+def _check_fields(obj, changes):
+    """Bilinmeyen alanlarda hata verir"""
+    for field in changes:
+        if field not in type(obj).__slots__:
+            raise AttributeError(f"{type(obj).__name__} nesnesinde '{field}' alanı yok")
+
+def _apply_changes(obj, changes):
+    """Denetlenmiş alanları nesneye uygular"""
+    for field, value in changes.items():
+        setattr(obj, field, value)
 
 # Saniye cinsinden süreyi saat:dakika:saniye formatına dönüştürür
 def format_time(seconds):
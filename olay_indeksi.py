@@ -0,0 +1,147 @@
+import heapq
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+
+# Zaman aralığında "en önemli k olay" sorguları.
+# Film olayları zamana göre sıralı tuttuğundan [t1, t2] aralığı olay dizisinde
+# bitişik bir [lo, hi) dilimidir (iki ikili arama). Önem dereceleri üzerine kurulan
+# seyrek tablo (sparse table) herhangi bir dilimdeki en önemli olayı O(1)'de verir;
+# ilk k olay, en önemli olayı çıkarıp dilimi ikiye bölen bir yığınla (heap)
+# O(log n + k log k) sürede bulunur. Eşit önemde önce gerçekleşen olay seçilir.
+#
+# Yakınlaştırmaya göre etiketleme için her olayın ayrıntı düzeyi (LOD) de hesaplanır:
+# L. düzeyde film 2^L eşit pencereye bölünür ve her pencerenin en önemli olayı o
+# düzeyde görünür hale gelir. Görünen aralık daraldıkça düzey artar ve daha fazla etiket çıkar.
+
+# Tüm film görünürken kullanılan düzey (2^BASE_LEVEL pencere)
+BASE_LEVEL = 2
+
+
+class EventIndex:
+    def __init__(self, columns, duration):
+        """FilmColumns'taki zamana göre sıralı olaylar üzerinde seyrek tablo kurar; duration: film süresi (saniye).
+
+        Döndürülen indeksler film.events (ve columns) sırasındaki olay indeksleridir.
+        """
+        self.times = columns.event_time
+        self.importance = columns.event_importance
+        self.duration = float(duration)
+        self._time_list = self.times.tolist()
+
+        n = len(self.times)
+        imp = self.importance
+        self._table = [np.arange(n)]
+        j = 1
+        while (1 << j) <= n:
+            previous = self._table[-1]
+            half = 1 << (j - 1)
+            width = n - (1 << j) + 1
+            left, right = previous[:width], previous[half:half + width]
+            self._table.append(np.where(imp[left] >= imp[right], left, right))
+            j += 1
+
+    @classmethod
+    def from_film(cls, film):
+        return cls(film.columns(), film.duration)
+
+    def __len__(self):
+        return len(self.times)
+
+    def span(self, start=None, end=None):
+        """[start, end] zaman aralığındaki olayların indeks dilimi (lo, hi)"""
+        lo = 0 if start is None else bisect_left(self._time_list, start)
+        hi = len(self.times) if end is None else bisect_right(self._time_list, end)
+        return lo, max(lo, hi)
+
+    def argmax(self, lo, hi):
+        """[lo, hi) dilimindeki en önemli olayın indeksi (boş dilimde None)"""
+        if hi <= lo:
+            return None
+        j = (hi - lo).bit_length() - 1
+        left = self._table[j][lo]
+        right = self._table[j][hi - (1 << j)]
+        return int(left if self.importance[left] >= self.importance[right] else right)
+
+    def most_important(self, start=None, end=None):
+        """[start, end] aralığındaki en önemli olayın indeksi (yoksa None)"""
+        return self.argmax(*self.span(start, end))
+
+    def top_k(self, start=None, end=None, k=None, min_importance=None):
+        """[start, end] aralığındaki en önemli k olayın indeksleri (önem sırasıyla).
+
+        k=None ise sınır yoktur; min_importance verilirse daha önemsiz olaylara inilmez.
+        """
+        result = []
+        heap = []
+
+        def push(lo, hi):
+            best = self.argmax(lo, hi)
+            if best is not None:
+                # Önem büyükten küçüğe, eşitlikte önce gerçekleşen olay
+                heapq.heappush(heap, (-self.importance[best], best, lo, hi))
+
+        push(*self.span(start, end))
+        while heap and (k is None or len(result) < k):
+            negative, best, lo, hi = heapq.heappop(heap)
+            if min_importance is not None and -negative < min_importance:
+                break
+            result.append(best)
+            push(lo, best)
+            push(best + 1, hi)
+        return result
+
+    # --- Ayrıntı düzeyi ---
+
+    def _windows(self, level, first=0, last=None):
+        """level düzeyindeki first..last pencerelerinin olay dilimleri [(lo, hi), ...]"""
+        windows = 1 << level
+        last = windows - 1 if last is None else last
+        width = self.duration / windows
+        bounds = np.searchsorted(self.times, np.arange(first, last + 2) * width, side="left")
+        if last == windows - 1:
+            # Son pencere film sonundaki olayları da içerir
+            bounds[-1] = len(self.times)
+        return zip(bounds[:-1].tolist(), bounds[1:].tolist())
+
+    def lod_levels(self, max_level=None):
+        """Her olayın görünür hale geldiği en küçük ayrıntı düzeyi (dizi).
+
+        Hiçbir pencerenin en önemlisi olmayan olaylar max_level + 1 düzeyini alır.
+        """
+        n = len(self.times)
+        if max_level is None:
+            max_level = max(n - 1, 1).bit_length() + 1
+        levels = np.full(n, max_level + 1, dtype=np.int64)
+        if n == 0 or self.duration <= 0:
+            return levels
+        # Düzeyler büyükten küçüğe işlenir; her olay en son (en küçük) düzeyini alır
+        for level in range(max_level, -1, -1):
+            for lo, hi in self._windows(level):
+                best = self.argmax(lo, hi)
+                if best is not None:
+                    levels[best] = level
+        return levels
+
+    def visible(self, start, end, level):
+        """[start, end] aralığında level düzeyinde etiketlenecek olayların indeksleri (zaman sırasıyla)"""
+        if len(self.times) == 0 or self.duration <= 0:
+            return []
+        windows = 1 << level
+        width = self.duration / windows
+        first = min(max(int(start // width), 0), windows - 1)
+        last = min(max(int(end // width), 0), windows - 1)
+        lo, hi = self.span(start, end)
+        result = []
+        for w_lo, w_hi in self._windows(level, first, last):
+            best = self.argmax(max(w_lo, lo), min(w_hi, hi))
+            if best is not None:
+                result.append(best)
+        return result
+
+
+def level_for_span(duration, span, base_level=BASE_LEVEL):
+    """Görünen zaman aralığı genişliğine karşılık gelen ayrıntı düzeyi"""
+    if span <= 0 or duration <= 0:
+        return base_level
+    return base_level + max(0, int(np.ceil(np.log2(duration / span))))
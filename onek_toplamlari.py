@@ -0,0 +1,136 @@
+import numpy as np
+
+# Zaman aralığı toplamları için önek toplamı (prefix sum) indeksi.
+# Film step saniyelik ızgaraya bölünür ve her k kenarı (t_k = k·step) için
+#   karakter/lokasyon:  F[k, c] = [0, t_k) içinde c'nin ekranda/kullanımda olduğu süre
+#   olay türü:          N[k, y] = t_k'dan önceki y türü olay sayısı (W: önem toplamı)
+# saklanır. [a, b) aralığındaki toplam F(b) - F(a) farkıdır, yani O(1). F parçalı
+# doğrusaldır; kenarlar arasındaki zamanlar doğrusal ara değerlemeyle okunur (aralık
+# sınırları ızgaraya düşüyorsa, örn. tam saniyeler ve step=1, sonuç tamdır). Olay
+# sayıları kutu çözünürlüğündedir: a ve b bir üstteki kenara yuvarlanır.
+#
+# F, rampalar toplamı olarak tek geçişte hesaplanır: birleşik parçalar (aralik_birlesimi)
+# için F(t) = Σ max(t - başlangıç, 0) - max(t - bitiş, 0); her kenarda eşik altındaki
+# başlangıç sayısı ve toplamı fark dizileriyle (np.add.at + cumsum) bulunur, O(n + T·sahip).
+
+
+def _ramp_sums(owners, points, step, n_edges, n_owners):
+    """G[k, o] = Σ_{points < t_k} (t_k - point), o sahibinin noktaları için"""
+    edges = np.arange(n_edges) * step
+    first_edge = np.maximum(np.floor(np.asarray(points, dtype=np.float64) / step).astype(np.int64) + 1, 0)
+    keep = first_edge < n_edges
+    first_edge, owners, points = first_edge[keep], np.asarray(owners)[keep], np.asarray(points)[keep]
+
+    count = np.zeros((n_edges, n_owners))
+    total = np.zeros((n_edges, n_owners))
+    np.add.at(count, (first_edge, owners), 1)
+    np.add.at(total, (first_edge, owners), points)
+    return edges[:, None] * np.cumsum(count, axis=0) - np.cumsum(total, axis=0)
+
+
+def _coverage_prefix(union, step, n_edges):
+    """IntervalUnion parçalarından F[k, o] (kenara kadar birikmiş kapsama süresi)"""
+    return (_ramp_sums(union.run_owner, union.run_start, step, n_edges, union.n_owners)
+            - _ramp_sums(union.run_owner, union.run_end, step, n_edges, union.n_owners))
+
+
+class PrefixSumIndex:
+    def __init__(self, film, step=1.0):
+        """Filmin karakter, lokasyon ve olay türü zaman çizgileri üzerinde önek toplamları kurar"""
+        from aralik_birlesimi import character_union, location_union
+
+        columns = film.columns()
+        self.step = float(step)
+        self.duration = float(film.duration)
+        self.n_bins = max(int(np.ceil(film.duration / step)), 1)
+        n_edges = self.n_bins + 1
+
+        self.character_names = columns.character_names
+        self.location_names = columns.location_names
+        self.event_types = columns.event_types
+        self._character_codes = {name: i for i, name in enumerate(self.character_names)}
+        self._location_codes = {name: i for i, name in enumerate(self.location_names)}
+        self._event_type_codes = {name: i for i, name in enumerate(self.event_types)}
+
+        self._character_prefix = _coverage_prefix(character_union(columns), self.step, n_edges)
+        self._location_prefix = _coverage_prefix(location_union(columns), self.step, n_edges)
+
+        # Olaylar: N[k] = t_k'dan önceki olaylar; son satır (k = n_bins + 1) tüm olaylardır,
+        # böylece film sonundaki (t = süre) olaylar da aralığın sonu verilmediğinde sayılır.
+        # Son sütun tüm türlerin toplamıdır.
+        n_types = len(self.event_types)
+        event_edge = np.minimum(np.floor(columns.event_time / self.step).astype(np.int64) + 1, n_edges)
+        counts = np.zeros((n_edges + 1, n_types + 1))
+        importance = np.zeros((n_edges + 1, n_types + 1))
+        for column in (columns.event_type_codes, np.full(columns.n_events, n_types)):
+            np.add.at(counts, (event_edge, column), 1)
+            np.add.at(importance, (event_edge, column), columns.event_importance)
+        self._event_count_prefix = np.cumsum(counts, axis=0)
+        self._event_importance_prefix = np.cumsum(importance, axis=0)
+
+    @classmethod
+    def from_film(cls, film, step=1.0):
+        return cls(film, step)
+
+    # --- Okuma ---
+
+    def _interpolate(self, prefix, t, column):
+        position = min(max(t / self.step, 0.0), float(self.n_bins))
+        k = min(int(position), self.n_bins - 1)
+        frac = position - k
+        # Tek sahip sorgusunda yalnızca iki hücre okunur
+        index = k if column is None else (k, column)
+        lower = prefix[index]
+        if frac == 0:
+            return lower
+        upper = prefix[k + 1] if column is None else prefix[k + 1, column]
+        return lower + (upper - lower) * frac
+
+    def _range(self, prefix, start, end, column):
+        end = self.duration if end is None else end
+        return self._interpolate(prefix, end, column) - self._interpolate(prefix, start, column)
+
+    def _event_edge(self, t):
+        if t is None:
+            return self.n_bins + 1
+        return min(max(int(np.ceil(t / self.step)), 0), self.n_bins + 1)
+
+    @staticmethod
+    def _code(codes, item, kind):
+        if item is None:
+            return None
+        if isinstance(item, (int, np.integer)):
+            return int(item)
+        name = getattr(item, "name", item)
+        try:
+            return codes[name]
+        except KeyError:
+            raise KeyError(f"{kind} bulunamadı: {name}") from None
+
+    def screen_time(self, character=None, start=0.0, end=None):
+        """[start, end) aralığında karakterin ekran süresi; character=None ise tüm karakterler (dizi)"""
+        return self._range(self._character_prefix, start, end,
+                           self._code(self._character_codes, character, "Karakter"))
+
+    def location_usage(self, location=None, start=0.0, end=None):
+        """[start, end) aralığında lokasyonun kullanım süresi; location=None ise tüm lokasyonlar (dizi)"""
+        return self._range(self._location_prefix, start, end,
+                           self._code(self._location_codes, location, "Lokasyon"))
+
+    def event_count(self, event_type=None, start=0.0, end=None):
+        """[start, end) aralığındaki olay sayısı; event_type=None ise tüm türlerin toplamı"""
+        return self._events(self._event_count_prefix, event_type, start, end)
+
+    def event_importance(self, event_type=None, start=0.0, end=None):
+        """[start, end) aralığındaki olayların önem toplamı; event_type=None ise tüm türler"""
+        return self._events(self._event_importance_prefix, event_type, start, end)
+
+    def event_counts_by_type(self, start=0.0, end=None):
+        """[start, end) aralığında tür başına olay sayıları (dizi, event_types sırasıyla)"""
+        prefix = self._event_count_prefix
+        return prefix[self._event_edge(end), :-1] - prefix[self._event_edge(start), :-1]
+
+    def _events(self, prefix, event_type, start, end):
+        code = self._code(self._event_type_codes, event_type, "Olay türü")
+        column = len(self.event_types) if code is None else code
+        return float(prefix[self._event_edge(end), column] - prefix[self._event_edge(start), column])
@@ -0,0 +1,162 @@
+import importlib
+import os
+import pickle
+import random
+import re
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from analiz_planlayici import AnalysisReport, run_analyses
+
+# Grafiklerin süreç havuzunda paralel çizimi.
+# Her iş bir (film, analiz) çiftidir; işçi süreçler Agg arka ucuyla çizer ve
+# sonucu, durumu ve süreyi ana sürece döndürür. Analiz kaydı süreçler arasında
+# taşınamayan lambda'lar içerdiğinden "modül:değişken" referansıyla verilir ve
+# her işçide içe aktarılır. Film verisi sözlük olarak gönderilir; işçi son
+# çözdüğü filmi hatırlar, böylece aynı filmin işleri filmi yeniden kurmaz.
+#
+# Sonuçlar iş bitiş sırasından bağımsızdır: raporlar plan sırasıyla birleştirilir
+# ve her iş filme ve analiz adına bağlı sabit bir tohumla (seed) çalışır.
+
+DEFAULT_REGISTRY = "film_analiz:ANALYSES"
+
+_worker_film = None  # (anahtar, Film); işçi süreçte en son kurulan film
+
+
+def load_registry(reference):
+    """"modül:değişken" referansındaki AnalysisRegistry nesnesini döndürür"""
+    module_name, _, attribute = reference.partition(":")
+    return getattr(importlib.import_module(module_name), attribute or "ANALYSES")
+
+
+def unique_dir_names(labels):
+    """Etiketlerden dosya sistemine uygun, birbirinden farklı dizin adları türetir"""
+    names, used = [], set()
+    for label in labels:
+        name = re.sub(r"[^\w.-]+", "_", label).strip("_") or "film"
+        candidate, n = name, 2
+        while candidate in used:
+            candidate, n = f"{name}_{n}", n + 1
+        used.add(candidate)
+        names.append(candidate)
+    return names
+
+
+def film_output_dirs(films, output_dir):
+    """Her film için çıktı dizini; birden çok filmde film adından türetilmiş alt dizinler"""
+    if len(films) == 1:
+        return [output_dir]
+    return [os.path.join(output_dir or ".", name) for name in unique_dir_names(film.title for film in films)]
+
+
+def job_seed(seed, film_key, name):
+    """Film ve analize bağlı, çalışma sırasından bağımsız rastgele tohum"""
+    return zlib.crc32(f"{seed}:{film_key}:{name}".encode("utf-8"))
+
+
+def _init_worker():
+    import matplotlib
+    matplotlib.use("Agg", force=True)
+
+
+def _run_job(registry_ref, film_key, film_data, source, name, output_dir, cache_dir, seed):
+    """İşçi süreçte tek bir analizi çalıştırır; (ad, durum, sonuç, hata, süre) döndürür"""
+    global _worker_film
+    from film_veri_yapisi import Film
+
+    if _worker_film is None or _worker_film[0] != film_key:
+        _worker_film = (film_key, Film.from_dict(film_data))
+    film = _worker_film[1]
+    film.source = source  # dosya yanındaki yardımcı veriler (örn. ağ yerleşimi) için
+
+    cache = None
+    if cache_dir is not None:
+        from analiz_onbellegi import AnalysisCache
+        cache = AnalysisCache(cache_dir)
+
+    import numpy as np
+    random.seed(seed)
+    np.random.seed(seed)
+
+    report = run_analyses(film, load_registry(registry_ref), [name], cache=cache, output_dir=output_dir)
+    result = report.results.get(name)
+    try:
+        pickle.dumps(result)
+    except Exception:
+        result = None  # taşınamayan sonuçlar (örn. açık figürler) ana sürece gönderilmez
+    return name, report.status, result, report.errors, report.timings
+
+
+def iter_render(jobs, registry=DEFAULT_REGISTRY, workers=None, cache_dir=None, seed=0):
+    """(film, analiz adı, çıktı dizini) işlerini süreç havuzunda çalıştırır.
+
+    Her iş bittikçe (iş indeksi, durum, sonuç, hatalar, süreler) üretir; sıra bitiş
+    sırasıdır. Üretici erken kapatılırsa (örn. Ctrl+C) bekleyen işler iptal edilir.
+    """
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+    try:
+        futures = {}
+        film_data = {}  # film -> (anahtar, sözlük); aynı filmin işleri için bir kez hazırlanır
+        for index, (film, name, output_dir) in enumerate(jobs):
+            if id(film) not in film_data:
+                film_data[id(film)] = (film.fingerprint(), film.to_dict())
+            film_key, data = film_data[id(film)]
+            future = pool.submit(_run_job, registry, film_key, data, film.source, name, output_dir,
+                                 cache_dir, job_seed(seed, film_key, name))
+            futures[future] = index
+
+        for future in as_completed(futures):
+            index = futures[future]
+            name = jobs[index][1]
+            try:
+                _, status, result, errors, timings = future.result()
+            except Exception as e:  # işçi süreç çöktü ya da sonuç taşınamadı
+                status, result, errors, timings = {name: "error"}, None, {name: f"{type(e).__name__}: {e}"}, {}
+            yield index, status.get(name, "error"), result, errors, timings
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def render_films(films, registry=DEFAULT_REGISTRY, names=None, workers=None, output_dir=None,
+                 cache_dir=None, seed=0, progress=None):
+    """Filmlerin analizlerini süreç havuzunda çalıştırır; film başına AnalysisReport listesi döndürür.
+
+    registry: "modül:değişken" referansı, names: çalıştırılacak analizler (varsayılan: tümü),
+    workers: süreç sayısı (varsayılan: işlemci sayısı), output_dir: çıktı dizini (birden çok
+    filmde film başına alt dizin), cache_dir: AnalysisCache dizini (None ise önbellek kullanılmaz).
+    progress(mesaj) tamamlanan her işi bildirir. Hatalar grafik başına rapora yazılır.
+    """
+    analysis_registry = load_registry(registry)
+    names = analysis_registry.analyses() if names is None else list(names)
+    analysis_registry.plan(names)  # bilinmeyen adlar ve döngüler işler başlamadan bildirilir
+
+    films = list(films)
+    dirs = film_output_dirs(films, output_dir)
+    jobs = [(film, name, dirs[i]) for i, film in enumerate(films) for name in names]
+    outcomes = {}
+
+    for done, (index, status, result, errors, timings) in enumerate(
+            iter_render(jobs, registry, workers, cache_dir, seed), 1):
+        outcomes[index] = (status, result, errors, timings)
+        if progress is not None:
+            film, name, _ = jobs[index]
+            progress(f"[{done}/{len(jobs)}] {film.title}: {name} ({status})")
+
+    # İşlerin bitiş sırası ne olursa olsun raporlar analiz sırasıyla birleştirilir
+    reports = [AnalysisReport(film.title) for film in films]
+    for index, (film, name, _) in enumerate(jobs):
+        report = reports[index // len(names)]
+        status, result, errors, timings = outcomes[index]
+        report.status[name] = status
+        report.timings[name] = sum(timings.values())
+        if status in ("ok", "cache"):
+            report.results[name] = result
+        # Ara sonuç hataları da eklenir; aynı hata birden çok işte görülse de bir kez yazılır
+        for key, error in errors.items():
+            report.errors.setdefault(key, error)
+    return reports
+
+
+def render_film(film, **options):
+    """Tek bir filmin analizlerini paralel çizer (bkz. render_films)"""
+    return render_films([film], **options)[0]
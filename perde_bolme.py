@@ -0,0 +1,202 @@
+import numpy as np
+
+# Veriye dayalı perde bölme (değişim noktası tespiti).
+# Filmin saniyelik raster dizileri (zaman_rasteri: etkin kadro, etkin ilişkiler, olay
+# önemi, etkin lokasyon) standartlaştırılıp çok boyutlu bir sinyale dönüştürülür ve
+# sinyal K parçaya, parça içi karesel hata (ortalama kayması maliyeti) en küçük olacak
+# biçimde bölünür. [a, b) parçasının maliyeti önek toplamlarından O(D) okunur:
+#   C(a, b) = Σ_d (S2[b] - S2[a]) - (S1[b] - S1[a])² / (b - a)
+#
+# Cezalı problem (her değişim noktası β ceza) PELT ile çözülür: dinamik programlamada
+# F(τ) + C(τ, s) > F(s) olan aday başlangıçlar s sonrasında hiçbir zaman en iyi olamayacağı
+# için budanır. En kısa parça uzunluğu (min_size) varken s ancak s + min_size anından
+# itibaren son parçanın başlangıcı olabildiğinden budama da o ana ertelenir; aday kümesi
+# küçük kaldığından çalışma süresi pratikte doğrusaldır.
+# Tam olarak K parça için ceza, K'dan çok ve az parçalı iki çözümün maliyet doğrularının
+# kesişimine taşınarak daraltılır (CROPS); birkaç PELT çalıştırması yeter ve bulunan K
+# parçalı cezalı çözüm K parçalı bölmelerin en iyisidir. K cezalı yolda yoksa bölme,
+# tüm olası konumlar üzerinde kesin K katmanlı dinamik programlamayla (O(K n²)) bulunur.
+
+DEFAULT_SIGNALS = ("active_cast", "active_relationships", "event_importance", "location")
+
+
+def act_signals(raster, signals=DEFAULT_SIGNALS):
+    """Raster dizilerinden (kutu × boyut) standartlaştırılmış sinyal matrisi.
+
+    "location" etkin lokasyonun tek-sıcak (one-hot) kodlamasıdır; boyut sayısından
+    bağımsız olarak toplam ağırlığı tek bir sinyalinkine eşit tutulur.
+    """
+    blocks = []
+    for name in signals:
+        if name == "location":
+            codes = raster.active_location
+            used = np.unique(codes)
+            block = (codes[:, None] == used[None, :]).astype(np.float64)
+        else:
+            block = np.asarray(getattr(raster, name), dtype=np.float64)[:, None]
+        std = block.std(axis=0)
+        keep = std > 0
+        if not keep.any():
+            continue
+        block = (block[:, keep] - block[:, keep].mean(axis=0)) / std[keep]
+        blocks.append(block / np.sqrt(block.shape[1]))
+    if not blocks:
+        return np.zeros((raster.n_bins, 1))
+    return np.hstack(blocks)
+
+
+class ActSegmenter:
+    def __init__(self, signal, min_size=1):
+        """(kutu × boyut) sinyal üzerinde parça maliyetleri için önek toplamları kurar"""
+        signal = np.asarray(signal, dtype=np.float64)
+        if signal.ndim == 1:
+            signal = signal[:, None]
+        self.n_bins = len(signal)
+        self.min_size = max(int(min_size), 1)
+        zero = np.zeros((1, signal.shape[1]))
+        self._sum = np.vstack([zero, np.cumsum(signal, axis=0)])
+        self._square = np.concatenate([[0.0], np.cumsum((signal ** 2).sum(axis=1))])
+
+    @classmethod
+    def from_raster(cls, raster, signals=DEFAULT_SIGNALS, min_fraction=0.05):
+        """Raster'dan; en kısa perde film süresinin min_fraction oranıdır"""
+        return cls(act_signals(raster, signals), min_size=int(raster.n_bins * min_fraction))
+
+    def cost(self, starts, end):
+        """[starts, end) parçalarının maliyetleri (starts dizi olabilir)"""
+        starts = np.asarray(starts)
+        length = end - starts
+        sums = self._sum[end] - self._sum[starts]
+        return (self._square[end] - self._square[starts]) - (sums ** 2).sum(axis=-1) / np.maximum(length, 1)
+
+    # --- Cezalı arama ---
+
+    def pelt(self, penalty):
+        """Değişim noktası başına penalty cezalı en iyi bölmenin değişim noktaları (kutu indeksleri)"""
+        n, min_size = self.n_bins, self.min_size
+        sums, squares = self._sum, self._square
+        norms = (sums ** 2).sum(axis=1)
+        best = np.full(n + 1, np.inf)
+        best[0] = -penalty
+        last = np.zeros(n + 1, dtype=np.int64)
+
+        # Aday başlangıçlar ve önek satırları önceden ayrılmış tamponlarda tutulur; her adımda
+        # maliyetler tek bir matris-vektör çarpımıyla hesaplanır:
+        #   ‖S1[t] - S1[τ]‖² = ‖S1[t]‖² - 2·S1[τ]·S1[t] + ‖S1[τ]‖²
+        candidates = np.zeros(n + 1, dtype=np.int64)
+        rows = np.zeros((n + 1, sums.shape[1]))
+        count = 1
+        # prunable_since[τ]: τ'nun budanabilir bulunduğu ilk an
+        prunable_since = np.full(n + 1, n + 1, dtype=np.int64)
+        for t in range(min_size, n + 1):
+            # s = t - min_size noktasında biten bir bölme artık son parçanın başlangıcı olabilir;
+            # s ya da daha önce budanabilir bulunan adaylar ancak şimdi çıkarılır
+            s = t - min_size
+            keep = prunable_since[candidates[:count]] > s
+            if not keep.all():
+                kept = int(keep.sum())
+                candidates[:kept] = candidates[:count][keep]
+                rows[:kept] = rows[:count][keep]
+                count = kept
+            if s >= min_size:
+                candidates[count] = s
+                rows[count] = sums[s]
+                count += 1
+            active = candidates[:count]
+            distance = norms[t] - 2 * (rows[:count] @ sums[t]) + norms[active]
+            values = best[active] + (squares[t] - squares[active]) - distance / (t - active)
+            i = int(np.argmin(values))
+            best[t] = values[i] + penalty
+            last[t] = active[i]
+            # Budama: F(τ) + C(τ, t) > F(t) olan τ, t son parçanın başlangıcı olabildiği
+            # t + min_size anından sonra hiçbir zaman en iyi olamaz
+            prunable = active[values > best[t]]
+            prunable_since[prunable] = np.minimum(prunable_since[prunable], t)
+        return _backtrack(last, n)
+
+    def partition_cost(self, points):
+        """Değişim noktalarıyla ayrılan parçaların toplam maliyeti"""
+        bounds = np.concatenate([[0], np.asarray(points, dtype=np.int64), [self.n_bins]])
+        return float(sum(self.cost(start, end) for start, end in zip(bounds[:-1], bounds[1:])))
+
+    def segment(self, k):
+        """Sinyali tam olarak k parçaya bölen değişim noktaları (kutu indeksleri, artan)"""
+        if k < 1:
+            raise ValueError("Perde sayısı en az 1 olmalıdır")
+        if k == 1:
+            return []
+        if self.n_bins < k * self.min_size:
+            raise ValueError(f"{self.n_bins} kutuluk sinyal en az {self.min_size} kutuluk {k} perdeye bölünemez")
+
+        # Ceza aralığı daraltılarak (CROPS): iki çözümün maliyet doğrularının kesiştiği ceza
+        # ile PELT çalıştırılır. Çözüm k parçalıysa k parçalı bölmelerin en iyisidir; arada
+        # yeni bir çözüm çıkmazsa k bu cezalı çözümlerin hiçbirinde yoktur.
+        low = self.pelt(0.0)
+        high = []
+        while len(low) + 1 > k > len(high) + 1:
+            low_cost, high_cost = self.partition_cost(low), self.partition_cost(high)
+            penalty = (high_cost - low_cost) / (len(low) - len(high))
+            found = self.pelt(penalty)
+            if len(found) in (len(low), len(high)):
+                break
+            if len(found) + 1 >= k:
+                low = found
+            else:
+                high = found
+        if len(low) + 1 == k:
+            return low
+        return self.exact_partition(k)
+
+    def exact_partition(self, k):
+        """Tüm olası konumlar üzerinde k parçalı en küçük maliyetli bölme (kesin DP, O(k n²))"""
+        n, min_size = self.n_bins, self.min_size
+        sums, squares = self._sum, self._square
+        norms = (sums ** 2).sum(axis=1)
+        ends = np.arange(n + 1)
+
+        # best[t]: [0, t) aralığının katman sayısı kadar parçalı en iyi maliyeti
+        best = np.full(n + 1, np.inf)
+        best[min_size:] = squares[min_size:] - norms[min_size:] / ends[min_size:]
+        choices = []
+        for layer in range(2, k + 1):
+            # Son katmanda yalnızca t = n gerekir
+            first = layer * min_size
+            targets = [n] if layer == k else range(first, n + 1)
+            current = np.full(n + 1, np.inf)
+            choice = np.zeros(n + 1, dtype=np.int64)
+            for t in targets:
+                # Son parçanın başlangıcı τ ∈ [(layer - 1)·min_size, t - min_size] bitişik bir dilimdir
+                a, b = (layer - 1) * min_size, t - min_size + 1
+                distance = norms[t] - 2 * (sums[a:b] @ sums[t]) + norms[a:b]
+                values = best[a:b] + (squares[t] - squares[a:b]) - distance / (t - ends[a:b])
+                i = int(np.argmin(values))
+                current[t] = values[i]
+                choice[t] = a + i
+            best = current
+            choices.append(choice)
+
+        points = []
+        t = n
+        for choice in reversed(choices):
+            t = int(choice[t])
+            points.append(t)
+        return points[::-1]
+
+
+def _backtrack(last, n):
+    points = []
+    t = n
+    while t > 0:
+        t = int(last[t])
+        if t > 0:
+            points.append(t)
+    return points[::-1]
+
+
+def act_boundaries(film, k=3, step=1.0, signals=DEFAULT_SIGNALS, min_fraction=0.05, raster=None):
+    """Filmin veriye dayalı k perdelik sınırları: [0, s1, ..., süre] (saniye)"""
+    if raster is None:
+        raster = film.raster(step)
+    segmenter = ActSegmenter.from_raster(raster, signals, min_fraction)
+    points = segmenter.segment(k)
+    return [0.0] + [float(p * raster.step) for p in points] + [float(film.duration)]
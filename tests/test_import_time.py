@@ -0,0 +1,40 @@
+import json
+import os
+import subprocess
+import sys
+
+# Veri modeli ve analiz modülleri içe aktarılırken ağır kütüphaneler yüklenmemeli ve
+# içe aktarma süresi bütçeyi aşmamalıdır (alım işçileri modeli günde binlerce kez yükler).
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("numpy", "pandas", "matplotlib", "seaborn", "networkx")
+IMPORT_BUDGET = 0.5  # saniye
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"elapsed": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def _import_in_subprocess(module):
+    """Modülü temiz bir yorumlayıcıda içe aktarır; (süre, yüklenen ağır modüller) döndürür"""
+    code = _PROBE.format(module=module, heavy=HEAVY_MODULES)
+    output = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, check=True,
+                            capture_output=True, text=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    return result["elapsed"], result["loaded"]
+
+
+def test_film_veri_yapisi_import_is_light():
+    elapsed, loaded = _import_in_subprocess("film_veri_yapisi")
+    assert loaded == []
+    assert elapsed < IMPORT_BUDGET
+
+
+def test_film_analiz_import_is_light():
+    elapsed, loaded = _import_in_subprocess("film_analiz")
+    assert loaded == []
+    assert elapsed < IMPORT_BUDGET
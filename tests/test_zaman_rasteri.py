@@ -0,0 +1,52 @@
+import numpy as np
+
+from film_veri_yapisi import Character, Film, Location
+
+# Etkin kadro sayısı kaba kutularda da karakteri kutu başına bir kez saymalıdır.
+
+
+def _film(scenes, duration=60):
+    film = Film("test", duration)
+    location = Location("Ev", "real")
+    film.add_location(location)
+    characters = {}
+    for start, end, names in scenes:
+        for name in names:
+            if name not in characters:
+                characters[name] = Character(name, "supporting")
+                film.add_character(characters[name])
+        film.add_scene(start, end, location, [characters[name] for name in names], "")
+    return film
+
+
+def _brute_force_cast(film, step):
+    """Kutuya dokunan sahnelerdeki farklı karakter sayısı"""
+    n_bins = max(int(np.ceil(film.duration / step)), 1)
+    result = []
+    for i in range(n_bins):
+        start, end = i * step, (i + 1) * step
+        names = set()
+        for scene in film.scenes:
+            if scene.start_time < end and scene.end_time > start:
+                names.update(character.name for character in scene.characters)
+        result.append(len(names))
+    return result
+
+
+def test_separate_runs_in_one_bin_count_once():
+    film = _film([(0, 30, ["A"]), (45, 60, ["A"])])
+    assert film.raster(60).active_cast.tolist() == [1]
+    assert film.raster(1).active_cast.sum() == 45
+
+
+def test_active_cast_matches_brute_force_at_coarse_steps():
+    rng = np.random.default_rng(0)
+    scenes = []
+    for _ in range(40):
+        start = int(rng.integers(0, 590))
+        end = start + int(rng.integers(1, 40))
+        names = list(rng.choice(["A", "B", "C", "D", "E"], size=int(rng.integers(1, 4)), replace=False))
+        scenes.append((start, min(end, 600), names))
+    film = _film(scenes, duration=600)
+    for step in (1, 7, 25, 60, 250):
+        assert film.raster(step).active_cast.tolist() == _brute_force_cast(film, step)
@@ -0,0 +1,219 @@
+import glob
+import json
+import os
+import sys
+
+from film_veri_yapisi import Film
+from paralel_cizim import DEFAULT_REGISTRY, iter_render, load_registry, unique_dir_names
+
+# Bir film dizininin toplu analizi.
+# Dosyalar ya da glob desenleri verilir; her film output/<dosya adı>/ dizinine
+# yazılır ve seçilen analizler tüm filmler için tek bir süreç havuzunda çalışır.
+# Her film dizinindeki manifest.json tamamlanan analizleri filmin içerik özetiyle
+# (fingerprint) birlikte tutar; yarıda kesilen bir çalışma yeniden başlatıldığında
+# yalnızca eksik analizler çalıştırılır. Film değişmişse o filmin analizleri yenilenir.
+#
+# Kullanım:
+#   python toplu_analiz.py "filmler/*.json" --analyses timeline,scene_flow --workers 4
+
+MANIFEST_FILE = "manifest.json"
+SUMMARY_FILE = "summary.csv"
+
+
+def expand_inputs(patterns):
+    """Dosya yollarını ve glob desenlerini sıralı, tekrarsız dosya listesine çevirir"""
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern]
+        for path in matches:
+            if os.path.isfile(path) and path not in paths:
+                paths.append(path)
+    return paths
+
+
+def output_dirs(paths, output_dir):
+    """Her film dosyası için dosya adından türetilmiş, çakışmayan çıktı dizini"""
+    stems = (os.path.splitext(os.path.basename(path))[0] for path in paths)
+    return [os.path.join(output_dir, name) for name in unique_dir_names(stems)]
+
+
+# --- Manifest (devam ettirme) ---
+
+def read_manifest(film_dir, fingerprint):
+    """Aynı film için daha önce tamamlanan analizler; film değişmişse boş"""
+    try:
+        with open(os.path.join(film_dir, MANIFEST_FILE), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("fingerprint") != fingerprint:
+        return {}
+    return manifest.get("done", {})
+
+
+def write_manifest(film_dir, source, fingerprint, done):
+    os.makedirs(film_dir, exist_ok=True)
+    path = os.path.join(film_dir, MANIFEST_FILE)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({"source": source, "fingerprint": fingerprint, "done": done}, f,
+                  ensure_ascii=False, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def _completed(film_dir, node, done):
+    """Analiz manifestte kayıtlı ve yazdığı dosyalar hâlâ yerinde mi"""
+    return node.name in done and all(
+        os.path.exists(os.path.join(film_dir, artifact)) for artifact in node.artifacts)
+
+
+# --- Özet tablo ---
+
+def corpus_summary(films):
+    """Tüm filmler için ekran süresi, lokasyon kullanımı ve olay sayıları (uzun biçim DataFrame).
+
+    Sütunlar: film, metric ("screen_time", "location_usage", "event_count"), name, value.
+    """
+    import numpy as np
+    import pandas as pd
+    from aralik_birlesimi import character_union, location_union
+
+    frames = []
+    for film in films:
+        columns = film.columns()
+        event_counts = np.bincount(columns.event_type_codes, minlength=len(columns.event_types))
+        # Süreler çakışan sahneler bir kez sayılarak (aralık birleşimiyle) hesaplanır
+        for metric, names, values in (
+                ("screen_time", columns.character_names, character_union(columns).total()),
+                ("location_usage", columns.location_names, location_union(columns).total()),
+                ("event_count", columns.event_types, event_counts)):
+            frames.append(pd.DataFrame({"film": film.title, "metric": metric,
+                                        "name": list(names), "value": np.asarray(values, dtype=np.float64)}))
+    if not frames:
+        return pd.DataFrame(columns=["film", "metric", "name", "value"])
+    return pd.concat(frames, ignore_index=True)
+
+
+def corpus_overview(films):
+    """Film başına tek satırlık genel bakış: süre, sayılar ve en çok görünen karakter"""
+    import numpy as np
+    import pandas as pd
+    from aralik_birlesimi import character_union
+
+    rows = []
+    for film in films:
+        screen_time = character_union(film.columns()).total()
+        top = int(np.argmax(screen_time)) if len(screen_time) else None
+        rows.append({
+            "Film": film.title,
+            "Duration (s)": film.duration,
+            "Scenes": len(film.scenes),
+            "Characters": len(film.characters),
+            "Locations": len(film.locations),
+            "Events": len(film.events),
+            "Top Character": film.characters[top].name if top is not None else "",
+            "Top Screen Time (s)": float(screen_time[top]) if top is not None else 0.0,
+        })
+    return pd.DataFrame(rows)
+
+
+# --- Komut satırı ---
+
+def run_batch(paths, names=None, output_dir="output", workers=None, cache_dir=None,
+              resume=True, registry=DEFAULT_REGISTRY, progress=print):
+    """Filmleri yükler, eksik analizleri paralel çalıştırır ve (filmler, hatalar) döndürür.
+
+    hatalar: {(dosya, analiz): hata metni}
+    """
+    analysis_registry = load_registry(registry)
+    names = analysis_registry.analyses() if names is None else list(names)
+    analysis_registry.plan(names)
+    nodes = [analysis_registry.nodes[name] for name in names]
+
+    films, jobs, errors = [], [], {}
+    manifests = []  # film başına (dizin, kaynak, özet, tamamlananlar)
+    for path, film_dir in zip(paths, output_dirs(paths, output_dir)):
+        try:
+            film = Film.load_from_json(path)
+        except Exception as e:
+            errors[(path, "load")] = f"{type(e).__name__}: {e}"
+            progress(f"{path}: yüklenemedi ({e})")
+            continue
+        fingerprint = film.fingerprint()
+        done = read_manifest(film_dir, fingerprint) if resume else {}
+        pending = [node.name for node in nodes if not _completed(film_dir, node, done)]
+        if len(pending) < len(nodes):
+            progress(f"{path}: {len(nodes) - len(pending)}/{len(nodes)} analiz daha önce tamamlanmış")
+        manifests.append((film_dir, path, fingerprint, done))
+        films.append(film)
+        jobs.extend((film, name, film_dir, len(manifests) - 1) for name in pending)
+
+    progress(f"{len(films)} film, {len(jobs)} analiz çalıştırılacak")
+    render_jobs = [job[:3] for job in jobs]
+    for done_count, (index, status, _, job_errors, timings) in enumerate(
+            iter_render(render_jobs, registry, workers, cache_dir), 1):
+        film, name, _, film_index = jobs[index]
+        film_dir, source, fingerprint, done = manifests[film_index]
+        if status in ("ok", "cache"):
+            # Manifest her işten sonra yazılır; kesinti anında en fazla süren işler kaybolur
+            done[name] = status
+            write_manifest(film_dir, source, fingerprint, done)
+        else:
+            errors[(source, name)] = job_errors.get(name, "")
+        progress(f"[{done_count}/{len(jobs)}] {film.title}: {name} ({status}, {sum(timings.values()):.2f} sn)")
+        sys.stdout.flush()
+    return films, errors
+
+
+def main(argv=None):
+    """Komut satırı girişi: python toplu_analiz.py DOSYA|DESEN... [seçenekler]"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Birden çok film dosyasını paralel analiz eder.")
+    parser.add_argument("inputs", nargs="*", help="Film JSON dosyaları ya da glob desenleri (örn. 'filmler/*.json')")
+    parser.add_argument("--analyses", default=None,
+                        help="Virgülle ayrılmış analiz adları (varsayılan: tümü; liste için --list)")
+    parser.add_argument("--list", action="store_true", help="Kayıtlı analizleri listele ve çık")
+    parser.add_argument("--output-dir", default="output", help="Film başına alt dizinlerin oluşturulacağı dizin")
+    parser.add_argument("--workers", type=int, default=None, help="Süreç sayısı (varsayılan: işlemci sayısı)")
+    parser.add_argument("--no-cache", action="store_true", help="Analiz önbelleğini kullanma")
+    parser.add_argument("--no-resume", action="store_true", help="Önceki çalışmayı yok say, tüm analizleri yeniden çalıştır")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        registry = load_registry(DEFAULT_REGISTRY)
+        for name in registry.analyses():
+            print(f"{name:<36}{registry.nodes[name].label}")
+        return 0
+
+    if not args.inputs:
+        parser.error("en az bir film dosyası ya da desen gerekli")
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        print("Eşleşen film dosyası bulunamadı.")
+        return 1
+    names = [name.strip() for name in args.analyses.split(",") if name.strip()] if args.analyses else None
+
+    from analiz_onbellegi import DEFAULT_CACHE_DIR
+    try:
+        films, errors = run_batch(paths, names, args.output_dir, args.workers,
+                                  None if args.no_cache else DEFAULT_CACHE_DIR, resume=not args.no_resume)
+    except KeyboardInterrupt:
+        print("\nKesildi. Tamamlanan analizler kaydedildi; aynı komutla devam edebilirsiniz.")
+        return 130
+
+    # Tüm filmler için özet tablo
+    if films:
+        summary = corpus_summary(films)
+        os.makedirs(args.output_dir, exist_ok=True)
+        summary_path = os.path.join(args.output_dir, SUMMARY_FILE)
+        summary.to_csv(summary_path, index=False)
+        print(corpus_overview(films).to_string(index=False))
+        print(f"\nÖzet tablo '{summary_path}' dosyasına kaydedildi.")
+
+    for (source, name), error in errors.items():
+        print(f"\n[{source}: {name}] {error.strip().splitlines()[-1] if error.strip() else 'hata'}")
+    return 0 if not errors else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,6 +4,7 @@ import json
 import os
 from datetime import timedelta
 from film_veri_yapisi import Film, Character, Location, Scene, Relationship, Event, format_time
+from film_gunlugu import FilmJournal
 
 class FilmDataCollector:
     def __init__(self, root):
@@ -13,7 +14,9 @@ class FilmDataCollector:
         
         # Film verisi
         self.film = None
+        self.journal = None  # Kaydedilmiş film için düzenleme günlüğü
         self.current_time = 0  # saniye cinsinden
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         
         # Ana çerçeve
         self.main_frame = ttk.Frame(root)
@@ -54,6 +57,10 @@ class FilmDataCollector:
         ttk.Entry(self.time_frame, textvariable=self.goto_time_var, width=8).grid(row=0, column=7, padx=5, pady=5, sticky=tk.W)
         ttk.Button(self.time_frame, text="Git", command=self.goto_time).grid(row=0, column=8, padx=5, pady=5)
         
+        ttk.Label(self.time_frame, text="Aktif sahne:").grid(row=1, column=0, padx=5, pady=5, sticky=tk.W)
+        self.active_scene_label = ttk.Label(self.time_frame, text="-")
+        self.active_scene_label.grid(row=1, column=1, columnspan=8, padx=5, pady=5, sticky=tk.W)
+        
         # Notebook (sekmeli arayüz)
         self.notebook = ttk.Notebook(self.main_frame)
         self.notebook.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
@@ -92,6 +99,7 @@ class FilmDataCollector:
             
         film_duration = self.film_duration_var.get() * 60  # dakikayı saniyeye çevir
         
+        self.close_journal()
         self.film = Film(film_name, film_duration)
         messagebox.showinfo("Bilgi", f"'{film_name}' filmi oluşturuldu.")
         
@@ -107,11 +115,31 @@ class FilmDataCollector:
         if not self.film:
             messagebox.showerror("Hata", "Önce bir film oluşturmalısınız!")
             return
-            
-        filename = f"{self.film.title.replace(' ', '_').lower()}_data.json"
-        self.film.save_to_json(filename)
+        
+        if self.journal:
+            # Değişiklikler günlükte; kayıtta anlık görüntü de güncellenir, böylece dosyayı
+            # günlüğü bilmeyen araçlar da güncel filmi okur
+            self.journal.compact(wait=True)
+            filename = self.journal.snapshot_path
+        else:
+            # İlk kayıtta tam anlık görüntü yazılır, sonraki değişiklikler günlüğe eklenir
+            filename = f"{self.film.title.replace(' ', '_').lower()}_data.json"
+            self.journal = FilmJournal.create(self.film, filename)
         messagebox.showinfo("Bilgi", f"Film verisi '{filename}' dosyasına kaydedildi.")
     
+    def close_journal(self):
+        """Açık düzenleme günlüğünü kapatır"""
+        if self.journal:
+            # Kapanışta günlük anlık görüntüye işlenir; dosya araç dışında da güncel kalır
+            self.journal.compact(wait=True)
+            self.journal.close()
+            self.journal = None
+    
+    def on_close(self):
+        """Pencere kapanırken günlüğü kapatır"""
+        self.close_journal()
+        self.root.destroy()
+    
     def load_film(self):
         """Film verisini JSON dosyasından yükler"""
         import tkinter.filedialog as filedialog
@@ -125,7 +153,10 @@ class FilmDataCollector:
             return
             
         try:
-            self.film = Film.load_from_json(filename)
+            # Anlık görüntüyü yükle ve yanındaki günlüğü üzerine oynat
+            self.close_journal()
+            self.journal = FilmJournal.open(filename)
+            self.film = self.journal.film
             self.film_name_var.set(self.film.title)
             self.film_duration_var.set(self.film.duration // 60)  # saniyeyi dakikaya çevir
             
@@ -180,6 +211,14 @@ class FilmDataCollector:
     def update_time_display(self):
         """Zaman göstergesini günceller"""
         self.current_time_label.config(text=format_time(self.current_time))
+        
+        # Şu anki zamanda ekranda olan sahneleri göster
+        active_scenes = self.film.scenes_at(self.current_time) if self.film else []
+        if active_scenes:
+            self.active_scene_label.config(text=" | ".join(
+                f"{scene.description} ({scene.location.name})" for scene in active_scenes))
+        else:
+            self.active_scene_label.config(text="-")
     
     # Karakter sekmesi
     def setup_character_tab(self):
@@ -260,7 +299,7 @@ class FilmDataCollector:
             return
             
         # Aynı isimde karakter var mı kontrol et
-        if any(c.name == name for c in self.film.characters):
+        if self.film.character_by_name(name) is not None:
             messagebox.showerror("Hata", f"'{name}' adında bir karakter zaten var!")
             return
             
@@ -269,9 +308,10 @@ class FilmDataCollector:
         traits_str = self.character_traits_var.get().strip()
         traits = [t.strip() for t in traits_str.split(",")] if traits_str else []
         
-        character = self.film.add_character(Character(name, character_type))
+        character = Character(name, character_type)
         character.importance = importance
         character.traits = traits
+        self.film.add_character(character)
         
         self.refresh_character_list()
         messagebox.showinfo("Bilgi", f"'{name}' karakteri eklendi.")
@@ -296,17 +336,23 @@ class FilmDataCollector:
                 return
                 
             # İsim değişiyorsa ve aynı isimde başka karakter varsa kontrol et
-            if name != character.name and any(c.name == name for c in self.film.characters):
+            if name != character.name and self.film.character_by_name(name) is not None:
                 messagebox.showerror("Hata", f"'{name}' adında bir karakter zaten var!")
                 return
                 
-            character.name = name
-            character.type = self.character_type_var.get()
-            character.importance = self.character_importance_var.get()
-            
+            renamed = name != character.name
             traits_str = self.character_traits_var.get().strip()
-            character.traits = [t.strip() for t in traits_str.split(",")] if traits_str else []
-            
+            self.film.update_character(
+                character,
+                name=name,
+                type=self.character_type_var.get(),
+                importance=self.character_importance_var.get(),
+                traits=[t.strip() for t in traits_str.split(",")] if traits_str else []
+            )
+            
+            # Yeni isim, karaktere başvuran ilişkilerin listede görünen adına yansıtılır
+            if renamed and self.film.references(character):
+                self.refresh_relationship_list()
             self.refresh_character_list()
             messagebox.showinfo("Bilgi", f"'{name}' karakteri güncellendi.")
     
@@ -324,16 +370,18 @@ class FilmDataCollector:
         if index < len(self.film.characters):
             character = self.film.characters[index]
             
-            # Karakter başka yerlerde kullanılıyor mu kontrol et
-            used_in_scenes = any(character in scene.characters for scene in self.film.scenes)
-            used_in_relationships = any(character.name in [rel.character1.name, rel.character2.name] for rel in self.film.relationships)
-            used_in_events = any(character in event.characters for event in self.film.events)
-            
-            if used_in_scenes or used_in_relationships or used_in_events:
-                messagebox.showerror("Hata", f"'{character.name}' karakteri sahnelerde, ilişkilerde veya olaylarda kullanılıyor. Önce bunları güncelleyin.")
-                return
-                
-            self.film.characters.remove(character)
+            # Karakter başka yerlerde kullanılıyor mu kontrol et (ters başvuru indeksi)
+            dependents = self.film.references(character)
+            if dependents:
+                if not messagebox.askyesno("Onay", f"'{character.name}' karakteri {len(dependents)} sahne, ilişki veya olayda kullanılıyor.\n"
+                                           "Karakter sahne ve olaylardan çıkarılsın ve ilişkileri silinsin mi?"):
+                    return
+                self.film.remove_cascade(character)
+                self.refresh_scene_list()
+                self.refresh_relationship_list()
+                self.refresh_event_list()
+            else:
+                self.film.remove_character(character)
             self.refresh_character_list()
             messagebox.showinfo("Bilgi", f"'{character.name}' karakteri silindi.")
     
@@ -405,7 +453,7 @@ class FilmDataCollector:
             return
             
         # Aynı isimde lokasyon var mı kontrol et
-        if any(l.name == name for l in self.film.locations):
+        if self.film.location_by_name(name) is not None:
             messagebox.showerror("Hata", f"'{name}' adında bir lokasyon zaten var!")
             return
             
@@ -435,12 +483,11 @@ class FilmDataCollector:
                 return
                 
             # İsim değişiyorsa ve aynı isimde başka lokasyon varsa kontrol et
-            if name != location.name and any(l.name == name for l in self.film.locations):
+            if name != location.name and self.film.location_by_name(name) is not None:
                 messagebox.showerror("Hata", f"'{name}' adında bir lokasyon zaten var!")
                 return
                 
-            location.name = name
-            location.type = self.location_type_var.get()
+            self.film.update_location(location, name=name, type=self.location_type_var.get())
             
             self.refresh_location_list()
             messagebox.showinfo("Bilgi", f"'{name}' lokasyonu güncellendi.")
@@ -459,15 +506,17 @@ class FilmDataCollector:
         if index < len(self.film.locations):
             location = self.film.locations[index]
             
-            # Lokasyon başka yerlerde kullanılıyor mu kontrol et
-            used_in_scenes = any(location.name == scene.location.name for scene in self.film.scenes)
-            used_in_events = any(location.name == event.location.name for event in self.film.events)
-            
-            if used_in_scenes or used_in_events:
-                messagebox.showerror("Hata", f"'{location.name}' lokasyonu sahnelerde veya olaylarda kullanılıyor. Önce bunları güncelleyin.")
-                return
-                
-            self.film.locations.remove(location)
+            # Lokasyon başka yerlerde kullanılıyor mu kontrol et (ters başvuru indeksi)
+            dependents = self.film.references(location)
+            if dependents:
+                if not messagebox.askyesno("Onay", f"'{location.name}' lokasyonu {len(dependents)} sahne veya olayda kullanılıyor.\n"
+                                           "Bu sahne ve olaylar da silinsin mi?"):
+                    return
+                self.film.remove_cascade(location)
+                self.refresh_scene_list()
+                self.refresh_event_list()
+            else:
+                self.film.remove_location(location)
             self.refresh_location_list()
             messagebox.showinfo("Bilgi", f"'{location.name}' lokasyonu silindi.")
     
@@ -531,10 +580,8 @@ class FilmDataCollector:
         self.scene_listbox.delete(0, tk.END)
         
         if self.film and self.film.scenes:
-            # Sahneleri başlangıç zamanına göre sırala
-            sorted_scenes = sorted(self.film.scenes, key=lambda x: x.start_time)
-            
-            for scene in sorted_scenes:
+            # Film sahneleri başlangıç zamanına göre sıralı tutar
+            for scene in self.film.scenes:
                 desc = scene.description[:30] + "..." if len(scene.description) > 30 else scene.description
                 self.scene_listbox.insert(tk.END, f"{format_time(scene.start_time)} - {format_time(scene.end_time)}: {desc}")
         
@@ -553,6 +600,9 @@ class FilmDataCollector:
                 
                 cb = ttk.Checkbutton(self.scene_characters_frame, text=character.name, variable=var)
                 cb.grid(row=i//2, column=i%2, sticky=tk.W, padx=5)
+        
+        # Aktif sahne göstergesini güncelle
+        self.update_time_display()
     
     def on_scene_select(self, event):
         """Sahne seçildiğinde detayları gösterir"""
@@ -564,8 +614,8 @@ class FilmDataCollector:
             return
             
         index = selection[0]
-        # Sahneleri başlangıç zamanına göre sırala
-        sorted_scenes = sorted(self.film.scenes, key=lambda x: x.start_time)
+        # Film sahneleri başlangıç zamanına göre sıralı tutar
+        sorted_scenes = self.film.scenes
         
         if index < len(sorted_scenes):
             scene = sorted_scenes[index]
@@ -608,7 +658,7 @@ class FilmDataCollector:
         
         # Lokasyonu kontrol et
         location_name = self.scene_location_var.get()
-        location = next((loc for loc in self.film.locations if loc.name == location_name), None)
+        location = self.film.location_by_name(location_name)
         if not location:
             messagebox.showerror("Hata", "Geçerli bir lokasyon seçin!")
             return
@@ -640,8 +690,8 @@ class FilmDataCollector:
             return
             
         index = selection[0]
-        # Sahneleri başlangıç zamanına göre sırala
-        sorted_scenes = sorted(self.film.scenes, key=lambda x: x.start_time)
+        # Film sahneleri başlangıç zamanına göre sıralı tutar
+        sorted_scenes = self.film.scenes
         
         if index < len(sorted_scenes):
             scene = sorted_scenes[index]
@@ -670,7 +720,7 @@ class FilmDataCollector:
             
             # Lokasyonu kontrol et
             location_name = self.scene_location_var.get()
-            location = next((loc for loc in self.film.locations if loc.name == location_name), None)
+            location = self.film.location_by_name(location_name)
             if not location:
                 messagebox.showerror("Hata", "Geçerli bir lokasyon seçin!")
                 return
@@ -685,11 +735,14 @@ class FilmDataCollector:
                 return
             
             # Sahneyi güncelle
-            scene.start_time = start_time
-            scene.end_time = end_time
-            scene.location = location
-            scene.characters = selected_characters
-            scene.description = description
+            self.film.update_scene(
+                scene,
+                start_time=start_time,
+                end_time=end_time,
+                location=location,
+                characters=selected_characters,
+                description=description
+            )
             
             self.refresh_scene_list()
             messagebox.showinfo("Bilgi", "Sahne güncellendi.")
@@ -705,12 +758,12 @@ class FilmDataCollector:
             return
             
         index = selection[0]
-        # Sahneleri başlangıç zamanına göre sırala
-        sorted_scenes = sorted(self.film.scenes, key=lambda x: x.start_time)
+        # Film sahneleri başlangıç zamanına göre sıralı tutar
+        sorted_scenes = self.film.scenes
         
         if index < len(sorted_scenes):
             scene = sorted_scenes[index]
-            self.film.scenes.remove(scene)
+            self.film.remove_scene(scene)
             
             self.refresh_scene_list()
             messagebox.showinfo("Bilgi", "Sahne silindi.")
@@ -823,8 +876,8 @@ class FilmDataCollector:
             messagebox.showerror("Hata", "İki farklı karakter seçmelisiniz!")
             return
             
-        char1 = next((c for c in self.film.characters if c.name == char1_name), None)
-        char2 = next((c for c in self.film.characters if c.name == char2_name), None)
+        char1 = self.film.character_by_name(char1_name)
+        char2 = self.film.character_by_name(char2_name)
         
         if not char1 or not char2:
             messagebox.showerror("Hata", "Geçerli karakterler seçin!")
@@ -891,8 +944,8 @@ class FilmDataCollector:
                 messagebox.showerror("Hata", "İki farklı karakter seçmelisiniz!")
                 return
                 
-            char1 = next((c for c in self.film.characters if c.name == char1_name), None)
-            char2 = next((c for c in self.film.characters if c.name == char2_name), None)
+            char1 = self.film.character_by_name(char1_name)
+            char2 = self.film.character_by_name(char2_name)
             
             if not char1 or not char2:
                 messagebox.showerror("Hata", "Geçerli karakterler seçin!")
@@ -931,12 +984,15 @@ class FilmDataCollector:
             strength = self.relationship_strength_var.get()
             
             # İlişkiyi güncelle
-            rel.character1 = char1
-            rel.character2 = char2
-            rel.type = rel_type
-            rel.start_time = start_time
-            rel.end_time = end_time
-            rel.strength = strength
+            self.film.update_relationship(
+                rel,
+                character1=char1,
+                character2=char2,
+                type=rel_type,
+                start_time=start_time,
+                end_time=end_time,
+                strength=strength
+            )
             
             self.refresh_relationship_list()
             messagebox.showinfo("Bilgi", "İlişki güncellendi.")
@@ -954,7 +1010,7 @@ class FilmDataCollector:
         index = selection[0]
         if index < len(self.film.relationships):
             rel = self.film.relationships[index]
-            self.film.relationships.remove(rel)
+            self.film.remove_relationship(rel)
             
             self.refresh_relationship_list()
             messagebox.showinfo("Bilgi", "İlişki silindi.")
@@ -1024,10 +1080,8 @@ class FilmDataCollector:
         self.event_listbox.delete(0, tk.END)
         
         if self.film and self.film.events:
-            # Olayları zamana göre sırala
-            sorted_events = sorted(self.film.events, key=lambda x: x.time)
-            
-            for event in sorted_events:
+            # Film olayları zamana göre sıralı tutar
+            for event in self.film.events:
                 self.event_listbox.insert(tk.END, f"{format_time(event.time)}: {event.name} ({event.type})")
         
         # Lokasyon combobox'ını güncelle
@@ -1056,8 +1110,8 @@ class FilmDataCollector:
             return
             
         index = selection[0]
-        # Olayları zamana göre sırala
-        sorted_events = sorted(self.film.events, key=lambda x: x.time)
+        # Film olayları zamana göre sıralı tutar
+        sorted_events = self.film.events
         
         if index < len(sorted_events):
             event = sorted_events[index]
@@ -1099,7 +1153,7 @@ class FilmDataCollector:
         
         # Lokasyonu kontrol et
         location_name = self.event_location_var.get()
-        location = next((loc for loc in self.film.locations if loc.name == location_name), None)
+        location = self.film.location_by_name(location_name)
         if not location:
             messagebox.showerror("Hata", "Geçerli bir lokasyon seçin!")
             return
@@ -1132,8 +1186,8 @@ class FilmDataCollector:
             return
             
         index = selection[0]
-        # Olayları zamana göre sırala
-        sorted_events = sorted(self.film.events, key=lambda x: x.time)
+        # Film olayları zamana göre sıralı tutar
+        sorted_events = self.film.events
         
         if index < len(sorted_events):
             event = sorted_events[index]
@@ -1159,7 +1213,7 @@ class FilmDataCollector:
             
             # Lokasyonu kontrol et
             location_name = self.event_location_var.get()
-            location = next((loc for loc in self.film.locations if loc.name == location_name), None)
+            location = self.film.location_by_name(location_name)
             if not location:
                 messagebox.showerror("Hata", "Geçerli bir lokasyon seçin!")
                 return
@@ -1175,12 +1229,15 @@ class FilmDataCollector:
                 return
             
             # Olayı güncelle
-            event.name = name
-            event.time = time
-            event.location = location
-            event.characters = selected_characters
-            event.importance = importance
-            event.type = event_type
+            self.film.update_event(
+                event,
+                name=name,
+                time=time,
+                location=location,
+                characters=selected_characters,
+                importance=importance,
+                type=event_type
+            )
             
             self.refresh_event_list()
             messagebox.showinfo("Bilgi", f"'{name}' olayı güncellendi.")
@@ -1196,12 +1253,12 @@ class FilmDataCollector:
             return
             
         index = selection[0]
-        # Olayları zamana göre sırala
-        sorted_events = sorted(self.film.events, key=lambda x: x.time)
+        # Film olayları zamana göre sıralı tutar
+        sorted_events = self.film.events
         
         if index < len(sorted_events):
             event = sorted_events[index]
-            self.film.events.remove(event)
+            self.film.remove_event(event)
             
             self.refresh_event_list()
             messagebox.showinfo("Bilgi", f"'{event.name}' olayı silindi.")
@@ -0,0 +1,116 @@
+from bisect import bisect_left, bisect_right
+
+# Zaman aralığı indeksi.
+# Aralıklar yarı açık [başlangıç, bitiş) kabul edilir. Nokta sorguları merkezli
+# bir aralık ağacıyla, pencere sorguları ise "t1 anında aktif olanlar" ile
+# "başlangıcı (t1, t2) içinde olanlar" birleşimiyle yanıtlanır; ikisi de
+# O(log n + k) sürer.
+
+
+class _Node:
+    __slots__ = ("center", "by_start", "starts", "by_end", "ends", "left", "right")
+
+    def __init__(self, center, items):
+        self.center = center
+        # Merkezi içeren aralıklar: başlangıca göre artan ve bitişe göre azalan sırada
+        self.by_start = sorted(items, key=lambda x: x[0])
+        self.starts = [x[0] for x in self.by_start]
+        self.by_end = sorted(items, key=lambda x: -x[1])
+        self.ends = [-x[1] for x in self.by_end]
+        self.left = None
+        self.right = None
+
+
+def _build(items):
+    if not items:
+        return None
+    # Merkez, başlangıcı medyan olan aralığın başlangıcıdır; bu aralık düğümde
+    # kalacağı için her düğüm en az bir aralık alır ve iki yan da n/2'yi aşmaz
+    starts = sorted(x[0] for x in items)
+    center = starts[len(starts) // 2]
+
+    left, here, right = [], [], []
+    for item in items:
+        if item[1] <= center:
+            left.append(item)
+        elif item[0] > center:
+            right.append(item)
+        else:
+            here.append(item)
+
+    node = _Node(center, here)
+    node.left = _build(left)
+    node.right = _build(right)
+    return node
+
+
+class IntervalIndex:
+    def __init__(self, items, start, end):
+        """items: indekslenecek nesneler, start/end: nesneden zaman okuyan fonksiyonlar"""
+        entries = [(start(item), end(item), item) for item in items]
+        self._root = _build([e for e in entries if e[0] < e[1]])
+
+        # Pencere sorguları için başlangıca göre sıralı liste
+        self._by_start = sorted(entries, key=lambda x: x[0])
+        self._starts = [e[0] for e in self._by_start]
+
+    def __len__(self):
+        return len(self._by_start)
+
+    def at(self, t):
+        """t anında aktif olan nesneleri döndürür (start <= t < end)"""
+        result = []
+        node = self._root
+        while node is not None:
+            if t < node.center:
+                for i in range(bisect_right(node.starts, t)):
+                    result.append(node.by_start[i][2])
+                node = node.left
+            elif t > node.center:
+                for i in range(bisect_left(node.ends, -t)):
+                    result.append(node.by_end[i][2])
+                node = node.right
+            else:
+                result.extend(x[2] for x in node.by_start)
+                break
+        return result
+
+    def overlapping(self, t1, t2):
+        """[t1, t2) penceresiyle kesişen nesneleri döndürür"""
+        if t2 <= t1:
+            return []
+        result = self.at(t1)
+        lo = bisect_right(self._starts, t1)
+        hi = bisect_left(self._starts, t2)
+        result.extend(e[2] for e in self._by_start[lo:hi] if e[0] < e[1])
+        return result
+
+
+class PointIndex:
+    def __init__(self, items, time):
+        """items: indekslenecek nesneler, time: nesneden zaman okuyan fonksiyon"""
+        self._items = sorted(items, key=time)
+        self._times = [time(item) for item in self._items]
+
+    def __len__(self):
+        return len(self._items)
+
+    def at(self, t):
+        """Tam olarak t anındaki nesneleri döndürür"""
+        return self._items[bisect_left(self._times, t):bisect_right(self._times, t)]
+
+    def overlapping(self, t1, t2):
+        """[t1, t2) penceresine düşen nesneleri döndürür"""
+        return self._items[bisect_left(self._times, t1):bisect_left(self._times, t2)]
+
+
+class FilmTimeIndex:
+    def __init__(self, film):
+        self.scenes = IntervalIndex(film.scenes, lambda s: s.start_time, lambda s: s.end_time)
+        # Bitişi olmayan ilişkiler film sonuna kadar sürer
+        self.relationships = IntervalIndex(
+            film.relationships,
+            lambda r: r.start_time,
+            lambda r: r.end_time if r.end_time is not None else float("inf")
+        )
+        self.events = PointIndex(film.events, lambda e: e.time)
@@ -0,0 +1,166 @@
+import numpy as np
+
+# Filmin zaman ızgarasına dökülmüş (raster) yoğun dizileri.
+# Film step saniyelik kutulara bölünür; i. kutu [i·step, (i+1)·step) aralığıdır ve
+# bir aralık dokunduğu tüm kutularda etkin sayılır. Diziler sahne/ilişki döngüsü
+# olmadan oluşturulur:
+#   etkin kadro sayısı       karakter başına birleşik aralıklar (aralik_birlesimi) → sahip başına
+#                            birleştirilmiş kutu aralıkları → fark dizisi
+#   etkin ilişki sayısı      ilişki aralıkları → fark dizisi (np.add.at + cumsum)
+#   olay yoğunluğu           olay zamanlarının kutulara bincount'u (sayı ve önem toplamı)
+#   etkin lokasyon kodu      kutuyu kapsayan sahnelerden en son başlayanın lokasyonu
+# Fark dizileri O(n + T) sürer; lokasyon kodu sahne kapsamlarının toplam uzunluğu kadar
+# (çakışma yoksa O(T)) iş yapar. Diziler save/load ile sıkıştırılmış .npz olarak saklanır.
+
+NO_LOCATION = -1
+
+
+def _bins(times, step, n_bins, ceil=False):
+    scaled = np.asarray(times, dtype=np.float64) / step
+    bins = np.ceil(scaled) if ceil else np.floor(scaled)
+    return np.clip(bins, 0, n_bins).astype(np.int64)
+
+
+def coverage(starts, ends, step, n_bins, owners=None):
+    """[başlangıç, bitiş) aralıklarının kutu başına sayısı (fark dizisiyle).
+
+    owners verilirse aralıklar (sahip, başlangıç) sırasında ve sahip başına çakışmasız
+    olmalıdır; aynı sahibin aynı kutuya düşen ayrı aralıkları o kutuda bir kez sayılır.
+    """
+    diff = np.zeros(n_bins + 1, dtype=np.int64)
+    first = _bins(starts, step, n_bins)
+    stop = np.maximum(_bins(ends, step, n_bins, ceil=True), first)
+    if owners is not None and len(first):
+        # Kutu aralıkları sahip içinde de sıralıdır; bir öncekiyle kesişen ya da ona
+        # değen kutu aralığı öncekiyle birleştirilir
+        owners = np.asarray(owners)
+        new_run = np.ones(len(first), dtype=bool)
+        new_run[1:] = (owners[1:] != owners[:-1]) | (first[1:] > stop[:-1])
+        runs = np.flatnonzero(new_run)
+        first, stop = first[runs], np.maximum.reduceat(stop, runs)
+    np.add.at(diff, first, 1)
+    np.add.at(diff, stop, -1)
+    return np.cumsum(diff[:-1])
+
+
+class FilmRaster:
+    FIELDS = ("active_cast", "active_location", "active_relationships", "event_count", "event_importance")
+
+    def __init__(self, step, n_bins, **arrays):
+        self.step = float(step)
+        self.n_bins = n_bins
+        for name in self.FIELDS:
+            setattr(self, name, arrays[name])
+        self.location_names = list(arrays.get("location_names", []))
+
+    @classmethod
+    def from_film(cls, film, step=1.0):
+        """Filmden raster dizilerini oluşturur (step: kutu genişliği, saniye)"""
+        from aralik_birlesimi import character_union
+
+        columns = film.columns()
+        n_bins = max(int(np.ceil(film.duration / step)), 1)
+
+        # Aynı karakterin çakışan sahneleri ve aynı kutuya düşen parçaları birleştirilir;
+        # karakter kutu başına bir kez sayılır
+        union = character_union(columns)
+        active_cast = coverage(union.run_start, union.run_end, step, n_bins, owners=union.run_owner)
+
+        relationship_end = np.where(np.isnan(columns.relationship_end), film.duration, columns.relationship_end)
+        active_relationships = coverage(columns.relationship_start, relationship_end, step, n_bins)
+
+        event_bins = np.minimum(_bins(columns.event_time, step, n_bins), n_bins - 1)
+        event_count = np.bincount(event_bins, minlength=n_bins)
+        event_importance = np.bincount(event_bins, weights=columns.event_importance, minlength=n_bins)
+
+        return cls(step, n_bins,
+                   active_cast=active_cast,
+                   active_location=_active_location(columns, step, n_bins),
+                   active_relationships=active_relationships,
+                   event_count=event_count,
+                   event_importance=event_importance,
+                   location_names=columns.location_names)
+
+    @property
+    def times(self):
+        """Kutuların başlangıç zamanları (saniye)"""
+        return np.arange(self.n_bins) * self.step
+
+    def bin(self, t):
+        """t zamanının (ya da zaman dizisinin) kutu indeksi"""
+        return np.minimum(_bins(t, self.step, self.n_bins), self.n_bins - 1)
+
+    def resample(self, factor):
+        """factor kutuyu birleştiren daha kaba raster (sayılar toplanır, kadro/ilişki en büyük değerdir)"""
+        n_bins = -(-self.n_bins // factor)
+        pad = n_bins * factor - self.n_bins
+
+        def reshape(values, fill):
+            return np.concatenate([values, np.full(pad, fill, dtype=values.dtype)]).reshape(n_bins, factor)
+
+        return FilmRaster(self.step * factor, n_bins,
+                          active_cast=reshape(self.active_cast, 0).max(axis=1),
+                          active_location=reshape(self.active_location, NO_LOCATION)[:, 0],
+                          active_relationships=reshape(self.active_relationships, 0).max(axis=1),
+                          event_count=reshape(self.event_count, 0).sum(axis=1),
+                          event_importance=reshape(self.event_importance, 0).sum(axis=1),
+                          location_names=self.location_names)
+
+    def frame(self):
+        """Kutu başına tablo (DataFrame)"""
+        import pandas as pd
+
+        names = np.asarray(self.location_names + [""], dtype=object)
+        return pd.DataFrame({
+            "Time": self.times,
+            "Active Cast": self.active_cast,
+            "Location": names[self.active_location],
+            "Active Relationships": self.active_relationships,
+            "Events": self.event_count,
+            "Event Importance": self.event_importance,
+        })
+
+    # --- Saklama ---
+
+    def save(self, path):
+        """Dizileri küçük tamsayı türleriyle sıkıştırılmış .npz dosyasına yazar"""
+        np.savez_compressed(
+            path,
+            step=np.array(self.step),
+            active_cast=self.active_cast.astype(np.min_scalar_type(max(int(self.active_cast.max(initial=0)), 1))),
+            active_location=self.active_location.astype(np.int16 if len(self.location_names) < 2 ** 15 else np.int32),
+            active_relationships=self.active_relationships.astype(np.int32),
+            event_count=self.event_count.astype(np.int32),
+            event_importance=self.event_importance.astype(np.float32),
+            location_names=np.array(self.location_names, dtype=str),
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            arrays = {name: data[name].astype(np.float64 if name == "event_importance" else np.int64)
+                      for name in cls.FIELDS}
+            return cls(float(data["step"]), len(arrays["active_cast"]),
+                       location_names=data["location_names"].tolist(), **arrays)
+
+
+def _active_location(columns, step, n_bins):
+    """Kutuyu kapsayan sahnelerden en son başlayanın lokasyon kodu (yoksa NO_LOCATION)"""
+    result = np.full(n_bins, NO_LOCATION, dtype=np.int64)
+    if columns.n_scenes == 0:
+        return result
+    first = _bins(columns.scene_start, step, n_bins)
+    stop = np.maximum(_bins(columns.scene_end, step, n_bins, ceil=True), first)
+    lengths = stop - first
+
+    # Her sahnenin kapsadığı kutular art arda açılır; kutu başına en büyük sahne sırası
+    # (sahneler başlangıca göre sıralı olduğundan en son başlayan sahne) seçilir
+    scene_of_bin = np.repeat(np.arange(columns.n_scenes), lengths)
+    offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    bins = np.repeat(first, lengths) + offsets
+    latest = np.full(n_bins, -1, dtype=np.int64)
+    np.maximum.at(latest, bins, scene_of_bin)
+
+    covered = latest >= 0
+    result[covered] = columns.scene_location[latest[covered]]
+    return result